@@ -0,0 +1,9 @@
+"""
+Streamlit-independent building blocks for the AlphaGenome UI.
+
+Modules in this package hold process-wide state (client pools, caches) and
+must not import Streamlit, so that they survive script reruns and can be
+shared by every session served by the same process. ``analysis.Analyzer``
+runs predictions without the app, and ``python -m alphagenome_ui`` runs
+batch jobs from the command line.
+"""
@@ -0,0 +1,5 @@
+"""Entry point for ``python -m alphagenome_ui``."""
+
+from alphagenome_ui.cli import main
+
+raise SystemExit(main())
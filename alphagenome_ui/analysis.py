@@ -0,0 +1,675 @@
+"""
+Streamlit-free analysis core.
+
+``Analyzer`` runs sequence, variant and interval predictions, sliding-window
+scans and saturation mutagenesis through one backend, client pool, request scheduler, result cache and
+metrics registry. With a local reference genome, requests are pre-checked
+(REF alleles, chromosome bounds) before any model call. The Streamlit app holds one per process; the command line
+(``python -m alphagenome_ui``) and batch pipelines build their own without
+importing Streamlit.
+"""
+
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+
+from alphagenome_ui.backends import Backend, get_backend
+from alphagenome_ui.batch import DEFAULT_CONCURRENCY, run_bounded
+from alphagenome_ui.client_pool import ClientPool
+from alphagenome_ui.comparison import split_by_tissue, summarize_tracks, summarize_variant_tracks, track_key
+from alphagenome_ui.export import to_memmap
+from alphagenome_ui.jobs import report_progress
+from alphagenome_ui.metrics import MetricsRegistry
+from alphagenome_ui.mutagenesis import (
+    DEFAULT_MUTAGENESIS_CONTEXT,
+    MAX_MUTAGENESIS_WIDTH,
+    EffectMatrix,
+    mutagenesis_context,
+    mutate,
+    plan_mutations,
+    strongest_effects,
+)
+from alphagenome_ui.packed_sequence import PackedSequence
+from alphagenome_ui.reference import ReferenceGenome
+from alphagenome_ui.result_cache import ResultCache, make_cache_key
+from alphagenome_ui.scan import (
+    DEFAULT_SCAN_DIR,
+    ScanCheckpoint,
+    check_scan_params,
+    plan_scan_windows,
+    run_scan,
+    window_stats,
+    write_scan_track,
+)
+from alphagenome_ui.scheduler import BATCH, INTERACTIVE, RequestScheduler
+from alphagenome_ui.scoring import score_tracks, variant_row
+from alphagenome_ui.tiling import DEFAULT_OVERLAP, SUPPORTED_LENGTHS, predict_tiled
+from alphagenome_ui.track_store import DEFAULT_ORGANISM, TrackStore
+from alphagenome_ui.variants import SharedPredictionCache, apply_variant, context_flanks, context_window
+
+
+def select_track(outputs, output_type: str):
+    """Return the TrackData for ``output_type`` from a model output."""
+    track = getattr(outputs, output_type.lower(), None)
+    if track is None:
+        raise ValueError(f"No {output_type} tracks returned")
+    return track
+
+
+def split_outputs(outputs, output_types: list, tissues: list) -> dict:
+    """Split one batched model output into ``{key: block}`` per (output type, tissue)."""
+    blocks = {}
+    for output_type in output_types:
+        track = select_track(outputs, output_type)
+        curies = track.metadata["ontology_curie"].values if "ontology_curie" in track.metadata.columns else None
+        for tissue, (values, names) in split_by_tissue(track.values, curies, track.names, tissues).items():
+            blocks[track_key(output_type, tissue)] = {
+                "output_type": output_type,
+                "tissue": tissue,
+                "values": values,
+                "names": names,
+                "resolution": track.resolution,
+            }
+    return blocks
+
+
+class Analyzer:
+    """Analysis entry points sharing one set of process-wide resources.
+
+    Every component defaults to a fresh instance configured from the
+    environment; pass existing ones to share them (the app passes its
+    process-wide singletons).
+    """
+
+    def __init__(
+        self,
+        backend: Backend | None = None,
+        client_pool: ClientPool | None = None,
+        scheduler: RequestScheduler | None = None,
+        result_cache: ResultCache | None = None,
+        reference_predictions: SharedPredictionCache | None = None,
+        metrics: MetricsRegistry | None = None,
+        reference: ReferenceGenome | None = None,
+        track_store: TrackStore | None = None,
+    ):
+        self.backend = backend if backend is not None else get_backend()
+        self.client_pool = client_pool if client_pool is not None else ClientPool(self.backend.create_client)
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self.scheduler = scheduler if scheduler is not None else RequestScheduler.from_env(
+            self.client_pool.get,
+            on_retry=self.client_pool.mark_suspect,
+            observe=lambda stage, seconds: self.metrics.observe(stage, seconds, kind="scheduler"),
+        )
+        self.result_cache = result_cache if result_cache is not None else ResultCache()
+        self.reference_predictions = reference_predictions if reference_predictions is not None else SharedPredictionCache()
+        self.reference = reference if reference is not None else ReferenceGenome.from_env()
+        self.track_store = track_store if track_store is not None else TrackStore()
+
+    @property
+    def available(self) -> bool:
+        """Whether the backend can be used in this environment."""
+        return self.backend.available
+
+    def output_type(self, output_type: str) -> Any:
+        """Get the backend's request value for an output type."""
+        if self.backend.available:
+            return self.backend.output_type(output_type)
+        return None
+
+    def chromosome_length(self, chromosome: str) -> int | None:
+        """Length of ``chromosome`` in the local reference genome, or None if unknown."""
+        if self.reference is None or chromosome not in self.reference:
+            return None
+        return self.reference.length(chromosome)
+
+    def interval_request_key(self, chromosome: str, start: int, end: int, tissues: list, output_types: list) -> str:
+        """Identity of a ``predict_interval`` call, used to coalesce identical in-flight requests."""
+        return make_cache_key(
+            "predict_interval", backend=self.backend.name, chromosome=chromosome, start=int(start), end=int(end),
+            tissues=sorted(tissues), output_types=sorted(output_types),
+        )
+
+    def analyze_sequence(self, api_key: str, sequence: str | PackedSequence, organism: str, tissues: list, output_types: list, priority: int = INTERACTIVE):
+        """Perform DNA sequence analysis for every selected tissue and output type in one request.
+
+        A ``PackedSequence`` is hashed packed and only unpacked for the model call.
+        """
+        cache_key = make_cache_key(
+            "sequence", backend=self.backend.name, sequence=sequence, organism=organism, tissues=sorted(tissues), output_types=sorted(output_types),
+        )
+        metrics = self.metrics
+        with metrics.timed("cache_lookup", kind="sequence"):
+            cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return {"success": True, **cached, "key": cache_key, "cached": True}
+
+        try:
+            requested_outputs = [self.output_type(o) for o in output_types]
+            with metrics.timed("predict", kind="sequence"):
+                outputs = self.scheduler.call(
+                    api_key,
+                    lambda model: model.predict_sequence(
+                        sequence=str(sequence),
+                        organism=organism,
+                        ontology_terms=list(tissues),
+                        requested_outputs=requested_outputs,
+                    ),
+                    key=cache_key,
+                    priority=priority,
+                )
+
+            with metrics.timed("postprocess", kind="sequence"):
+                blocks = split_outputs(outputs, output_types, tissues)
+
+                result = {
+                    "type": "sequence",
+                    "sequence_length": len(sequence),
+                    "organism": organism,
+                    "tissues": list(tissues),
+                    "output_types": list(output_types),
+                    "predictions": [
+                        {"output_type": b["output_type"], "tissue": b["tissue"], "resolution": b["resolution"], **summarize_tracks(b["values"])}
+                        for b in blocks.values()
+                    ],
+                    "timestamp": datetime.now().isoformat(),
+                }
+
+                payload = {
+                    "data": result,
+                    "tracks": {key: to_memmap(b["values"], f"{cache_key}-{key}") for key, b in blocks.items()},
+                    "track_names": {key: b["names"] for key, b in blocks.items()},
+                    "resolutions": {key: b["resolution"] for key, b in blocks.items()},
+                }
+            with metrics.timed("cache_store", kind="sequence"):
+                self.result_cache.put(cache_key, payload)
+            return {"success": True, **payload, "key": cache_key}
+        except Exception as e:
+            self.client_pool.mark_suspect(api_key)
+            return {"success": False, "error": str(e)}
+
+    def analyze_variant(self, api_key: str, chromosome: str, position: int, ref: str, alt: str, tissues: list, output_types: list, reference_sequence: str | None = None, priority: int = INTERACTIVE):
+        """Perform variant effect prediction for every selected tissue and output type in one request.
+
+        ``reference_sequence`` holds the bases of the variant's context window. When
+        given, the window's reference prediction is shared with nearby variants and
+        only the alternate sequence is sent to the model. With a local reference
+        genome the REF allele is verified first and the window is read from it, so
+        the app and batch paths share reference predictions without passing one.
+        Without either, ``predict_variant`` computes both alleles on every call.
+        """
+        cache_key = make_cache_key(
+            "variant", backend=self.backend.name, chromosome=chromosome, position=int(position), ref=ref.upper(), alt=alt.upper(),
+            tissues=sorted(tissues), output_types=sorted(output_types),
+        )
+        metrics = self.metrics
+        with metrics.timed("cache_lookup", kind="variant"):
+            cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return {"success": True, **cached, "key": cache_key, "cached": True}
+        # Grid-snapped context window, identical for variants in the same locus
+        window = context_window(chromosome, position, chromosome_length=self.chromosome_length(chromosome))
+        n_fraction = None
+        if self.reference is not None:
+            with metrics.timed("reference_check", kind="variant"):
+                error = self.reference.check_ref(chromosome, position, ref)
+                if error is None and reference_sequence is None:
+                    reference_sequence = self.reference.window_sequence(chromosome, window.start, window.end)
+                    n_fraction = reference_sequence.count("N") / len(reference_sequence)
+            if error is not None:
+                return {"success": False, "error": error}
+
+        try:
+            scheduler = self.scheduler
+            interval = self.backend.interval(chromosome, window.start, window.end)
+            requested_outputs = [self.output_type(o) for o in output_types]
+            reference_key = make_cache_key(
+                "reference", backend=self.backend.name, chromosome=chromosome, start=window.start, end=window.end,
+                tissues=sorted(tissues), output_types=sorted(output_types),
+            )
+
+            if reference_sequence is not None:
+                alternate_sequence = apply_variant(reference_sequence, window, position, ref, alt)
+
+                def predict_reference():
+                    with metrics.timed("predict_reference", kind="variant"):
+                        outputs = scheduler.call(
+                            api_key,
+                            lambda model: model.predict_interval(
+                                interval=interval,
+                                ontology_terms=list(tissues),
+                                requested_outputs=requested_outputs,
+                            ),
+                            key=self.interval_request_key(chromosome, window.start, window.end, tissues, output_types),
+                            priority=priority,
+                        )
+                    return split_outputs(outputs, output_types, tissues)
+
+                reference, reference_shared = self.reference_predictions.get_or_compute(reference_key, predict_reference)
+                with metrics.timed("predict", kind="variant"):
+                    outputs = scheduler.call(
+                        api_key,
+                        lambda model: model.predict_sequence(
+                            sequence=alternate_sequence,
+                            interval=interval,
+                            ontology_terms=list(tissues),
+                            requested_outputs=requested_outputs,
+                        ),
+                        key=f"{cache_key}:predict_sequence",
+                        priority=priority,
+                    )
+                alternate = split_outputs(outputs, output_types, tissues)
+            else:
+                variant = self.backend.variant(chromosome, position, ref, alt)
+
+                with metrics.timed("predict", kind="variant"):
+                    outputs = scheduler.call(
+                        api_key,
+                        lambda model: model.predict_variant(
+                            interval=interval,
+                            variant=variant,
+                            ontology_terms=list(tissues),
+                            requested_outputs=requested_outputs,
+                        ),
+                        key=f"{cache_key}:predict_variant",
+                        priority=priority,
+                    )
+                reference = split_outputs(outputs.reference, output_types, tissues)
+                alternate = split_outputs(outputs.alternate, output_types, tissues)
+                self.reference_predictions.put(reference_key, reference)
+                reference_shared = False
+
+            with metrics.timed("postprocess", kind="variant"):
+                scores = {
+                    key: score_tracks(
+                        b["values"], alternate[key]["values"],
+                        variant_row(position, window.start, b["resolution"]), b["resolution"],
+                    )
+                    for key, b in reference.items()
+                }
+                result = {
+                    "type": "variant",
+                    "chromosome": chromosome,
+                    "position": position,
+                    "reference": ref,
+                    "alternate": alt,
+                    "tissues": list(tissues),
+                    "output_types": list(output_types),
+                    "context_start": window.start,
+                    "context_end": window.end,
+                    "context_flanks": context_flanks(window, position),
+                    "n_fraction": n_fraction,
+                    "reference_shared": reference_shared,
+                    "predictions": [
+                        {
+                            "output_type": b["output_type"], "tissue": b["tissue"], "resolution": b["resolution"],
+                            **summarize_variant_tracks(b["values"], alternate[key]["values"], scores[key], b["names"]),
+                        }
+                        for key, b in reference.items()
+                    ],
+                    "timestamp": datetime.now().isoformat(),
+                }
+
+                tracks, track_names, resolutions = {}, {}, {}
+                for key, b in reference.items():
+                    for allele, blocks, owner_key in (("reference", reference, reference_key), ("alternate", alternate, cache_key)):
+                        allele_key = f"{key}/{allele}"
+                        tracks[allele_key] = to_memmap(blocks[key]["values"], f"{owner_key}-{allele_key}")
+                        track_names[allele_key] = b["names"]
+                        resolutions[allele_key] = b["resolution"]
+
+                payload = {
+                    "data": result, "tracks": tracks, "track_names": track_names, "resolutions": resolutions,
+                    "scores": scores,
+                }
+            with metrics.timed("cache_store", kind="variant"):
+                self.result_cache.put(cache_key, payload)
+            return {"success": True, **payload, "key": cache_key}
+        except Exception as e:
+            self.client_pool.mark_suspect(api_key)
+            return {"success": False, "error": str(e)}
+
+    def analyze_interval(self, api_key: str, chromosome: str, start: int, end: int, tissues: list, output_types: list, overlap: int = DEFAULT_OVERLAP, priority: int = INTERACTIVE):
+        """Perform genomic interval analysis, tiling regions onto supported window sizes.
+
+        Every window requests all selected tissues and output types in one call.
+        With a local reference genome the region is clamped to the chromosome
+        first and each window's N content is reported.
+        """
+        if self.reference is not None:
+            try:
+                start, end = self.reference.clamp(chromosome, int(start), int(end))
+            except (KeyError, ValueError) as e:
+                return {"success": False, "error": str(e.args[0])}
+        cache_key = make_cache_key(
+            "interval", backend=self.backend.name, chromosome=chromosome, start=int(start), end=int(end),
+            tissues=sorted(tissues), output_types=sorted(output_types), overlap=int(overlap),
+        )
+        metrics = self.metrics
+        with metrics.timed("cache_lookup", kind="interval"):
+            cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return {"success": True, **cached, "key": cache_key, "cached": True}
+
+        try:
+            scheduler = self.scheduler
+            requested_outputs = [self.output_type(o) for o in output_types]
+
+            def predict_window(tile):
+                interval = self.backend.interval(chromosome, tile.start, tile.end)
+
+                with metrics.timed("predict", kind="interval", window=tile.index):
+                    outputs = scheduler.call(
+                        api_key,
+                        lambda model: model.predict_interval(
+                            interval=interval,
+                            ontology_terms=list(tissues),
+                            requested_outputs=requested_outputs,
+                        ),
+                        key=self.interval_request_key(chromosome, tile.start, tile.end, tissues, output_types),
+                        priority=priority,
+                    )
+
+                blocks = split_outputs(outputs, output_types, tissues)
+                if tile.index == 0:
+                    block_info.update(blocks)
+                return {key: (b["values"], b["resolution"]) for key, b in blocks.items()}
+
+            block_info = {}
+            chromosome_length = self.chromosome_length(chromosome)
+            if self.track_store is None:
+                stitched, tiles = predict_tiled(predict_window, int(start), int(end), int(overlap), chromosome_length=chromosome_length)
+            else:
+                stitched, tiles, stored_bases = self._interval_from_store(
+                    predict_window, block_info, chromosome, int(start), int(end), tissues, output_types, int(overlap), chromosome_length,
+                )
+
+            with metrics.timed("postprocess", kind="interval"):
+                result = {
+                    "type": "interval",
+                    "chromosome": chromosome,
+                    "start": start,
+                    "end": end,
+                    "tissues": list(tissues),
+                    "output_types": list(output_types),
+                    "windows": len(tiles),
+                    "window_length": tiles[0].length if tiles else None,
+                    "stored_bases": stored_bases if self.track_store is not None else 0,
+                    "n_fraction": [
+                        round(self.reference.n_fraction(chromosome, tile.start, tile.end), 4) for tile in tiles
+                    ] if self.reference is not None else None,
+                    "predictions": [
+                        {
+                            "output_type": block_info[key]["output_type"], "tissue": block_info[key]["tissue"],
+                            "resolution": block_info[key]["resolution"], **summarize_tracks(values),
+                        }
+                        for key, values in stitched.items()
+                    ],
+                    "timestamp": datetime.now().isoformat(),
+                }
+
+                payload = {
+                    "data": result,
+                    "tracks": {key: to_memmap(values, f"{cache_key}-{key}") for key, values in stitched.items()},
+                    "track_names": {key: block_info[key]["names"] for key in stitched},
+                    "resolutions": {key: block_info[key]["resolution"] for key in stitched},
+                }
+            with metrics.timed("cache_store", kind="interval"):
+                self.result_cache.put(cache_key, payload)
+            return {"success": True, **payload, "key": cache_key}
+        except Exception as e:
+            self.client_pool.mark_suspect(api_key)
+            return {"success": False, "error": str(e)}
+
+    def _interval_from_store(
+        self, predict_window, block_info: dict, chromosome: str, start: int, end: int, tissues: list, output_types: list, overlap: int,
+        chromosome_length: int | None = None,
+    ):
+        """Answer ``[start, end)`` from the track store, predicting only the gaps it does not cover.
+
+        Returns the stitched blocks, the model windows used and the number of bases served from disk.
+        """
+        store_keys = {
+            track_key(output_type, tissue): (self.backend.name, DEFAULT_ORGANISM, chromosome, output_type, tissue)
+            for output_type in output_types for tissue in tissues
+        }
+        with self.metrics.timed("track_store", kind="interval"):
+            gaps = self.track_store.gaps(list(store_keys.values()), start, end)
+        tiles = []
+        for gap_start, gap_end in gaps:
+            predicted, gap_tiles = predict_tiled(predict_window, gap_start, gap_end, overlap, chromosome_length=chromosome_length)
+            tiles.extend(gap_tiles)
+            if not predicted.keys() <= store_keys.keys():
+                # Tracks without tissue metadata cannot be keyed; predict the whole region instead
+                stitched, tiles = predict_tiled(predict_window, start, end, overlap, chromosome_length=chromosome_length)
+                return stitched, tiles, 0
+            resolutions = {block_info[key]["output_type"]: block_info[key]["resolution"] for key in predicted}
+            for key, store_key in store_keys.items():
+                output_type = store_key[3]
+                if key in predicted:
+                    self.track_store.put(store_key, gap_start, predicted[key], block_info[key]["resolution"], block_info[key]["names"])
+                else:
+                    # Tissues without tracks are stored empty so they do not count as gaps again
+                    resolution = resolutions.get(output_type, 1)
+                    self.track_store.put(store_key, gap_start, np.zeros((-(-(gap_end - gap_start) // resolution), 0), np.float32), resolution, [])
+
+        stitched = {}
+        with self.metrics.timed("track_store", kind="interval"):
+            try:
+                for key, (_, _, _, output_type, tissue) in store_keys.items():
+                    values, resolution, names = self.track_store.read(store_keys[key], start, end)
+                    if values.shape[1]:
+                        stitched[key] = values
+                        block_info[key] = {"output_type": output_type, "tissue": tissue, "names": names, "resolution": resolution}
+            except (KeyError, OSError):
+                # Chunks evicted under the disk budget since the gap query; predict the whole region instead
+                stitched, tiles = predict_tiled(predict_window, start, end, overlap, chromosome_length=chromosome_length)
+                return stitched, tiles, 0
+        return stitched, tiles, (end - start) - sum(hi - lo for lo, hi in gaps)
+
+    def scan(self, api_key: str, regions: list, window: int, stride: int, tissues: list, output_types: list, concurrency: int = DEFAULT_CONCURRENCY) -> dict:
+        """Scan ``regions`` window by window, checkpointing each window so an interrupted scan resumes.
+
+        With a local reference genome, regions are clamped to their chromosome;
+        regions outside it or on chromosomes shorter than ``window`` are
+        dropped, counted in ``dropped_regions`` and listed in ``errors``.
+        """
+        stride = check_scan_params(window, stride)
+        lengths, dropped = None, []
+        if self.reference is not None:
+            kept = []
+            for c, s, e in regions:
+                try:
+                    region = (c, *self.reference.clamp(c, s, e))
+                except KeyError as error:
+                    dropped.append(f"{c}:{s}-{e}: {error.args[0]}")
+                    continue
+                except ValueError as error:
+                    dropped.append(str(error.args[0]))
+                    continue
+                if self.reference.length(c) < window:
+                    dropped.append(f"{c}:{s}-{e}: {c} is shorter than the {window:,} bp window")
+                else:
+                    kept.append(region)
+            regions = kept
+            lengths = {c: self.reference.length(c) for c, _, _ in regions}
+        params = {
+            "backend": self.backend.name, "regions": sorted(regions), "window": window, "stride": stride,
+            "tissues": sorted(tissues), "output_types": sorted(output_types),
+        }
+        scan_id = make_cache_key("scan", **params)
+        windows = list(plan_scan_windows(regions, window, stride, lengths))
+        scheduler = self.scheduler
+        metrics = self.metrics
+        requested_outputs = [self.output_type(o) for o in output_types]
+
+        def predict_window(scan_window):
+            interval = self.backend.interval(scan_window.chromosome, scan_window.start, scan_window.end)
+            with metrics.timed("predict", kind="scan"):
+                outputs = scheduler.call(
+                    api_key,
+                    lambda model: model.predict_interval(
+                        interval=interval,
+                        ontology_terms=list(tissues),
+                        requested_outputs=requested_outputs,
+                    ),
+                    key=self.interval_request_key(scan_window.chromosome, scan_window.start, scan_window.end, tissues, output_types),
+                    priority=BATCH,
+                )
+            blocks = split_outputs(outputs, output_types, tissues)
+            return window_stats({key: b["values"] for key, b in blocks.items()})
+
+        done = 0
+
+        def on_window(scan_window, result):
+            nonlocal done
+            done += 1
+            report_progress((resumed + done) / max(len(windows), 1), f"{resumed + done:,} / {len(windows):,}")
+
+        with ScanCheckpoint(DEFAULT_SCAN_DIR / scan_id, params) as checkpoint:
+            resumed = sum(w in checkpoint for w in windows)
+            summary = run_scan(windows, predict_window, checkpoint, max_workers=concurrency, on_window=on_window)
+            path = checkpoint.directory / "scan_track.tsv"
+            write_scan_track(path, checkpoint.records, stride, lengths)
+        if summary["failed"]:
+            self.client_pool.mark_suspect(api_key)
+        # Like window failures, only the first few dropped regions are listed
+        summary["errors"] = dropped[:10] + summary["errors"]
+        summary["dropped_regions"] = len(dropped)
+        return {"scan_id": scan_id, "path": str(path), "windows": len(windows), **summary}
+
+    def saturation_mutagenesis(
+        self, api_key: str, chromosome: str, start: int, end: int, tissues: list, output_types: list,
+        context_length: int = DEFAULT_MUTAGENESIS_CONTEXT, concurrency: int = DEFAULT_CONCURRENCY,
+        reference_sequence: str | None = None,
+    ) -> dict:
+        """Score all three alternates at every position of ``[start, end)`` (0-based).
+
+        The reference of the shared context window is predicted once; mutants
+        are dispatched at batch priority through a pool of ``concurrency``
+        workers. ``reference_sequence`` holds the context bases; without it
+        they are read from the local reference genome.
+        """
+        start, end = int(start), int(end)
+        if not 0 < end - start <= MAX_MUTAGENESIS_WIDTH:
+            return {"success": False, "error": f"Mutagenesis window must be 1-{MAX_MUTAGENESIS_WIDTH:,} bp"}
+        if context_length not in SUPPORTED_LENGTHS:
+            return {"success": False, "error": f"Context length {context_length} is not supported; use one of {SUPPORTED_LENGTHS}"}
+        context_start, context_end = mutagenesis_context(start, end, context_length)
+        if reference_sequence is None:
+            if self.reference is None:
+                return {"success": False, "error": "Saturation mutagenesis needs a reference genome (ALPHAGENOME_REFERENCE_FASTA)"}
+            try:
+                self.reference.clamp(chromosome, start, end)
+                reference_sequence = self.reference.window_sequence(chromosome, context_start, context_end)
+            except (KeyError, ValueError) as e:
+                return {"success": False, "error": str(e.args[0])}
+
+        cache_key = make_cache_key(
+            "mutagenesis", backend=self.backend.name, chromosome=chromosome, start=start, end=end, context_length=context_length,
+            sequence=reference_sequence, tissues=sorted(tissues), output_types=sorted(output_types),
+        )
+        metrics = self.metrics
+        with metrics.timed("cache_lookup", kind="mutagenesis"):
+            cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return {"success": True, **cached, "key": cache_key, "cached": True}
+
+        try:
+            scheduler = self.scheduler
+            interval = self.backend.interval(chromosome, context_start, context_end)
+            requested_outputs = [self.output_type(o) for o in output_types]
+
+            def predict(sequence: str, key: str, priority: int) -> dict:
+                outputs = scheduler.call(
+                    api_key,
+                    lambda model: model.predict_sequence(
+                        sequence=sequence,
+                        interval=interval,
+                        ontology_terms=list(tissues),
+                        requested_outputs=requested_outputs,
+                    ),
+                    key=key,
+                    priority=priority,
+                )
+                return split_outputs(outputs, output_types, tissues)
+
+            reference_key = f"{cache_key}:reference"
+
+            def predict_reference():
+                with metrics.timed("predict_reference", kind="mutagenesis"):
+                    return predict(reference_sequence, reference_key, INTERACTIVE)
+
+            reference, _ = self.reference_predictions.get_or_compute(reference_key, predict_reference)
+            mutations = plan_mutations(reference_sequence, context_start, start, end)
+            matrix = EffectMatrix(end - start, {key: b["values"].shape[1] for key, b in reference.items()})
+
+            def score_mutant(mutation):
+                with metrics.timed("predict", kind="mutagenesis"):
+                    alternate = predict(
+                        mutate(reference_sequence, context_start, mutation),
+                        f"{cache_key}:{mutation.position}{mutation.alt}",
+                        BATCH,
+                    )
+                return {
+                    "success": True,
+                    "scores": {
+                        key: score_tracks(
+                            b["values"], alternate[key]["values"],
+                            variant_row(mutation.position, context_start, b["resolution"]), b["resolution"],
+                        )
+                        for key, b in reference.items()
+                    },
+                }
+
+            failed, errors = 0, []
+            for done, (mutation, outcome) in enumerate(run_bounded(mutations, score_mutant, max_workers=concurrency), start=1):
+                if outcome.get("success"):
+                    matrix.add(mutation, outcome["scores"])
+                else:
+                    failed += 1
+                    if len(errors) < 10:
+                        errors.append(f"{chromosome}:{mutation.position} {mutation.ref}>{mutation.alt}: {outcome.get('error', '')}")
+                report_progress(done / max(len(mutations), 1), f"{done:,} / {len(mutations):,}")
+            if failed == len(mutations):
+                raise RuntimeError(errors[0] if errors else "No mutations to score")
+
+            with metrics.timed("postprocess", kind="mutagenesis"):
+                result = {
+                    "type": "mutagenesis",
+                    "chromosome": chromosome,
+                    "window_start": start,
+                    "window_end": end,
+                    "reference_bases": reference_sequence[start - context_start:end - context_start],
+                    "tissues": list(tissues),
+                    "output_types": list(output_types),
+                    "context_start": context_start,
+                    "context_end": context_end,
+                    "mutations": len(mutations),
+                    "failed": failed,
+                    "errors": errors,
+                    "predictions": [
+                        {
+                            "output_type": b["output_type"], "tissue": b["tissue"], "resolution": b["resolution"],
+                            "tracks": int(b["values"].shape[1]),
+                            "strongest": strongest_effects(matrix.values[key]["max_abs_delta"], b["names"], start),
+                        }
+                        for key, b in reference.items()
+                    ],
+                    "timestamp": datetime.now().isoformat(),
+                }
+                payload = {
+                    "data": result,
+                    "tracks": {key: to_memmap(b["values"], f"{reference_key}-{key}") for key, b in reference.items()},
+                    "track_names": {key: b["names"] for key, b in reference.items()},
+                    "resolutions": {key: b["resolution"] for key, b in reference.items()},
+                    "mutagenesis": matrix.values,
+                }
+            # Partial runs are not cached, so failed mutants are retried next time
+            if not failed:
+                with metrics.timed("cache_store", kind="mutagenesis"):
+                    self.result_cache.put(cache_key, payload)
+            return {"success": True, **payload, "key": cache_key}
+        except Exception as e:
+            self.client_pool.mark_suspect(api_key)
+            return {"success": False, "error": str(e)}
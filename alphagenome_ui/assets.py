@@ -0,0 +1,28 @@
+"""
+Static assets prepared once per process.
+
+Streamlit re-executes ``app.py`` on every interaction, so anything built there
+is rebuilt per rerun. The stylesheet lives in ``static/style.css`` and is read
+and minified here, at import, into the ``<style>`` block the app injects.
+"""
+
+import re
+from pathlib import Path
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and redundant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+def load_style_block(name: str = "style.css") -> str:
+    """Return ``static/<name>`` as a minified ``<style>`` element."""
+    return f"<style>{minify_css((STATIC_DIR / name).read_text(encoding='utf-8'))}</style>"
+
+
+STYLE_BLOCK = load_style_block()
@@ -0,0 +1,305 @@
+"""
+Pluggable model backends.
+
+The app talks to the model through a small backend object instead of the
+AlphaGenome SDK directly: it builds intervals and variants, maps output type
+names to request values and creates clients for the client pool. The default
+backend wraps the SDK; ``MockBackend`` is an offline stand-in returning
+synthetic tracks with realistic shapes and dtypes, configurable latency and
+error rate, used for development and benchmarks without spending quota.
+
+The backend is chosen with ``ALPHAGENOME_BACKEND`` (``alphagenome`` or
+``mock``); the mock reads ``ALPHAGENOME_MOCK_LATENCY`` (seconds),
+``ALPHAGENOME_MOCK_JITTER`` (fraction), ``ALPHAGENOME_MOCK_ERROR_RATE`` and
+``ALPHAGENOME_MOCK_SEED``.
+"""
+
+import importlib.util
+import os
+import random
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Callable
+
+import numpy as np
+
+from alphagenome_ui.tiling import SUPPORTED_LENGTHS
+
+DEFAULT_BACKEND = "alphagenome"
+
+# (resolution in bp, tracks per ontology term) for each synthetic output type
+MOCK_OUTPUT_SPECS = {
+    "RNA_SEQ": (1, 2),
+    "CAGE": (1, 2),
+    "DNASE": (1, 1),
+    "ATAC": (1, 1),
+    "CHIP_HISTONE": (128, 4),
+}
+
+# Half-width of the region around a variant whose synthetic signal changes
+MOCK_VARIANT_EFFECT_RADIUS = 2048
+
+
+class Backend:
+    """Interface between the app and a model implementation."""
+
+    name = ""
+
+    @property
+    def available(self) -> bool:
+        """Whether the backend can be used in this environment."""
+        raise NotImplementedError
+
+    def create_client(self, api_key: str) -> Any:
+        """Return a client exposing ``predict_sequence/interval/variant``."""
+        raise NotImplementedError
+
+    def interval(self, chromosome: str, start: int, end: int) -> Any:
+        """Build the backend's genomic interval object."""
+        raise NotImplementedError
+
+    def variant(self, chromosome: str, position: int, ref: str, alt: str) -> Any:
+        """Build the backend's variant object (1-based position)."""
+        raise NotImplementedError
+
+    def output_type(self, name: str) -> Any:
+        """Map an ``OUTPUT_TYPES`` key such as ``RNA_SEQ`` to a request value."""
+        raise NotImplementedError
+
+
+class AlphaGenomeBackend(Backend):
+    """The AlphaGenome SDK talking to the hosted model.
+
+    Importing the SDK pulls in gRPC, protobuf, scipy, anndata and matplotlib
+    and dominates a cold start, so it is deferred until a request needs it.
+    """
+
+    name = "alphagenome"
+
+    def __init__(self):
+        self._modules = None
+        self._lock = threading.Lock()
+
+    def _sdk(self) -> tuple:
+        """Import the SDK once, on first use; returns ``(genome, dna_client)``."""
+        if self._modules is None:
+            with self._lock:
+                if self._modules is None:
+                    from alphagenome.data import genome
+                    from alphagenome.models import dna_client
+
+                    self._modules = (genome, dna_client)
+        return self._modules
+
+    @property
+    def available(self) -> bool:
+        return self._modules is not None or importlib.util.find_spec("alphagenome") is not None
+
+    def create_client(self, api_key: str) -> Any:
+        return self._sdk()[1].create(api_key)
+
+    def interval(self, chromosome: str, start: int, end: int) -> Any:
+        return self._sdk()[0].Interval(chromosome=chromosome, start=start, end=end)
+
+    def variant(self, chromosome: str, position: int, ref: str, alt: str) -> Any:
+        return self._sdk()[0].Variant(
+            chromosome=chromosome,
+            position=position,
+            reference_bases=ref,
+            alternate_bases=alt,
+        )
+
+    def output_type(self, name: str) -> Any:
+        output_type = self._sdk()[1].OutputType
+        return getattr(output_type, name, output_type.RNA_SEQ)
+
+
+# =============================================================================
+# OFFLINE MOCK
+# =============================================================================
+class MockBackendError(RuntimeError):
+    """Synthetic transient failure raised by the mock client."""
+
+
+@dataclass(frozen=True)
+class MockInterval:
+    chromosome: str
+    start: int
+    end: int
+
+    @property
+    def width(self) -> int:
+        return self.end - self.start
+
+
+@dataclass(frozen=True)
+class MockVariant:
+    chromosome: str
+    position: int
+    reference_bases: str
+    alternate_bases: str
+
+
+class MockTrackData:
+    """Mimics the SDK's TrackData: ``values``, ``resolution``, ``names``, ``metadata``."""
+
+    def __init__(self, values: np.ndarray, resolution: int, names: list, curies: list):
+        import pandas as pd
+
+        self.values = values
+        self.resolution = resolution
+        self.metadata = pd.DataFrame({"name": names, "ontology_curie": curies})
+
+    @property
+    def names(self) -> list:
+        return self.metadata["name"].tolist()
+
+
+class MockOutput:
+    """Model output with one attribute per output type, ``None`` when not requested."""
+
+    def __init__(self, tracks: dict):
+        for name in MOCK_OUTPUT_SPECS:
+            setattr(self, name.lower(), tracks.get(name))
+
+
+class MockVariantOutput:
+    def __init__(self, reference: MockOutput, alternate: MockOutput):
+        self.reference = reference
+        self.alternate = alternate
+
+
+def _seed(*parts) -> int:
+    """Derive a deterministic RNG seed from request parameters."""
+    return zlib.crc32("|".join(str(p) for p in parts).encode("utf-8"))
+
+
+class MockClient:
+    """Offline client producing deterministic synthetic tracks.
+
+    The same request always yields the same values, so caches and
+    deduplication behave as they would against the live model.
+    """
+
+    def __init__(self, latency: float, jitter: float, error_rate: float, rng: random.Random, rng_lock: threading.Lock):
+        self._latency = latency
+        self._jitter = jitter
+        self._error_rate = error_rate
+        self._rng = rng
+        self._rng_lock = rng_lock
+
+    def _simulate_call(self) -> None:
+        with self._rng_lock:
+            delay = self._latency * (1.0 + self._jitter * self._rng.uniform(-1.0, 1.0))
+            fail = self._rng.random() < self._error_rate
+        if delay > 0:
+            time.sleep(delay)
+        if fail:
+            raise MockBackendError("UNAVAILABLE: synthetic backend failure")
+
+    @staticmethod
+    def _check_length(length: int) -> None:
+        if length not in SUPPORTED_LENGTHS:
+            raise ValueError(f"Sequence length {length} is not supported; use one of {SUPPORTED_LENGTHS}")
+
+    @staticmethod
+    def _tracks(length: int, seed: int, ontology_terms, requested_outputs) -> dict:
+        tracks = {}
+        terms = list(ontology_terms or [])
+        for output_type in requested_outputs:
+            resolution, per_term = MOCK_OUTPUT_SPECS[output_type]
+            rng = np.random.default_rng([seed, _seed(output_type)])
+            values = rng.standard_exponential((length // resolution, per_term * len(terms)), dtype=np.float32)
+            names = [f"{output_type.lower()}_{term}_{i}" for term in terms for i in range(per_term)]
+            curies = [term for term in terms for _ in range(per_term)]
+            tracks[output_type] = MockTrackData(values, resolution, names, curies)
+        return tracks
+
+    def predict_sequence(self, sequence: str, organism=None, interval=None, ontology_terms=None, requested_outputs=(), **kwargs) -> MockOutput:
+        self._check_length(len(sequence))
+        self._simulate_call()
+        seed = _seed("sequence", zlib.crc32(sequence.encode("ascii")), len(sequence))
+        return MockOutput(self._tracks(len(sequence), seed, ontology_terms, requested_outputs))
+
+    def predict_interval(self, interval: MockInterval, organism=None, ontology_terms=None, requested_outputs=(), **kwargs) -> MockOutput:
+        self._check_length(interval.width)
+        self._simulate_call()
+        seed = _seed("interval", interval.chromosome, interval.start, interval.end)
+        return MockOutput(self._tracks(interval.width, seed, ontology_terms, requested_outputs))
+
+    def predict_variant(self, interval: MockInterval, variant: MockVariant, organism=None, ontology_terms=None, requested_outputs=(), **kwargs) -> MockVariantOutput:
+        self._check_length(interval.width)
+        self._simulate_call()
+        seed = _seed("interval", interval.chromosome, interval.start, interval.end)
+        reference = self._tracks(interval.width, seed, ontology_terms, requested_outputs)
+        alternate = {}
+        effect = 1.0 + (_seed(variant.alternate_bases, variant.position) % 100) / 50.0
+        for output_type, track in reference.items():
+            center = (variant.position - 1 - interval.start) // track.resolution
+            radius = max(1, MOCK_VARIANT_EFFECT_RADIUS // track.resolution)
+            values = track.values.copy()
+            values[max(0, center - radius):center + radius] *= effect
+            alternate[output_type] = MockTrackData(values, track.resolution, track.names, track.metadata["ontology_curie"].tolist())
+        return MockVariantOutput(MockOutput(reference), MockOutput(alternate))
+
+
+class MockBackend(Backend):
+    """Offline stand-in for the hosted model."""
+
+    name = "mock"
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.2, error_rate: float = 0.0, seed: int | None = None):
+        self.latency = max(0.0, latency)
+        self.jitter = min(max(0.0, jitter), 1.0)
+        self.error_rate = min(max(0.0, error_rate), 1.0)
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "MockBackend":
+        seed = os.environ.get("ALPHAGENOME_MOCK_SEED")
+        return cls(
+            latency=float(os.environ.get("ALPHAGENOME_MOCK_LATENCY", 0.05)),
+            jitter=float(os.environ.get("ALPHAGENOME_MOCK_JITTER", 0.2)),
+            error_rate=float(os.environ.get("ALPHAGENOME_MOCK_ERROR_RATE", 0.0)),
+            seed=int(seed) if seed is not None else None,
+        )
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def create_client(self, api_key: str) -> MockClient:
+        return MockClient(self.latency, self.jitter, self.error_rate, self._rng, self._rng_lock)
+
+    def interval(self, chromosome: str, start: int, end: int) -> MockInterval:
+        return MockInterval(chromosome, int(start), int(end))
+
+    def variant(self, chromosome: str, position: int, ref: str, alt: str) -> MockVariant:
+        return MockVariant(chromosome, int(position), ref, alt)
+
+    def output_type(self, name: str) -> str:
+        return name if name in MOCK_OUTPUT_SPECS else "RNA_SEQ"
+
+
+BACKENDS: dict[str, Callable[[], Backend]] = {
+    "alphagenome": AlphaGenomeBackend,
+    "mock": MockBackend.from_env,
+}
+
+
+def register_backend(name: str, factory: Callable[[], Backend]) -> None:
+    """Make a backend selectable through ``ALPHAGENOME_BACKEND``."""
+    BACKENDS[name] = factory
+
+
+def get_backend(name: str | None = None) -> Backend:
+    """Create the backend named ``name`` or by ``ALPHAGENOME_BACKEND``."""
+    name = (name or os.environ.get("ALPHAGENOME_BACKEND") or DEFAULT_BACKEND).lower()
+    try:
+        factory = BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown backend {name!r}; choose one of {sorted(BACKENDS)}") from None
+    return factory()
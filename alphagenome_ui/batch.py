@@ -0,0 +1,220 @@
+"""
+Streaming variant-file parsing and bounded concurrent dispatch.
+
+Variant panels (VCF or TSV, optionally gzip-compressed) are parsed line by
+line so that only the records currently in flight are held in memory, and
+predictions are dispatched through a thread pool with a fixed cap on the
+number of outstanding requests.
+"""
+
+import csv
+import gzip
+import io
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import IO, Any, Callable, Iterable, Iterator
+
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 16
+
+_TSV_ALIASES = {
+    "chromosome": ("chromosome", "chrom", "chr", "#chrom"),
+    "position": ("position", "pos", "start"),
+    "ref": ("ref", "reference", "reference_bases"),
+    "alt": ("alt", "alternate", "alternate_bases"),
+    "variant_id": ("id", "variant_id", "rsid", "name"),
+}
+_VALID_BASES = frozenset("ACGTN")
+
+
+@dataclass
+class VariantRecord:
+    """A single REF/ALT pair read from a variant file."""
+
+    line_number: int
+    chromosome: str
+    position: int
+    ref: str
+    alt: str
+    variant_id: str = ""
+
+
+def open_text_stream(fileobj: IO[bytes], name: str = "") -> io.TextIOWrapper:
+    """Wrap a binary upload as a text stream, transparently gunzipping it."""
+    head = fileobj.read(2)
+    fileobj.seek(0)
+    if name.endswith(".gz") or head == b"\x1f\x8b":
+        fileobj = gzip.GzipFile(fileobj=fileobj, mode="rb")
+    return io.TextIOWrapper(fileobj, encoding="utf-8", errors="replace", newline="")
+
+
+def _normalize_chromosome(chromosome: str) -> str:
+    chromosome = chromosome.strip()
+    if not chromosome.lower().startswith("chr"):
+        chromosome = f"chr{chromosome}"
+    return "chr" + chromosome[3:]
+
+
+def _split(line: str) -> list[str]:
+    fields = line.rstrip("\r\n").split("\t")
+    return fields if len(fields) > 1 else line.split()
+
+
+def _header_columns(fields: list[str]) -> dict[str, int] | None:
+    """Map canonical column names to indices if ``fields`` is a TSV header."""
+    lowered = [f.strip().lower() for f in fields]
+    columns = {}
+    for canonical, aliases in _TSV_ALIASES.items():
+        for i, name in enumerate(lowered):
+            if name in aliases:
+                columns[canonical] = i
+                break
+    required = {"chromosome", "position", "ref", "alt"}
+    return columns if required <= columns.keys() else None
+
+
+def iter_variant_records(
+    lines: Iterable[str],
+    errors: list[tuple[int, str]] | None = None,
+) -> Iterator[VariantRecord]:
+    """Yield variant records from VCF or TSV lines.
+
+    VCF input is recognised by its ``##``/``#CHROM`` header; anything else is
+    read as TSV, either with a header naming the chromosome/position/ref/alt
+    columns or positionally in that order. Multi-allelic ALT fields yield one
+    record per allele. Malformed lines are skipped and, if ``errors`` is
+    given, reported there as ``(line_number, message)``.
+    """
+    columns = None
+    is_vcf = False
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        if line.startswith("##"):
+            is_vcf = True
+            continue
+        fields = _split(line)
+        if line.startswith("#"):
+            upper = [f.strip().upper() for f in fields]
+            if upper[:1] == ["#CHROM"] and upper[3:5] == ["REF", "ALT"]:
+                is_vcf = True
+            else:
+                columns = _header_columns(fields)
+            continue
+        if columns is None and not is_vcf:
+            columns = _header_columns(fields)
+            if columns is not None:
+                continue
+            columns = {"chromosome": 0, "position": 1, "ref": 2, "alt": 3}
+        if is_vcf:
+            columns = {"chromosome": 0, "position": 1, "variant_id": 2, "ref": 3, "alt": 4}
+
+        try:
+            chromosome = _normalize_chromosome(fields[columns["chromosome"]])
+            position = int(fields[columns["position"]])
+            ref = fields[columns["ref"]].strip().upper()
+            alts = fields[columns["alt"]].strip().upper().split(",")
+            id_index = columns.get("variant_id")
+            variant_id = fields[id_index].strip() if id_index is not None and id_index < len(fields) else ""
+        except (IndexError, ValueError) as e:
+            if errors is not None:
+                errors.append((line_number, f"unparseable record: {e}"))
+            continue
+
+        if position < 1 or not ref or not set(ref) <= _VALID_BASES:
+            if errors is not None:
+                errors.append((line_number, f"invalid position or REF allele: {position} {ref}"))
+            continue
+        for alt in alts:
+            if not alt or not set(alt) <= _VALID_BASES or alt == ref:
+                if errors is not None:
+                    errors.append((line_number, f"unsupported ALT allele: {alt}"))
+                continue
+            yield VariantRecord(line_number, chromosome, position, ref, alt, "" if variant_id == "." else variant_id)
+
+
+def run_bounded(
+    items: Iterable[Any],
+    fn: Callable[[Any], dict],
+    max_workers: int = DEFAULT_CONCURRENCY,
+    max_pending: int | None = None,
+) -> Iterator[tuple[Any, dict]]:
+    """Apply ``fn`` to ``items`` concurrently, yielding results as they complete.
+
+    ``items`` is consumed lazily: at most ``max_pending`` items (default twice
+    the worker count) are in flight at any time, so arbitrarily long streams
+    run in constant memory. Exceptions raised by ``fn`` are returned as
+    ``{"success": False, "error": ...}`` results. Results are yielded in
+    completion order, not input order.
+    """
+    max_workers = max(1, min(max_workers, MAX_CONCURRENCY))
+    max_pending = max_pending or max_workers * 2
+    iterator = iter(items)
+    exhausted = False
+    pending = {}
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alphagenome-batch")
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(fn, item)] = item
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                item = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"success": False, "error": str(e)}
+                yield item, result
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class BatchResultWriter:
+    """Append batch results to a TSV file as they arrive."""
+
+    FIELDS = [
+        "line_number", "variant_id", "chromosome", "position", "ref", "alt",
+        "status", "error", "predictions", "max_abs_delta", "cached",
+    ]
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rows_written = 0
+        self.failures = 0
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.FIELDS, delimiter="\t", extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, record: VariantRecord, result: dict) -> dict:
+        """Write one result row and return it."""
+        predictions = (result.get("data") or {}).get("predictions", [])
+        row = {
+            **asdict(record),
+            "status": "ok" if result.get("success") else "error",
+            "error": result.get("error", ""),
+            "predictions": len(predictions),
+            "max_abs_delta": max((p.get("max_abs_delta", 0.0) for p in predictions), default=""),
+            "cached": bool(result.get("cached")),
+        }
+        self._writer.writerow(row)
+        self._file.flush()
+        self.rows_written += 1
+        if not result.get("success"):
+            self.failures += 1
+        return row
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,275 @@
+"""
+Command-line batch runner: ``python -m alphagenome_ui``.
+
+Reads a job list (FASTA sequences, VCF/TSV variants or BED intervals),
+runs every job through a headless ``Analyzer`` with bounded concurrency and
+the same result cache, client pool and request scheduler as the app, and
+streams results to disk as they complete: one summary row per (job, output
+type, tissue) to Parquet or TSV, and optionally each job's full tracks to
+its own ``.npz`` file. Streamlit is never imported. FASTA records get the
+app's length and ACGTN checks before dispatch. With a local reference
+genome (``ALPHAGENOME_REFERENCE_FASTA``) variant REF alleles are checked in
+vectorized chunks before dispatch; ``--check-only`` stops there. An API key
+is required unless the backend is ``mock``.
+
+    python -m alphagenome_ui variants panel.vcf.gz --output scores.parquet --tracks-dir tracks/
+    python -m alphagenome_ui intervals regions.bed --output regions.parquet --concurrency 8
+    python -m alphagenome_ui sequences seqs.fa.gz --output sequences.tsv
+    python -m alphagenome_ui scan regions.bed --window 131072 --stride 65536 --output scan.tsv
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from alphagenome_ui.analysis import Analyzer
+from alphagenome_ui.backends import DEFAULT_BACKEND
+from alphagenome_ui.batch import DEFAULT_CONCURRENCY, MAX_CONCURRENCY, iter_variant_records, open_text_stream, run_bounded
+from alphagenome_ui.export import PYARROW_AVAILABLE, TableWriter, write_result
+from alphagenome_ui.fasta import iter_fasta_records, open_binary_stream
+from alphagenome_ui.i18n import OUTPUT_TYPES, TISSUES
+from alphagenome_ui.scan import DEFAULT_SCAN_STRIDE, DEFAULT_SCAN_WINDOW, iter_bed_regions
+from alphagenome_ui.scheduler import BATCH
+from alphagenome_ui.scoring import SCORE_METRICS
+from alphagenome_ui.sequence import ingest_sequence
+from alphagenome_ui.tiling import DEFAULT_OVERLAP, SUPPORTED_LENGTHS
+
+# Columns describing each job, per command
+JOB_COLUMNS = {
+    "sequences": {"job": "int", "name": "str", "length": "int"},
+    "variants": {
+        "job": "int", "line_number": "int", "variant_id": "str", "chromosome": "str",
+        "position": "int", "ref": "str", "alt": "str",
+    },
+    "intervals": {"job": "int", "chromosome": "str", "start": "int", "end": "int"},
+}
+RESULT_COLUMNS = {"status": "str", "error": "str", "cached": "bool", "key": "str", "output_type": "str", "tissue": "str", "resolution": "int", "tracks": "int"}
+PREDICTION_COLUMNS = {
+    "sequences": {"shape": "str", "mean": "float", "max": "float"},
+    "variants": {"ref_shape": "str", "alt_shape": "str", **{m: "float" for m in SCORE_METRICS}, "top_tracks": "str"},
+    "intervals": {"shape": "str", "mean": "float", "max": "float"},
+}
+PRECHECK_CHUNK = 10000
+# Shortest sequence the app accepts; shorter FASTA records fail without a model call
+MIN_SEQUENCE_LENGTH = SUPPORTED_LENGTHS[0]
+SCAN_COLUMNS = {"block": "str", "windows": "int", "mean": "float", "max": "float", "max_window": "str"}
+
+
+def iter_sequence_jobs(path: str, errors: list):
+    """Yield ``(job, fields)`` for every FASTA record, with the app's length and ACGTN checks (``sequence_error``)."""
+    with open(path, "rb") as f:
+        for job, record in enumerate(iter_fasta_records(open_binary_stream(f, path))):
+            report = ingest_sequence(record.sequence)
+            error = None
+            if report.length < MIN_SEQUENCE_LENGTH:
+                error = f"Sequence of {report.length:,} bp is shorter than the {MIN_SEQUENCE_LENGTH:,} bp minimum"
+            elif not report.is_valid:
+                error = f"Invalid DNA sequence: {report.invalid_summary()}"
+            yield job, {
+                "job": job, "name": record.name or f"sequence_{job + 1}", "length": report.length,
+                "sequence": report.packed, "sequence_error": error,
+            }
+
+
+def iter_variant_jobs(path: str, errors: list):
+    """Yield ``(job, fields)`` for every VCF/TSV variant allele."""
+    with open(path, "rb") as f:
+        for job, record in enumerate(iter_variant_records(open_text_stream(f, path), errors)):
+            yield job, {"job": job, **vars(record)}
+
+
+def iter_interval_jobs(path: str, errors: list):
+    """Yield ``(job, fields)`` for every BED region."""
+    with open(path, "rb") as f:
+        for job, (chromosome, start, end) in enumerate(iter_bed_regions(open_text_stream(f, path), errors)):
+            yield job, {"job": job, "chromosome": chromosome, "start": start, "end": end}
+
+
+def precheck_variants(jobs, reference):
+    """Attach each variant's REF check (``ref_error``), checking a chunk at a time."""
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) >= PRECHECK_CHUNK:
+            yield from _checked(chunk, reference)
+            chunk = []
+    yield from _checked(chunk, reference)
+
+
+def _checked(chunk: list, reference):
+    errors = reference.check_refs((f["chromosome"], f["position"], f["ref"]) for _, f in chunk)
+    for (job, fields), error in zip(chunk, errors):
+        yield job, {**fields, "ref_error": error}
+
+
+JOB_READERS = {"sequences": iter_sequence_jobs, "variants": iter_variant_jobs, "intervals": iter_interval_jobs}
+
+
+def run_job(analyzer: Analyzer, command: str, fields: dict, args) -> dict:
+    """Run one job on ``analyzer`` at batch priority; jobs that failed a pre-check fail without a model call."""
+    error = fields.get("ref_error") or fields.get("sequence_error")
+    if error:
+        return {"success": False, "error": error}
+    if getattr(args, "check_only", False):
+        return {"success": True, "data": {}}
+    if command == "sequences":
+        return analyzer.analyze_sequence(args.api_key, fields["sequence"], args.organism, args.tissues, args.outputs, priority=BATCH)
+    if command == "variants":
+        return analyzer.analyze_variant(
+            args.api_key, fields["chromosome"], fields["position"], fields["ref"], fields["alt"], args.tissues, args.outputs,
+            priority=BATCH,
+        )
+    return analyzer.analyze_interval(
+        args.api_key, fields["chromosome"], fields["start"], fields["end"], args.tissues, args.outputs, args.overlap, priority=BATCH,
+    )
+
+
+def result_rows(fields: dict, result: dict) -> list[dict]:
+    """Flatten one job result into summary rows, one per (output type, tissue)."""
+    job = {k: v for k, v in fields.items() if k not in ("sequence", "ref_error", "sequence_error")}
+    if not result.get("success"):
+        return [{**job, "status": "error", "error": result.get("error", "")}]
+    base = {**job, "status": "ok", "error": "", "cached": bool(result.get("cached")), "key": result.get("key", "")}
+    rows = []
+    for prediction in result["data"].get("predictions", []):
+        row = {**base, **prediction}
+        if "top_tracks" in row:
+            row["top_tracks"] = json.dumps(row["top_tracks"])
+        rows.append(row)
+    return rows or [base]
+
+
+def tracks_path(directory: Path, fields: dict) -> Path:
+    """Per-job ``.npz`` path: the job number plus a readable label."""
+    label = fields.get("name") or fields.get("variant_id") or "_".join(
+        str(fields[k]) for k in ("chromosome", "position", "ref", "alt", "start", "end") if k in fields
+    )
+    label = re.sub(r"[^A-Za-z0-9_.-]", "_", str(label))[:80]
+    return directory / f"{fields['job']:06d}_{label}.npz"
+
+
+def run_jobs(analyzer: Analyzer, args) -> dict:
+    """Run every job from ``args.input`` and stream its results to ``args.output``."""
+    errors: list[tuple[int, str]] = []
+    jobs = JOB_READERS[args.command](args.input, errors)
+    if args.command == "variants" and analyzer.reference is not None:
+        jobs = precheck_variants(jobs, analyzer.reference)
+    tracks_dir = Path(args.tracks_dir) if args.tracks_dir else None
+    if tracks_dir is not None:
+        tracks_dir.mkdir(parents=True, exist_ok=True)
+    columns = {**JOB_COLUMNS[args.command], **RESULT_COLUMNS, **PREDICTION_COLUMNS[args.command]}
+
+    done = failed = cached = 0
+    started = time.perf_counter()
+    with TableWriter(args.output, columns, row_group_size=args.row_group_size) as writer:
+        def attempt(job):
+            return run_job(analyzer, args.command, job[1], args)
+
+        # Check-only runs make no model calls, so they skip the thread pool
+        if getattr(args, "check_only", False):
+            results = ((job, attempt(job)) for job in jobs)
+        else:
+            results = run_bounded(jobs, attempt, max_workers=args.concurrency)
+        for (_, fields), result in results:
+            done += 1
+            failed += not result.get("success")
+            cached += bool(result.get("cached"))
+            for row in result_rows(fields, result):
+                writer.write(row)
+            if tracks_dir is not None and result.get("success"):
+                write_result(tracks_path(tracks_dir, fields), result, "npz")
+            if not args.quiet and (done % args.progress_every == 0):
+                elapsed = time.perf_counter() - started
+                print(f"{done:,} jobs  {failed:,} failed  {cached:,} cached  {done / elapsed:.1f} jobs/s", file=sys.stderr)
+
+    return {
+        "command": args.command,
+        "jobs": done,
+        "failed": failed,
+        "cached": cached,
+        "rows": writer.rows_written,
+        "skipped_lines": len(errors),
+        "errors": [f"line {n}: {message}" for n, message in errors[:10]],
+        "elapsed_s": round(time.perf_counter() - started, 3),
+        "output": str(args.output),
+    }
+
+
+def run_scan(analyzer: Analyzer, args) -> dict:
+    """Scan the BED regions in ``args.input`` and write the genome-wide summary to ``args.output``."""
+    errors: list[tuple[int, str]] = []
+    with open(args.input, "rb") as f:
+        regions = list(iter_bed_regions(open_text_stream(f, args.input), errors))
+    summary = analyzer.scan(args.api_key, regions, args.window, args.stride, args.tissues, args.outputs, args.concurrency)
+    with TableWriter(args.output, SCAN_COLUMNS) as writer:
+        for row in summary["summary"]:
+            writer.write(row)
+    return {
+        "command": "scan",
+        **{k: summary[k] for k in ("scan_id", "windows", "completed", "resumed", "failed", "dropped_regions", "errors")},
+        "skipped_lines": len(errors),
+        "track": summary["path"],
+        "output": str(args.output),
+    }
+
+
+def parse_args(argv=None):
+    default_output = "results.parquet" if PYARROW_AVAILABLE else "results.tsv"
+    parser = argparse.ArgumentParser(
+        prog="python -m alphagenome_ui", description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command, help_text in (
+        ("sequences", "predict each record of a (multi-)FASTA file"),
+        ("variants", "score each allele of a VCF or TSV variant file"),
+        ("intervals", "predict each region of a BED file"),
+        ("scan", "sliding-window scan over the regions of a BED file"),
+    ):
+        sub = commands.add_parser(command, help=help_text)
+        sub.add_argument("input", help="input file, optionally gzip-compressed")
+        sub.add_argument("--output", default=default_output, help=f"summary table; .parquet or .tsv (default: {default_output})")
+        sub.add_argument("--api-key", default=os.environ.get("ALPHAGENOME_API_KEY", ""), help="defaults to $ALPHAGENOME_API_KEY")
+        sub.add_argument("--tissues", nargs="+", default=list(TISSUES)[:1], metavar="CURIE", help="ontology terms, e.g. UBERON:0002048")
+        sub.add_argument("--outputs", nargs="+", default=list(OUTPUT_TYPES)[:1], choices=list(OUTPUT_TYPES))
+        sub.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help=f"jobs in flight (max {MAX_CONCURRENCY})")
+        sub.add_argument("--quiet", action="store_true", help="no progress on stderr")
+        if command == "scan":
+            sub.add_argument("--window", type=int, default=DEFAULT_SCAN_WINDOW)
+            sub.add_argument("--stride", type=int, default=DEFAULT_SCAN_STRIDE)
+            continue
+        sub.add_argument("--tracks-dir", help="also write each job's tracks as <job>_<label>.npz here")
+        sub.add_argument("--row-group-size", type=int, default=1024, help="summary rows per Parquet row group")
+        sub.add_argument("--progress-every", type=int, default=100, help="report progress every N jobs")
+        if command == "variants":
+            sub.add_argument("--check-only", action="store_true", help="only check REF alleles against the reference genome")
+        if command == "sequences":
+            sub.add_argument("--organism", choices=["human", "mouse"], default="human")
+        if command == "intervals":
+            sub.add_argument("--overlap", type=int, default=DEFAULT_OVERLAP, help="tile overlap in bp for wide regions")
+    args = parser.parse_args(argv)
+    backend = (os.environ.get("ALPHAGENOME_BACKEND") or DEFAULT_BACKEND).lower()
+    if not args.api_key and backend != "mock" and not getattr(args, "check_only", False):
+        parser.error("an API key is required: pass --api-key or set ALPHAGENOME_API_KEY")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    if Path(args.output).suffix == ".parquet" and not PYARROW_AVAILABLE:
+        print("Parquet output requires pyarrow; use a .tsv output instead", file=sys.stderr)
+        return 2
+    analyzer = Analyzer()
+    if getattr(args, "check_only", False) and analyzer.reference is None:
+        print("--check-only needs a reference genome; set ALPHAGENOME_REFERENCE_FASTA", file=sys.stderr)
+        return 2
+    if not analyzer.available:
+        print(f"Backend '{analyzer.backend.name}' is not available in this environment", file=sys.stderr)
+        return 2
+    report = run_scan(analyzer, args) if args.command == "scan" else run_jobs(analyzer, args)
+    report["scheduler"] = analyzer.scheduler.stats()
+    print(json.dumps(report, indent=2))
+    return 1 if report["failed"] else 0
@@ -0,0 +1,188 @@
+"""
+Shared, health-checked pool of AlphaGenome clients.
+
+Creating a client opens a gRPC channel and waits for the TLS/auth handshake,
+which dominates the latency of small requests. The pool keeps one client per
+API key (keyed by a SHA-256 digest, never the raw key), evicts clients that
+have been idle longer than a TTL and caps the number of open channels.
+"""
+
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+DEFAULT_IDLE_TTL = 15 * 60.0
+DEFAULT_MAX_CLIENTS = 32
+DEFAULT_HEALTH_CHECK_INTERVAL = 60.0
+DEFAULT_HEALTH_TIMEOUT = 5.0
+
+
+def hash_api_key(api_key: str) -> str:
+    """Return a stable, non-reversible identifier for an API key."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+
+
+def _close_client(client: Any) -> None:
+    """Close the gRPC channel behind a client, ignoring clients without one."""
+    channel = getattr(client, "_channel", None)
+    if channel is not None:
+        try:
+            channel.close()
+        except Exception:
+            pass
+
+
+def _is_client_healthy(client: Any, timeout: float) -> bool:
+    """Check that the client's channel is (or can become) ready."""
+    channel = getattr(client, "_channel", None)
+    if channel is None:
+        return True
+    try:
+        import grpc
+
+        grpc.channel_ready_future(channel).result(timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+@dataclass
+class _PoolEntry:
+    client: Any
+    created_at: float
+    last_used: float
+    last_checked: float
+    suspect: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ClientPool:
+    """Thread-safe pool of model clients keyed by API key hash."""
+
+    def __init__(
+        self,
+        factory: Callable[[str], Any],
+        idle_ttl: float = DEFAULT_IDLE_TTL,
+        max_clients: int = DEFAULT_MAX_CLIENTS,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+        health_timeout: float = DEFAULT_HEALTH_TIMEOUT,
+        health_check: Callable[[Any, float], bool] = _is_client_healthy,
+        close: Callable[[Any], None] = _close_client,
+    ):
+        self._factory = factory
+        self._idle_ttl = idle_ttl
+        self._max_clients = max(1, max_clients)
+        self._health_check_interval = health_check_interval
+        self._health_timeout = health_timeout
+        self._health_check = health_check
+        self._close = close
+        self._entries: dict[str, _PoolEntry] = {}
+        self._creating: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "health_failures": 0}
+
+    def get(self, api_key: str) -> Any:
+        """Return a ready client for ``api_key``, creating one if needed."""
+        key = hash_api_key(api_key)
+        self.evict_idle()
+
+        client = self._checkout(key)
+        if client is not None:
+            return client
+
+        # Serialize creation per key so concurrent sessions sharing a key
+        # perform the handshake only once, without blocking other keys.
+        with self._lock:
+            create_lock = self._creating.setdefault(key, threading.Lock())
+        with create_lock:
+            client = self._checkout(key)
+            if client is not None:
+                return client
+            try:
+                client = self._factory(api_key)
+                now = time.monotonic()
+                with self._lock:
+                    self._stats["misses"] += 1
+                    self._entries[key] = _PoolEntry(client, now, now, now)
+                    self._enforce_capacity(keep=key)
+            finally:
+                with self._lock:
+                    self._creating.pop(key, None)
+            return client
+
+    def _checkout(self, key: str) -> Any:
+        """Return the pooled client for ``key`` if present and healthy."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        now = time.monotonic()
+        with entry.lock:
+            if entry.suspect or now - entry.last_checked >= self._health_check_interval:
+                healthy = self._health_check(entry.client, self._health_timeout)
+                entry.last_checked = time.monotonic()
+                entry.suspect = False
+                if not healthy:
+                    with self._lock:
+                        self._stats["health_failures"] += 1
+                        if self._entries.get(key) is entry:
+                            del self._entries[key]
+                    self._close(entry.client)
+                    return None
+            entry.last_used = time.monotonic()
+
+        with self._lock:
+            self._stats["hits"] += 1
+        return entry.client
+
+    def _enforce_capacity(self, keep: str) -> None:
+        """Close least recently used clients above the cap. Caller holds the lock."""
+        while len(self._entries) > self._max_clients:
+            victim = min(
+                (k for k in self._entries if k != keep),
+                key=lambda k: self._entries[k].last_used,
+            )
+            entry = self._entries.pop(victim)
+            self._stats["evictions"] += 1
+            self._close(entry.client)
+
+    def mark_suspect(self, api_key: str) -> None:
+        """Force a health check before the client for ``api_key`` is reused."""
+        with self._lock:
+            entry = self._entries.get(hash_api_key(api_key))
+            if entry is not None:
+                entry.suspect = True
+
+    def invalidate(self, api_key: str) -> None:
+        """Drop and close the client for ``api_key``."""
+        with self._lock:
+            entry = self._entries.pop(hash_api_key(api_key), None)
+        if entry is not None:
+            self._close(entry.client)
+
+    def evict_idle(self) -> int:
+        """Close clients idle for longer than the TTL. Returns the number evicted."""
+        cutoff = time.monotonic() - self._idle_ttl
+        with self._lock:
+            expired = [k for k, e in self._entries.items() if e.last_used < cutoff]
+            victims = [self._entries.pop(k) for k in expired]
+            self._stats["evictions"] += len(victims)
+        for entry in victims:
+            self._close(entry.client)
+        return len(victims)
+
+    def close_all(self) -> None:
+        """Close every pooled client."""
+        with self._lock:
+            victims = list(self._entries.values())
+            self._entries.clear()
+        for entry in victims:
+            self._close(entry.client)
+
+    def stats(self) -> dict:
+        """Return pool counters and the number of open clients."""
+        with self._lock:
+            return {**self._stats, "open_clients": len(self._entries)}
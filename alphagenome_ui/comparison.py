@@ -0,0 +1,70 @@
+"""
+Splitting of batched multi-tissue / multi-output predictions.
+
+A single model call can request several ontology terms and output types at
+once. The returned tracks are split back per (output type, tissue) using the
+track metadata, summarized, and pivoted into a comparison table.
+"""
+
+import numpy as np
+
+from alphagenome_ui.scoring import summarize_scores
+
+ALL_TISSUES = "*"
+
+
+def track_key(output_type: str, tissue: str, allele: str = "") -> str:
+    """Key of one split track block, e.g. ``RNA_SEQ/UBERON:0002048/alternate``."""
+    return "/".join(part for part in (output_type, tissue, allele) if part)
+
+
+def split_by_tissue(values: np.ndarray, curies, names, tissues: list[str]) -> dict[str, tuple[np.ndarray, list[str]]]:
+    """Split the track axis of ``values`` by ontology curie.
+
+    ``curies`` holds one ontology curie per track (the ``ontology_curie``
+    metadata column). When it is None the tracks cannot be attributed and
+    are returned whole under ``ALL_TISSUES``.
+    """
+    names = np.asarray(names, dtype=object)
+    if curies is None:
+        return {ALL_TISSUES: (values, names.tolist())}
+    curies = np.asarray(curies, dtype=object)
+    split = {}
+    for tissue in tissues:
+        mask = curies == tissue
+        if mask.any():
+            split[tissue] = (values[..., mask], names[mask].tolist())
+    return split
+
+
+def summarize_tracks(values: np.ndarray) -> dict:
+    """Shape and simple statistics of a ``(positions, tracks)`` block."""
+    return {
+        "shape": str(values.shape),
+        "tracks": int(values.shape[-1]),
+        "mean": float(values.mean(dtype=np.float64)) if values.size else 0.0,
+        "max": float(values.max()) if values.size else 0.0,
+    }
+
+
+def summarize_variant_tracks(reference: np.ndarray, alternate: np.ndarray, scores: dict, names: list[str]) -> dict:
+    """Shapes of a variant block plus its strongest scores and top affected tracks.
+
+    ``scores`` holds the per-track arrays from ``scoring.score_tracks``.
+    """
+    return {
+        "ref_shape": str(reference.shape),
+        "alt_shape": str(alternate.shape),
+        "tracks": int(reference.shape[-1]),
+        **summarize_scores(scores, names),
+    }
+
+
+def comparison_table(predictions: list[dict], metric: str):
+    """Pivot per-(tissue, output type) summaries into a tissue × output table."""
+    import pandas as pd
+
+    frame = pd.DataFrame(predictions)
+    if frame.empty or metric not in frame:
+        return frame
+    return frame.pivot_table(index="tissue", columns="output_type", values=metric, aggfunc="first")
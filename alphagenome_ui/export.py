@@ -0,0 +1,263 @@
+"""
+Binary export of prediction tracks.
+
+Results carry their track arrays as ``{name: (positions, tracks) array}``.
+They are exported as NumPy ``.npz``, Parquet or Arrow IPC files, written
+once per (result, format) into a temp directory and served from disk, so
+reruns never re-encode the payload. Large arrays are moved into
+memory-mapped ``.npy`` files so sessions do not pin them in RAM. Files not
+used for ``EXPORT_TTL_SECONDS`` are swept from the export directory.
+``TableWriter`` streams batch summary rows to Parquet row groups or TSV.
+"""
+
+import importlib.util
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# pyarrow is imported by the Parquet/Arrow writers on first use, not at startup
+PYARROW_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_DIR = Path(tempfile.gettempdir()) / "alphagenome_ui_exports"
+MEMMAP_THRESHOLD_BYTES = 32 * 1024 * 1024
+EXPORT_TTL_SECONDS = float(os.environ.get("ALPHAGENOME_EXPORT_TTL", 24 * 60 * 60))
+# Sweeps run at most this often per directory
+_SWEEP_INTERVAL = 10 * 60.0
+_last_sweep: dict[Path, float] = {}
+_sweep_lock = threading.Lock()
+
+EXPORT_FORMATS = {
+    "npz": {"label": "NumPy (.npz)", "extension": "npz", "mime": "application/octet-stream"},
+    "parquet": {"label": "Parquet", "extension": "parquet", "mime": "application/vnd.apache.parquet"},
+    "arrow": {"label": "Arrow IPC", "extension": "arrow", "mime": "application/vnd.apache.arrow.file"},
+}
+
+
+def available_formats() -> list[str]:
+    """Export formats usable with the installed packages."""
+    return [f for f in EXPORT_FORMATS if f == "npz" or PYARROW_AVAILABLE]
+
+
+def unique_track_names(names: list[str]) -> list[str]:
+    """Disambiguate repeated track names (e.g. per-strand tracks) with a suffix."""
+    seen: dict[str, int] = {}
+    unique = []
+    for name in names:
+        count = seen.get(name, 0)
+        seen[name] = count + 1
+        unique.append(name if count == 0 else f"{name}#{count}")
+    return unique
+
+
+def sweep_exports(directory: Path = EXPORT_DIR, max_age: float = EXPORT_TTL_SECONDS) -> int:
+    """Delete files in ``directory`` unused for ``max_age`` seconds. Returns the number removed.
+
+    Memory-mapped arrays already handed out stay readable after their file is removed.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    for path in directory.glob("*"):
+        try:
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def _touch(path: Path, directory: Path) -> None:
+    """Mark ``path`` as used and sweep ``directory`` if the last sweep is old enough."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    now = time.monotonic()
+    with _sweep_lock:
+        if now - _last_sweep.get(directory, -_SWEEP_INTERVAL) < _SWEEP_INTERVAL:
+            return
+        _last_sweep[directory] = now
+    sweep_exports(directory)
+
+
+def to_memmap(array: np.ndarray, key: str, directory: Path = EXPORT_DIR) -> np.ndarray:
+    """Return ``array`` backed by a read-only memory-mapped ``.npy`` file.
+
+    Arrays below ``MEMMAP_THRESHOLD_BYTES`` are returned unchanged. The file is
+    written once per ``key``; later calls map the existing file.
+    """
+    if array.nbytes < MEMMAP_THRESHOLD_BYTES:
+        return array
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', key)}.npy"
+    if not path.exists():
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=array.dtype, shape=array.shape)
+        out[...] = array
+        out.flush()
+        del out
+        os.replace(tmp, path)
+    _touch(path, directory)
+    return np.load(path, mmap_mode="r")
+
+
+def _write_npz(path: Path, result: dict) -> None:
+    arrays = {name: np.asarray(values) for name, values in result["tracks"].items()}
+    for name, names in result.get("track_names", {}).items():
+        arrays[f"{name}/track_names"] = np.asarray(names, dtype=str)
+    for name, metrics in result.get("mutagenesis", {}).items():
+        for metric, values in metrics.items():
+            arrays[f"mutagenesis/{name}/{metric}"] = np.asarray(values)
+    arrays["metadata"] = np.asarray(json.dumps(result["data"], default=str))
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def _arrow_table(result: dict):
+    """One row per position at the finest resolution; coarser blocks are repeated."""
+    import pyarrow as pa
+
+    data = result["data"]
+    tracks = result["tracks"]
+    resolutions = result.get("resolutions", {})
+    finest = min((int(resolutions.get(name, 1)) for name in tracks), default=1)
+    origin = int(data.get("start", data.get("context_start", 0)))
+    rows = max(np.asarray(values).shape[0] * int(resolutions.get(name, 1)) // finest for name, values in tracks.items())
+    columns = {"position": origin + np.arange(rows, dtype=np.int64) * finest}
+    for name, values in tracks.items():
+        values = np.asarray(values)
+        factor = int(resolutions.get(name, 1)) // finest
+        if factor > 1:
+            values = np.repeat(values, factor, axis=0)
+        names = list(result.get("track_names", {}).get(name, []))
+        if len(names) != values.shape[-1]:
+            names = [str(i) for i in range(values.shape[-1])]
+        prefix = "" if len(tracks) == 1 else f"{name}:"
+        for i, track_name in enumerate(unique_track_names(names)):
+            column = np.full(rows, np.nan, dtype=np.float32)
+            n = min(rows, values.shape[0])
+            column[:n] = values[:n, i]
+            columns[f"{prefix}{track_name}"] = column
+    metadata = {b"alphagenome_ui": json.dumps(data, default=str).encode("utf-8")}
+    return pa.table(columns).replace_schema_metadata(metadata)
+
+
+def _write_parquet(path: Path, result: dict) -> None:
+    import pyarrow.parquet as pq
+
+    pq.write_table(_arrow_table(result), path, compression="zstd")
+
+
+def _write_arrow(path: Path, result: dict) -> None:
+    import pyarrow as pa
+
+    table = _arrow_table(result)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+_WRITERS = {"npz": _write_npz, "parquet": _write_parquet, "arrow": _write_arrow}
+
+
+def export_result(result: dict, fmt: str, key: str, directory: Path = EXPORT_DIR) -> Path:
+    """Write ``result`` in ``fmt`` once and return the file path.
+
+    ``key`` identifies the result content (e.g. its cache key); an existing
+    export for the same key and format is reused as-is.
+    """
+    if fmt not in available_formats():
+        raise ValueError(f"Export format not available: {fmt}")
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{key}.{EXPORT_FORMATS[fmt]['extension']}"
+    if not path.exists():
+        write_result(path, result, fmt)
+    _touch(path, directory)
+    return path
+
+
+def write_result(path: str | Path, result: dict, fmt: str) -> Path:
+    """Write ``result`` to ``path`` in ``fmt`` atomically (via a temp file) and return the path."""
+    if fmt not in available_formats():
+        raise ValueError(f"Export format not available: {fmt}")
+    path = Path(path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        _WRITERS[fmt](tmp, result)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return path
+
+
+class TableWriter:
+    """Stream summary rows to Parquet (one row group per ``row_group_size`` rows) or TSV.
+
+    ``columns`` fixes the schema up front as ``{name: "str" | "int" | "float" | "bool"}``;
+    missing values are written as nulls. Parquet is used for ``.parquet`` paths,
+    TSV for anything else.
+    """
+
+    _ARROW_TYPES = {"str": "string", "int": "int64", "float": "float64", "bool": "bool_"}
+
+    def __init__(self, path: str | Path, columns: dict[str, str], row_group_size: int = 1024):
+        self.path = Path(path)
+        self.columns = columns
+        self.row_group_size = max(1, row_group_size)
+        self.rows_written = 0
+        self._rows: list[dict] = []
+        self.format = "parquet" if self.path.suffix == ".parquet" else "tsv"
+        if self.format == "parquet":
+            if not PYARROW_AVAILABLE:
+                raise ValueError("Parquet output requires pyarrow")
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            self._schema = pa.schema([(name, getattr(pa, self._ARROW_TYPES[kind])()) for name, kind in columns.items()])
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression="zstd")
+        else:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._file.write("\t".join(columns) + "\n")
+
+    def write(self, row: dict) -> None:
+        """Buffer one row, flushing a row group once enough rows have arrived."""
+        self._rows.append(row)
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows to disk."""
+        if not self._rows:
+            return
+        if self.format == "parquet":
+            import pyarrow as pa
+
+            table = pa.Table.from_pylist([{name: row.get(name) for name in self.columns} for row in self._rows], schema=self._schema)
+            self._writer.write_table(table)
+        else:
+            for row in self._rows:
+                values = ("" if row.get(name) is None else str(row[name]) for name in self.columns)
+                self._file.write("\t".join(v.replace("\t", " ").replace("\n", " ") for v in values) + "\n")
+            self._file.flush()
+        self.rows_written += len(self._rows)
+        self._rows.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self.format == "parquet":
+            self._writer.close()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,98 @@
+"""
+Incremental FASTA / multi-FASTA / gzip parsing.
+
+Uploads are read in fixed-size chunks; each chunk is upper-cased and stripped
+of whitespace with a single ``bytes.translate`` call, so only the cleaned
+bases of each record are ever accumulated.
+"""
+
+import gzip
+from dataclasses import dataclass
+from typing import IO, Iterator
+
+from alphagenome_ui.packed_sequence import PackedSequence
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+_UPPERCASE_TABLE = bytes.maketrans(b"acgtnu", b"ACGTNU")
+_WHITESPACE = b" \t\r\n\v\f"
+
+
+@dataclass
+class FastaRecord:
+    """A FASTA record holding its cleaned, upper-case sequence bytes (or their ``PackedSequence``)."""
+
+    name: str
+    sequence: bytes | PackedSequence
+
+    def __len__(self) -> int:
+        return len(self.sequence)
+
+
+def normalize_sequence_bytes(data: bytes) -> bytes:
+    """Upper-case ``data`` and drop whitespace in one pass."""
+    return data.translate(_UPPERCASE_TABLE, delete=_WHITESPACE)
+
+
+def open_binary_stream(fileobj: IO[bytes], name: str = "") -> IO[bytes]:
+    """Return ``fileobj`` itself, or a gzip reader when it is compressed."""
+    head = fileobj.read(2)
+    fileobj.seek(0)
+    if name.endswith(".gz") or head == b"\x1f\x8b":
+        return gzip.GzipFile(fileobj=fileobj, mode="rb")
+    return fileobj
+
+
+def iter_fasta_records(stream: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[FastaRecord]:
+    """Yield records from a (multi-)FASTA byte stream.
+
+    Headers may span chunk boundaries. Data before the first header (e.g. a
+    bare sequence file) is returned as a record with an empty name.
+    """
+    name = None
+    header = bytearray()
+    sequence = bytearray()
+    in_header = False
+    at_line_start = True
+
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        pos = 0
+        size = len(chunk)
+        while pos < size:
+            if in_header:
+                newline = chunk.find(b"\n", pos)
+                if newline == -1:
+                    header += chunk[pos:]
+                    break
+                header += chunk[pos:newline]
+                name = header.decode("utf-8", errors="replace").strip()
+                header.clear()
+                in_header = False
+                at_line_start = True
+                pos = newline + 1
+                continue
+
+            # '>' only starts a header at the beginning of a line.
+            if at_line_start and chunk.startswith(b">", pos):
+                sequence_end = pos
+            else:
+                newline = chunk.find(b"\n>", pos)
+                if newline == -1:
+                    sequence += normalize_sequence_bytes(chunk[pos:])
+                    at_line_start = chunk.endswith(b"\n")
+                    break
+                sequence_end = newline + 1
+            sequence += normalize_sequence_bytes(chunk[pos:sequence_end])
+            if name is not None or sequence:
+                yield FastaRecord(name or "", bytes(sequence))
+            sequence.clear()
+            in_header = True
+            pos = sequence_end + 1
+
+    if in_header and header:
+        name = header.decode("utf-8", errors="replace").strip()
+    if name is not None or sequence:
+        yield FastaRecord(name or "", bytes(sequence))
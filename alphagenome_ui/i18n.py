@@ -0,0 +1,236 @@
+"""
+Translation and label tables.
+
+Kept in an imported module so the tables are built once per process instead
+of on every Streamlit rerun.
+"""
+
+TRANSLATIONS = {
+    "tr": {
+        "title": "🧬 AlphaGenome DNA Analiz Aracı",
+        "subtitle": "Google DeepMind AlphaGenome modeli ile genomik analizler",
+        "api_key": "API Anahtarı",
+        "api_key_placeholder": "AlphaGenome API anahtarınızı girin",
+        "api_key_help": "API anahtarınızı [AlphaGenome Portal](https://deepmind.google.com/science/alphagenome) adresinden alabilirsiniz.",
+        "language": "Dil",
+        "sequence_analysis": "Sekans Analizi",
+        "variant_analysis": "Varyant Tahmini",
+        "interval_analysis": "Bölge Analizi",
+        "sequence": "DNA Sekansı",
+        "sequence_placeholder": "DNA sekansınızı girin (A, T, G, C, N)...",
+        "sequence_length": "Sekans Uzunluğu",
+        "min_length_warning": "⚠️ Minimum 16,384 baz çifti gerekli",
+        "sequence_packed": "Sekans bellekte sıkıştırılmış olarak tutuluyor; yer kaplamaması için metin kutusu temizlendi. Değiştirmek için yeni bir sekans yapıştırın.",
+        "organism": "Organizma",
+        "human": "İnsan",
+        "mouse": "Fare",
+        "tissue": "Doku/Hücre Tipi",
+        "output_type": "Çıktı Türü",
+        "chromosome": "Kromozom",
+        "position": "Pozisyon",
+        "reference": "Referans Baz",
+        "alternate": "Alternatif Baz",
+        "start": "Başlangıç",
+        "end": "Bitiş",
+        "analyze": "Analiz Et",
+        "load_example": "Örnek Yükle",
+        "clear": "Temizle",
+        "results": "Sonuçlar",
+        "download_json": "JSON İndir",
+        "analyzing": "Analiz yapılıyor...",
+        "error": "Hata",
+        "success": "Başarılı",
+        "no_api_key": "Lütfen önce API anahtarınızı girin",
+        "developer": "Geliştirici",
+        "contribute": "Katkıda Bulunun",
+        "contribute_text": "Bilimin gelişimini hızlandırmak için bu projeye katkıda bulunabilirsiniz. Kollektif bilime inanıyoruz!",
+        "non_commercial": "⚠️ Ticari amaçlar için kullanılamaz. Yalnızca akademik ve araştırma amaçlıdır.",
+        "cached_result": "♻️ Sonuç önbellekten getirildi",
+        "reference_shared": "♻️ Referans tahmini yakındaki bir varyantla paylaşıldı",
+        "reference_sharing_hint": "Yakındaki varyantların referans tahminini paylaşması için ALPHAGENOME_REFERENCE_FASTA ile yerel bir referans genom ayarlayın",
+        "context_flanks": "Bağlam (sol / sağ)",
+        "batch_variants": "Toplu Varyant Analizi (VCF/TSV)",
+        "upload_variants": "VCF veya TSV dosyası yükleyin (.gz desteklenir)",
+        "concurrency": "Eşzamanlı istek sayısı",
+        "analyze_batch": "Toplu Analiz Et",
+        "batch_done": "Toplu analiz tamamlandı",
+        "batch_skipped": "Atlanan satır",
+        "download_results": "Sonuçları İndir (TSV)",
+        "upload_fasta": "veya FASTA dosyası yükleyin (.fa, .fasta, .fa.gz)",
+        "fasta_records": "FASTA kaydı",
+        "record": "Kayıt",
+        "invalid_sequence": "Geçersiz DNA sekansı",
+        "composition": "Baz Kompozisyonu",
+        "window_gc": "Pencere başına GC oranı",
+        "tile_overlap": "Pencere örtüşmesi (bp)",
+        "tile_overlap_help": "Uzun bölgeler desteklenen pencere boyutlarına bölünür; ardışık pencereler bu kadar örtüşür ve örtüşmeler harmanlanır.",
+        "windows": "Pencere",
+        "select_tissue_output": "Lütfen en az bir doku ve bir çıktı türü seçin",
+        "backend_active": "🧪 Alternatif model arka ucu etkin: **{name}**",
+        "diagnostics": "Tanılama",
+        "no_timings": "Henüz ölçüm yok",
+        "download_metrics": "Prometheus metrikleri",
+        "metrics_files": "Metrik dosyaları",
+        "track_view": "Track Görünümü",
+        "track_group": "Track grubu",
+        "tracks": "Track'ler",
+        "view_range": "Görüntülenen aralık (bp)",
+        "decimation": "Seyreltme",
+        "top_tracks": "En Çok Etkilenen İzler",
+        "score_metric": "Skor",
+        "top_k": "İlk k",
+        "scheduler": "İstek zamanlayıcı",
+        "result_store": "Paylaşılan sonuç deposu",
+        "reference_genome": "Referans genom",
+        "track_store": "İz deposu",
+        "chromosome_length": "Kromozom uzunluğu",
+        "mutagenesis": "Satürasyon Mutagenezi",
+        "mutagenesis_needs_reference": "Satürasyon mutagenezi için yerel referans genom gerekir (ALPHAGENOME_REFERENCE_FASTA).",
+        "mutagenesis_width": "Pencere genişliği (bp)",
+        "context_length": "Bağlam uzunluğu",
+        "mutations": "Mutasyon",
+        "analyze_mutagenesis": "🧪 Tüm Mutasyonları Skorla",
+        "strongest_track": "En güçlü etki (tüm track'ler)",
+        "scan_mode": "Kayan Pencere Taraması (Aralık / BED)",
+        "scan_source": "Kaynak",
+        "scan_range": "Kromozom aralığı",
+        "scan_bed": "BED dosyası",
+        "upload_bed": "BED dosyası yükleyin (.gz desteklenir)",
+        "scan_window": "Pencere boyutu",
+        "scan_stride": "Adım",
+        "analyze_scan": "Taramayı Başlat / Sürdür",
+        "scan_resume_help": "Aynı parametrelerle yeniden başlatılan tarama, tamamlanan pencereleri atlayarak kaldığı yerden devam eder.",
+        "scan_done": "Tarama tamamlandı",
+        "scan_resumed": "Kontrol noktasından devralınan pencere",
+        "download_scan": "Tarama İzini İndir (TSV)",
+        "comparison": "Doku × Çıktı Karşılaştırması",
+        "job_failed": "Arka plan işi başarısız oldu",
+        "job_interrupted": "Arka plan işi yarıda kesildi (sunucu yeniden başlatıldı). Lütfen analizi tekrar çalıştırın.",
+        "sdk_not_installed": "⚠️ AlphaGenome SDK yüklü değil. Lütfen `pip install git+https://github.com/google-deepmind/alphagenome.git` komutu ile yükleyin.",
+    },
+    "en": {
+        "title": "🧬 AlphaGenome DNA Analysis Tool",
+        "subtitle": "Genomic analysis with Google DeepMind AlphaGenome model",
+        "api_key": "API Key",
+        "api_key_placeholder": "Enter your AlphaGenome API key",
+        "api_key_help": "Get your API key from [AlphaGenome Portal](https://deepmind.google.com/science/alphagenome).",
+        "language": "Language",
+        "sequence_analysis": "Sequence Analysis",
+        "variant_analysis": "Variant Prediction",
+        "interval_analysis": "Region Analysis",
+        "sequence": "DNA Sequence",
+        "sequence_placeholder": "Enter your DNA sequence (A, T, G, C, N)...",
+        "sequence_length": "Sequence Length",
+        "min_length_warning": "⚠️ Minimum 16,384 base pairs required",
+        "sequence_packed": "The sequence is held packed in memory; the text box was cleared so it is not stored twice. Paste a new sequence to replace it.",
+        "organism": "Organism",
+        "human": "Human",
+        "mouse": "Mouse",
+        "tissue": "Tissue/Cell Type",
+        "output_type": "Output Type",
+        "chromosome": "Chromosome",
+        "position": "Position",
+        "reference": "Reference Base",
+        "alternate": "Alternate Base",
+        "start": "Start",
+        "end": "End",
+        "analyze": "Analyze",
+        "load_example": "Load Example",
+        "clear": "Clear",
+        "results": "Results",
+        "download_json": "Download JSON",
+        "analyzing": "Analyzing...",
+        "error": "Error",
+        "success": "Success",
+        "no_api_key": "Please enter your API key first",
+        "developer": "Developer",
+        "contribute": "Contribute",
+        "contribute_text": "Contribute to this project to accelerate scientific progress. We believe in collective science!",
+        "non_commercial": "⚠️ Not for commercial use. For academic and research purposes only.",
+        "cached_result": "♻️ Result served from cache",
+        "reference_shared": "♻️ Reference prediction shared with a nearby variant",
+        "reference_sharing_hint": "Set a local reference genome with ALPHAGENOME_REFERENCE_FASTA so nearby variants share one reference prediction",
+        "context_flanks": "Context (left / right)",
+        "batch_variants": "Batch Variant Scoring (VCF/TSV)",
+        "upload_variants": "Upload a VCF or TSV file (.gz supported)",
+        "concurrency": "Concurrent requests",
+        "analyze_batch": "Analyze Batch",
+        "batch_done": "Batch analysis finished",
+        "batch_skipped": "Skipped lines",
+        "download_results": "Download Results (TSV)",
+        "upload_fasta": "or upload a FASTA file (.fa, .fasta, .fa.gz)",
+        "fasta_records": "FASTA records",
+        "record": "Record",
+        "invalid_sequence": "Invalid DNA sequence",
+        "composition": "Base Composition",
+        "window_gc": "GC fraction per window",
+        "tile_overlap": "Window overlap (bp)",
+        "tile_overlap_help": "Long regions are split into supported window sizes; consecutive windows share this many bases and the overlaps are blended.",
+        "windows": "Windows",
+        "select_tissue_output": "Please select at least one tissue and one output type",
+        "backend_active": "🧪 Alternative model backend active: **{name}**",
+        "diagnostics": "Diagnostics",
+        "no_timings": "No timings recorded yet",
+        "download_metrics": "Prometheus metrics",
+        "metrics_files": "Metric files",
+        "track_view": "Track View",
+        "track_group": "Track group",
+        "tracks": "Tracks",
+        "view_range": "View range (bp)",
+        "decimation": "Decimation",
+        "top_tracks": "Top Affected Tracks",
+        "score_metric": "Score",
+        "top_k": "Top k",
+        "scheduler": "Request scheduler",
+        "result_store": "Shared result store",
+        "reference_genome": "Reference genome",
+        "track_store": "Track store",
+        "chromosome_length": "Chromosome length",
+        "mutagenesis": "Saturation Mutagenesis",
+        "mutagenesis_needs_reference": "Saturation mutagenesis needs a local reference genome (ALPHAGENOME_REFERENCE_FASTA).",
+        "mutagenesis_width": "Window width (bp)",
+        "context_length": "Context length",
+        "mutations": "Mutations",
+        "analyze_mutagenesis": "🧪 Score All Mutations",
+        "strongest_track": "Strongest effect (all tracks)",
+        "scan_mode": "Sliding-Window Scan (Range / BED)",
+        "scan_source": "Source",
+        "scan_range": "Chromosome range",
+        "scan_bed": "BED file",
+        "upload_bed": "Upload a BED file (.gz supported)",
+        "scan_window": "Window size",
+        "scan_stride": "Stride",
+        "analyze_scan": "Start / Resume Scan",
+        "scan_resume_help": "A scan restarted with the same parameters skips completed windows and continues where it stopped.",
+        "scan_done": "Scan finished",
+        "scan_resumed": "Windows resumed from checkpoint",
+        "download_scan": "Download Scan Track (TSV)",
+        "comparison": "Tissue × Output Comparison",
+        "job_failed": "Background job failed",
+        "job_interrupted": "Background job was interrupted (server restarted). Please run the analysis again.",
+        "sdk_not_installed": "⚠️ AlphaGenome SDK not installed. Please run `pip install git+https://github.com/google-deepmind/alphagenome.git`",
+    }
+}
+
+TISSUES = {
+    "UBERON:0002048": {"tr": "Akciğer", "en": "Lung"},
+    "UBERON:0000955": {"tr": "Beyin", "en": "Brain"},
+    "UBERON:0002107": {"tr": "Karaciğer", "en": "Liver"},
+    "UBERON:0002106": {"tr": "Dalak", "en": "Spleen"},
+    "UBERON:0002113": {"tr": "Böbrek", "en": "Kidney"},
+    "UBERON:0000948": {"tr": "Kalp", "en": "Heart"},
+    "UBERON:0001157": {"tr": "Kolon", "en": "Colon"},
+}
+
+OUTPUT_TYPES = {
+    "RNA_SEQ": {"tr": "RNA-seq (Gen Ekspresyonu)", "en": "RNA-seq (Gene Expression)"},
+    "DNASE": {"tr": "DNase-seq (DNA Erişilebilirliği)", "en": "DNase-seq (DNA Accessibility)"},
+    "ATAC": {"tr": "ATAC-seq (Kromatin Erişilebilirliği)", "en": "ATAC-seq (Chromatin Accessibility)"},
+    "CAGE": {"tr": "CAGE-seq (Transkripsiyon Başlangıcı)", "en": "CAGE-seq (Transcription Start)"},
+    "CHIP_HISTONE": {"tr": "ChIP-seq Histon Modifikasyonları", "en": "ChIP-seq Histone Modifications"},
+}
+
+
+def get_translation(key: str, lang: str = "tr") -> str:
+    """Get translation for a key."""
+    return TRANSLATIONS.get(lang, TRANSLATIONS["tr"]).get(key, key)
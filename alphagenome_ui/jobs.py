@@ -0,0 +1,186 @@
+"""
+Background execution of analyses outside the Streamlit script run.
+
+Streamlit re-executes the script on every widget interaction, which discards
+work done synchronously inside it. Analyses are therefore submitted to a
+process-wide thread pool and identified by a job ID; job status is persisted
+to disk and results are kept in a shared ``ResultStore`` (written through to
+disk) so a session can poll them and reattach after a rerun or a page reload.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from alphagenome_ui.result_cache import CACHE_ROOT
+from alphagenome_ui.result_store import ResultStore
+
+DEFAULT_JOB_DIR = CACHE_ROOT / "jobs"
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_JOB_TTL = 24 * 60 * 60.0
+
+QUEUED, RUNNING, DONE, FAILED, INTERRUPTED = "queued", "running", "done", "failed", "interrupted"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+_current = threading.local()
+
+
+def report_progress(fraction: float, message: str = "") -> None:
+    """Record progress for the job running on this thread (no-op elsewhere)."""
+    job = getattr(_current, "job", None)
+    if job is not None:
+        job.manager._update(job.job_id, progress=max(0.0, min(float(fraction), 1.0)), message=message)
+
+
+class _RunningJob:
+    def __init__(self, manager: "JobManager", job_id: str):
+        self.manager = manager
+        self.job_id = job_id
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class JobManager:
+    """Thread-pool job runner with on-disk status and owner-isolated results."""
+
+    def __init__(
+        self,
+        job_dir: str | Path = DEFAULT_JOB_DIR,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        ttl: float = DEFAULT_JOB_TTL,
+        store: ResultStore | None = None,
+    ):
+        self._dir = Path(job_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._store = store if store is not None else ResultStore(self._dir / "results")
+        self._ttl = ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="alphagenome-job")
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._last_cleanup = time.time()
+        self.cleanup()
+
+    def _status_path(self, job_id: str) -> Path:
+        return self._dir / f"{job_id}.json"
+
+    def _persist(self, job: dict) -> None:
+        _atomic_write(self._status_path(job["id"]), json.dumps(job, default=str).encode("utf-8"))
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return
+            job.update(fields)
+            snapshot = dict(job)
+        self._persist(snapshot)
+
+    def submit(self, fn: Callable[..., Any], *args: Any, kind: str = "", owner: str = "", label: str = "", **kwargs: Any) -> str:
+        """Queue ``fn(*args, **kwargs)`` and return its job ID.
+
+        ``owner`` (e.g. an API key hash) restricts who can read the job back.
+        """
+        # Long-running processes sweep expired jobs (and their stored results) periodically, not only at startup
+        if time.time() - self._last_cleanup > min(self._ttl, 60 * 60.0):
+            self._last_cleanup = time.time()
+            self.cleanup()
+        job_id = uuid.uuid4().hex
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "label": label,
+            "owner": owner,
+            "status": QUEUED,
+            "progress": 0.0,
+            "message": "",
+            "error": "",
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        self._persist(dict(job))
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        started = time.time()
+        self._update(job_id, status=RUNNING, started_at=started)
+        _current.job = _RunningJob(self, job_id)
+        try:
+            result = fn(*args, **kwargs)
+            # Written through so the result survives a restart; the run time is its recompute cost
+            self._store.put(self._jobs[job_id]["owner"], job_id, result, cost=time.time() - started, durable=True)
+            self._update(job_id, status=DONE, progress=1.0, finished_at=time.time())
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=str(e), finished_at=time.time())
+        finally:
+            _current.job = None
+
+    def status(self, job_id: str, owner: str | None = None) -> dict | None:
+        """Return the job's status dict, or None if unknown or owned by someone else."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            job = dict(job) if job is not None else None
+        if job is None:
+            try:
+                job = json.loads(self._status_path(job_id).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                return None
+            # Persisted as active but unknown to this process: it died mid-run.
+            if job.get("status") in ACTIVE_STATES:
+                job["status"] = INTERRUPTED
+        if owner is not None and job.get("owner") != owner:
+            return None
+        return job
+
+    def result(self, job_id: str, owner: str | None = None) -> Any:
+        """Return the stored result of a finished job, or None."""
+        job = self.status(job_id, owner)
+        if job is None or job["status"] != DONE:
+            return None
+        return self._store.get(job["owner"], job_id)
+
+    def list_jobs(self, owner: str) -> list[dict]:
+        """Return this process's jobs for ``owner``, newest first."""
+        with self._lock:
+            jobs = [dict(j) for j in self._jobs.values() if j["owner"] == owner]
+        return sorted(jobs, key=lambda j: j["submitted_at"], reverse=True)
+
+    def cleanup(self) -> int:
+        """Delete persisted jobs older than the TTL. Returns the number removed."""
+        cutoff = time.time() - self._ttl
+        removed = 0
+        for path in self._dir.glob("*.json"):
+            try:
+                if path.stat().st_mtime >= cutoff:
+                    continue
+                job_id = path.stem
+                owner = json.loads(path.read_text(encoding="utf-8")).get("owner", "")
+                path.unlink()
+            except (OSError, ValueError):
+                continue
+            self._store.delete(owner, job_id)
+            with self._lock:
+                self._jobs.pop(job_id, None)
+            removed += 1
+        return removed
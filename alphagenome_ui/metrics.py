@@ -0,0 +1,180 @@
+"""
+Per-stage timing for the analysis and render hot paths.
+
+``MetricsRegistry.timed(stage, kind=...)`` measures a block and records its
+duration three ways: a Prometheus histogram (rendered by ``prometheus_text``
+and periodically written to ``metrics.prom`` for a node-exporter textfile
+collector), a bounded window of recent durations for percentiles in the UI,
+and one structured JSON log line per event in ``timings.jsonl``.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from alphagenome_ui.result_cache import CACHE_ROOT
+
+DEFAULT_METRICS_DIR = CACHE_ROOT / "metrics"
+METRIC_PREFIX = "alphagenome_ui"
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+RECENT_WINDOW = 512
+DEFAULT_FLUSH_INTERVAL = 10.0
+LOG_MAX_BYTES = 10 * 1024 * 1024
+LOG_BACKUPS = 3
+
+_HANDLER_LOCK = threading.Lock()
+
+
+class _Series:
+    """Histogram and recent samples for one (stage, kind) pair."""
+
+    def __init__(self, buckets: tuple):
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.total = 0.0
+        self.errors = 0
+        self.recent = deque(maxlen=RECENT_WINDOW)
+
+    def observe(self, seconds: float, buckets: tuple, ok: bool) -> None:
+        self.count += 1
+        self.total += seconds
+        self.errors += not ok
+        self.recent.append(seconds)
+        for i, bound in enumerate(buckets):
+            if seconds <= bound:
+                self.bucket_counts[i] += 1
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """Thread-safe collector of stage timings with JSON log and Prometheus export."""
+
+    def __init__(
+        self,
+        metrics_dir: Path = DEFAULT_METRICS_DIR,
+        buckets: tuple = DEFAULT_BUCKETS,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+    ):
+        self.metrics_dir = Path(metrics_dir)
+        self.metrics_dir.mkdir(parents=True, exist_ok=True)
+        self.prometheus_path = self.metrics_dir / "metrics.prom"
+        self.log_path = self.metrics_dir / "timings.jsonl"
+        self._buckets = tuple(sorted(buckets))
+        self._flush_interval = flush_interval
+        self._series: dict[tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+        self._last_flush = float("-inf")
+
+        # One logger per log file, so registries sharing a file share its single rotating handler
+        self._logger = logging.getLogger(f"{__name__}.{self.log_path.resolve()}")
+        self._logger.setLevel(logging.INFO)
+        self._logger.propagate = False
+        with _HANDLER_LOCK:
+            if not self._logger.handlers:
+                handler = logging.handlers.RotatingFileHandler(
+                    self.log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS, encoding="utf-8",
+                )
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                self._logger.addHandler(handler)
+
+    @contextmanager
+    def timed(self, stage: str, kind: str = "", **fields):
+        """Time the enclosed block as ``stage``; exceptions are recorded and re-raised."""
+        started = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started, kind=kind, ok=ok, **fields)
+
+    def observe(self, stage: str, seconds: float, kind: str = "", ok: bool = True, **fields) -> None:
+        """Record one stage duration."""
+        with self._lock:
+            series = self._series.get((stage, kind))
+            if series is None:
+                series = self._series[(stage, kind)] = _Series(self._buckets)
+            series.observe(seconds, self._buckets, ok)
+            flush = time.monotonic() - self._last_flush >= self._flush_interval
+            if flush:
+                self._last_flush = time.monotonic()
+
+        event = {
+            "ts": time.time(),
+            "stage": stage,
+            "kind": kind,
+            "duration_ms": round(seconds * 1000.0, 3),
+            "ok": ok,
+            "thread": threading.current_thread().name,
+            **fields,
+        }
+        self._logger.info(json.dumps(event, default=str))
+        if flush:
+            self.write_prometheus()
+
+    def summary(self) -> list[dict]:
+        """Return per-(stage, kind) counts and latency percentiles over recent events."""
+        with self._lock:
+            snapshot = [(key, s.count, s.total, s.errors, np.asarray(s.recent)) for key, s in self._series.items()]
+        rows = []
+        for (stage, kind), count, total, errors, recent in sorted(snapshot):
+            p50, p95, p99 = np.percentile(recent, (50, 95, 99)) * 1000.0
+            rows.append({
+                "stage": stage,
+                "kind": kind,
+                "count": count,
+                "errors": errors,
+                "mean_ms": round(total / count * 1000.0, 2),
+                "p50_ms": round(float(p50), 2),
+                "p95_ms": round(float(p95), 2),
+                "p99_ms": round(float(p99), 2),
+            })
+        return rows
+
+    def prometheus_text(self) -> str:
+        """Render all series in the Prometheus text exposition format."""
+        name = f"{METRIC_PREFIX}_stage_duration_seconds"
+        errors_name = f"{METRIC_PREFIX}_stage_errors_total"
+        lines = [
+            f"# HELP {name} Duration of analysis and render stages.",
+            f"# TYPE {name} histogram",
+        ]
+        error_lines = [
+            f"# HELP {errors_name} Stage executions that raised an exception.",
+            f"# TYPE {errors_name} counter",
+        ]
+        with self._lock:
+            for (stage, kind), series in sorted(self._series.items()):
+                labels = f'stage="{_escape(stage)}",kind="{_escape(kind)}"'
+                for bound, count in zip(self._buckets, series.bucket_counts):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {series.count}')
+                lines.append(f"{name}_sum{{{labels}}} {series.total:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {series.count}")
+                error_lines.append(f"{errors_name}{{{labels}}} {series.errors}")
+        return "\n".join(lines + error_lines) + "\n"
+
+    def write_prometheus(self) -> Path:
+        """Atomically write ``metrics.prom`` for a textfile collector."""
+        tmp = self.prometheus_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(self.prometheus_text(), encoding="utf-8")
+        os.replace(tmp, self.prometheus_path)
+        return self.prometheus_path
+
+    def reset(self) -> None:
+        """Forget all recorded series."""
+        with self._lock:
+            self._series.clear()
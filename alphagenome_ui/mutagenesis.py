@@ -0,0 +1,118 @@
+"""
+In-silico saturation mutagenesis.
+
+Every position of a small window is mutated to each of the three other
+bases. All mutants share one context sequence, so its reference prediction
+is made once and every alternate differs from it by a single base. Each
+mutant is scored per track around the mutated base (see ``scoring``) and
+the scores are reduced into one ``(positions, 4, tracks)`` matrix per score
+metric, with the allele axis in ``ALLELES`` order and zeros at the
+reference allele.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from alphagenome_ui.scoring import SCORE_METRICS
+
+ALLELES = "ACGT"
+MAX_MUTAGENESIS_WIDTH = 1000
+DEFAULT_MUTAGENESIS_WIDTH = 200
+DEFAULT_MUTAGENESIS_CONTEXT = 131072
+
+
+@dataclass(frozen=True)
+class Mutation:
+    """A single-base substitution at ``offset`` bases into the mutagenesis window."""
+
+    offset: int
+    position: int
+    ref: str
+    alt: str
+
+    @property
+    def allele(self) -> int:
+        """Column of ``alt`` on the allele axis."""
+        return ALLELES.index(self.alt)
+
+
+def mutagenesis_context(start: int, end: int, length: int) -> tuple[int, int]:
+    """Context window of ``length`` bases centred on ``[start, end)`` (0-based), kept at or after 0."""
+    if end - start > length:
+        raise ValueError(f"Mutagenesis window of {end - start:,} bp does not fit a {length:,} bp context")
+    context_start = max(0, (start + end) // 2 - length // 2)
+    return context_start, context_start + length
+
+
+def plan_mutations(sequence: str, context_start: int, start: int, end: int) -> list[Mutation]:
+    """All three alternates at every position of ``[start, end)``; ``sequence`` covers the context.
+
+    Positions whose reference base is not A/C/G/T (e.g. N) are skipped.
+    """
+    mutations = []
+    for offset, position in enumerate(range(start, end)):
+        ref = sequence[position - context_start].upper()
+        if ref not in ALLELES:
+            continue
+        mutations.extend(Mutation(offset, position + 1, ref, alt) for alt in ALLELES if alt != ref)
+    return mutations
+
+
+def mutate(sequence: str, context_start: int, mutation: Mutation) -> str:
+    """``sequence`` with ``mutation`` applied."""
+    index = mutation.position - 1 - context_start
+    return sequence[:index] + mutation.alt + sequence[index + 1:]
+
+
+class EffectMatrix:
+    """Per-block ``(positions, alleles, tracks)`` score matrices filled as mutants complete."""
+
+    def __init__(self, width: int, tracks: dict[str, int]):
+        self.width = width
+        self.values = {
+            key: {metric: np.zeros((width, len(ALLELES), n), dtype=np.float32) for metric in SCORE_METRICS}
+            for key, n in tracks.items()
+        }
+        self.scored = np.zeros((width, len(ALLELES)), dtype=bool)
+
+    def add(self, mutation: Mutation, scores: dict[str, dict[str, np.ndarray]]) -> None:
+        """Store one mutant's ``{block key: {metric: (tracks,)}}`` scores."""
+        for key, metrics in scores.items():
+            for metric, values in metrics.items():
+                self.values[key][metric][mutation.offset, mutation.allele] = values
+        self.scored[mutation.offset, mutation.allele] = True
+
+
+def reduce_tracks(matrix: np.ndarray, columns: list[int] | None = None) -> np.ndarray:
+    """Collapse ``(positions, alleles, tracks)`` to ``(positions, alleles)``.
+
+    Keeps, per cell, the signed value with the largest magnitude over the
+    selected track ``columns`` (all tracks when None).
+    """
+    if columns is not None:
+        matrix = matrix[:, :, columns]
+    if matrix.shape[-1] == 0:
+        return np.zeros(matrix.shape[:2], dtype=np.float32)
+    strongest = np.abs(matrix).argmax(axis=-1)
+    return np.take_along_axis(matrix, strongest[..., None], axis=-1)[..., 0]
+
+
+def strongest_effects(matrix: np.ndarray, names: list[str], window_start: int, k: int = 5) -> list[dict]:
+    """The ``k`` largest-magnitude (position, allele, track) cells of one score matrix."""
+    flat = np.abs(matrix).ravel()
+    k = min(k, flat.size)
+    if k == 0:
+        return []
+    top = np.argpartition(-flat, k - 1)[:k]
+    top = top[np.argsort(-flat[top], kind="stable")]
+    effects = []
+    for index in top:
+        offset, allele, track = np.unravel_index(index, matrix.shape)
+        effects.append({
+            "position": window_start + int(offset) + 1,
+            "alt": ALLELES[allele],
+            "track": names[track] if track < len(names) else str(track),
+            "value": float(matrix[offset, allele, track]),
+        })
+    return effects
@@ -0,0 +1,181 @@
+"""
+2-bit packed DNA sequences.
+
+``PackedSequence`` stores A/C/G/T in two bits per base (four bases per
+byte) and every other byte - N runs, soft-masked or IUPAC bases, invalid
+characters - in a sparse side table of ``(start, length, byte)`` runs. A
+megabase of sequence therefore takes about 256 KB plus a few bytes per N
+run instead of 1 MB as ``bytes`` or ``str``, which is what session state,
+job arguments and cache keys hold. Packing, unpacking, slicing and reverse
+complement are vectorized through 256-entry lookup tables; the original
+bytes round-trip exactly.
+"""
+
+import hashlib
+from functools import cached_property
+
+import numpy as np
+
+BASES = b"ACGT"
+_OTHER = 4
+
+_CODE_TABLE = np.full(256, _OTHER, dtype=np.uint8)
+_CODE_TABLE[list(BASES)] = np.arange(4, dtype=np.uint8)
+
+# Packed byte -> its four 2-bit codes, and -> its four ASCII bases (first base in the high bits)
+_SHIFTS = np.array([6, 4, 2, 0], dtype=np.uint8)
+_UNPACK_CODES = (np.arange(256, dtype=np.uint8)[:, None] >> _SHIFTS) & 3
+_UNPACK_BASES = np.frombuffer(BASES, dtype=np.uint8)[_UNPACK_CODES]
+
+_COMPLEMENT_TABLE = np.arange(256, dtype=np.uint8)
+for _base, _complement in zip(b"ACGTRYKMBVDHacgtrykmbvdh", b"TGCAYRMKVBHDtgcayrmkvbhd"):
+    _COMPLEMENT_TABLE[_base] = _complement
+
+
+def _pack_codes(codes: np.ndarray) -> np.ndarray:
+    """Pack 2-bit ``codes`` four to a byte, zero-padding the last byte."""
+    padded = np.zeros(-(-codes.size // 4) * 4, dtype=np.uint8)
+    padded[:codes.size] = codes
+    quads = padded.reshape(-1, 4)
+    return (quads[:, 0] << 6) | (quads[:, 1] << 4) | (quads[:, 2] << 2) | quads[:, 3]
+
+
+def _run_positions(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Every position covered by the runs, in run order."""
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(int(lengths.sum()), dtype=np.int64) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+
+
+class PackedSequence:
+    """Immutable 2-bit packed sequence with a sparse table of non-ACGT runs.
+
+    Build one with :meth:`pack`. Indexing with an int returns a one-letter
+    ``str``; slicing (step 1) returns another ``PackedSequence``.
+    """
+
+    def __init__(self, length: int, packed: np.ndarray, run_starts: np.ndarray, run_lengths: np.ndarray, run_bytes: np.ndarray):
+        self.length = int(length)
+        self.packed = packed
+        self.run_starts = run_starts
+        self.run_lengths = run_lengths
+        self.run_bytes = run_bytes
+
+    @classmethod
+    def pack(cls, data: "str | bytes | np.ndarray | PackedSequence") -> "PackedSequence":
+        """Pack ``data`` as-is; normalize it first (see ``ingest_sequence``) if case or whitespace matter."""
+        if isinstance(data, PackedSequence):
+            return data
+        if isinstance(data, str):
+            data = data.encode("latin-1", errors="replace")
+        raw = np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray) else data.astype(np.uint8, copy=False)
+        codes = _CODE_TABLE[raw]
+        other = np.flatnonzero(codes == _OTHER)
+        if other.size:
+            # A new run starts wherever the position or the byte is not a continuation of the previous one
+            values = raw[other]
+            breaks = np.flatnonzero((np.diff(other) != 1) | (np.diff(values) != 0)) + 1
+            firsts = np.concatenate(([0], breaks))
+            run_starts = other[firsts]
+            run_lengths = np.diff(np.append(firsts, other.size))
+            run_bytes = values[firsts]
+            codes[other] = 0
+        else:
+            run_starts = run_lengths = np.zeros(0, dtype=np.int64)
+            run_bytes = np.zeros(0, dtype=np.uint8)
+        return cls(raw.size, _pack_codes(codes), run_starts.astype(np.int64), run_lengths.astype(np.int64), run_bytes)
+
+    @classmethod
+    def _from_codes(cls, codes: np.ndarray, run_starts: np.ndarray, run_lengths: np.ndarray, run_bytes: np.ndarray) -> "PackedSequence":
+        """Pack ``codes`` with the given runs, zeroing the codes under them so equal sequences pack identically."""
+        if run_starts.size:
+            codes = codes.copy()
+            codes[_run_positions(run_starts, run_lengths)] = 0
+        return cls(codes.size, _pack_codes(codes), run_starts, run_lengths, run_bytes)
+
+    def _codes(self, start: int = 0, end: int | None = None) -> np.ndarray:
+        """2-bit codes of ``[start, end)``, unpacking only the bytes that hold them."""
+        end = self.length if end is None else end
+        first = start // 4
+        codes = _UNPACK_CODES[self.packed[first:-(-end // 4)]].ravel()
+        return codes[start - first * 4:end - first * 4]
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.length)
+            if step != 1:
+                raise ValueError("PackedSequence slices must have step 1")
+            stop = max(start, stop)
+            run_ends = self.run_starts + self.run_lengths
+            keep = (run_ends > start) & (self.run_starts < stop) & (start < stop)
+            run_starts = np.maximum(self.run_starts[keep], start)
+            run_lengths = np.minimum(run_ends[keep], stop) - run_starts
+            return PackedSequence._from_codes(self._codes(start, stop), run_starts - start, run_lengths, self.run_bytes[keep])
+        position = index + self.length if index < 0 else index
+        if not 0 <= position < self.length:
+            raise IndexError("PackedSequence index out of range")
+        run = np.searchsorted(self.run_starts, position, side="right") - 1
+        if run >= 0 and position < self.run_starts[run] + self.run_lengths[run]:
+            return chr(self.run_bytes[run])
+        return chr(BASES[self._codes(position, position + 1)[0]])
+
+    def reverse_complement(self) -> "PackedSequence":
+        """Reverse complement; non-ACGT runs keep their IUPAC complement (N stays N)."""
+        codes = 3 - self._codes()[::-1]
+        run_starts = self.length - (self.run_starts + self.run_lengths)
+        return PackedSequence._from_codes(codes, run_starts[::-1].copy(), self.run_lengths[::-1].copy(), _COMPLEMENT_TABLE[self.run_bytes[::-1]])
+
+    def to_array(self) -> np.ndarray:
+        """The sequence as a ``uint8`` array of ASCII bytes."""
+        out = _UNPACK_BASES[self.packed].ravel()[:self.length].copy()
+        if self.run_starts.size:
+            out[_run_positions(self.run_starts, self.run_lengths)] = np.repeat(self.run_bytes, self.run_lengths)
+        return out
+
+    def tobytes(self) -> bytes:
+        return self.to_array().tobytes()
+
+    def text(self) -> str:
+        """The sequence as a str, e.g. for the model client."""
+        return self.tobytes().decode("latin-1")
+
+    def __str__(self) -> str:
+        return self.text()
+
+    def __repr__(self) -> str:
+        return f"PackedSequence(length={self.length:,}, runs={self.run_starts.size:,}, nbytes={self.nbytes:,})"
+
+    def count(self, base: str) -> int:
+        """Occurrences of the single character ``base``."""
+        byte = ord(base)
+        if byte in BASES:
+            count = int(np.count_nonzero(self._codes() == BASES.index(byte)))
+            # Positions under runs are packed as A (code 0)
+            return count - int(self.run_lengths.sum()) if byte == BASES[0] else count
+        return int(self.run_lengths[self.run_bytes == byte].sum())
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the packed bases and the run table."""
+        return self.packed.nbytes + self.run_starts.nbytes + self.run_lengths.nbytes + self.run_bytes.nbytes
+
+    @cached_property
+    def digest(self) -> str:
+        """SHA-256 of the packed form; equal sequences always have equal digests."""
+        h = hashlib.sha256()
+        h.update(np.int64(self.length).tobytes())
+        h.update(self.packed.tobytes())
+        h.update(self.run_starts.astype("<i8").tobytes())
+        h.update(self.run_lengths.astype("<i8").tobytes())
+        h.update(self.run_bytes.tobytes())
+        return h.hexdigest()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PackedSequence):
+            return NotImplemented
+        return self.length == other.length and self.digest == other.digest
+
+    def __hash__(self) -> int:
+        return hash(self.digest)
@@ -0,0 +1,192 @@
+"""
+Decimated track plotting.
+
+Prediction tracks hold up to ~1M positions each, far more than a figure has
+pixels. Before drawing, the visible slice of a ``(positions, tracks)`` array
+is reduced to about one bin per horizontal pixel, either as a min/max
+envelope (exact extremes, so no peak is lost) or with LTTB
+(largest-triangle-three-buckets, a single representative line). Only the
+visible slice is read, so zooming into a memory-mapped track touches only
+that part of the file. Saturation mutagenesis effects are drawn as a
+positions × alleles heatmap. matplotlib is imported on first plot.
+"""
+
+import io
+from dataclasses import dataclass
+
+import numpy as np
+
+DEFAULT_WIDTH_PX = 1000
+MAX_PLOT_TRACKS = 8
+DECIMATION_METHODS = ("minmax", "lttb")
+SERIES_COLORS = ("#818cf8", "#34d399", "#f472b6", "#fbbf24")
+
+
+@dataclass
+class Decimated:
+    """Reduced view of a track slice.
+
+    ``x`` holds offsets into the slice, shaped like ``lo``/``hi``
+    ``(points, tracks)``. For LTTB and undecimated data ``lo`` is ``hi``.
+    """
+
+    x: np.ndarray
+    lo: np.ndarray
+    hi: np.ndarray
+
+    @property
+    def is_envelope(self) -> bool:
+        return self.lo is not self.hi
+
+
+def view_slice(length: int, resolution: int, origin: int, view: tuple[int, int] | None) -> slice:
+    """Map a genomic ``(start, end)`` view to a row slice of a track array."""
+    if view is None:
+        return slice(0, length)
+    start = max(0, (int(view[0]) - origin) // resolution)
+    stop = min(length, -(-(int(view[1]) - origin) // resolution))
+    return slice(start, max(start + 1, stop))
+
+
+def decimate_minmax(values: np.ndarray, n_bins: int) -> Decimated:
+    """Per-bin minimum and maximum of every track."""
+    values = np.asarray(values)
+    n = values.shape[0]
+    if n <= 2 * n_bins:
+        x = np.broadcast_to(np.arange(n)[:, None], values.shape)
+        return Decimated(x, values, values)
+    bin_size = -(-n // n_bins)
+    full = n - n % bin_size
+    blocks = values[:full].reshape(-1, bin_size, values.shape[1])
+    lo, hi = blocks.min(axis=1), blocks.max(axis=1)
+    if full < n:
+        lo = np.vstack([lo, values[full:].min(axis=0)])
+        hi = np.vstack([hi, values[full:].max(axis=0)])
+    x = np.broadcast_to(np.arange(0, n, bin_size)[:, None], lo.shape)
+    return Decimated(x, lo, hi)
+
+
+def decimate_lttb(values: np.ndarray, n_out: int) -> Decimated:
+    """Largest-triangle-three-buckets downsampling, vectorized across tracks.
+
+    The bucket loop is inherently sequential (each pick depends on the
+    previous one), but every step works on all tracks at once.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n, tracks = values.shape
+    if n <= n_out or n_out < 3:
+        x = np.broadcast_to(np.arange(n)[:, None], values.shape)
+        return Decimated(x, values, values)
+
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(np.int64) + 1
+    edges[-1] = n - 1
+    columns = np.arange(tracks)
+    picked = np.empty((n_out, tracks), dtype=np.int64)
+    picked[0] = 0
+    picked[-1] = n - 1
+    a_x = np.zeros(tracks)
+    a_y = values[0].copy()
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = (hi + next_hi - 1) / 2.0
+        avg_y = values[hi:next_hi].mean(axis=0)
+        candidates = np.arange(lo, hi)[:, None]
+        area = np.abs((a_x - avg_x) * (values[lo:hi] - a_y) - (a_x - candidates) * (avg_y - a_y))
+        best = lo + area.argmax(axis=0)
+        picked[i + 1] = best
+        a_x = best.astype(np.float64)
+        a_y = values[best, columns]
+    y = values[picked, columns]
+    return Decimated(picked, y, y)
+
+
+def decimate(values: np.ndarray, n_points: int, method: str = "minmax") -> Decimated:
+    """Reduce a ``(positions, tracks)`` slice to about ``n_points`` per track."""
+    if method == "lttb":
+        return decimate_lttb(values, n_points)
+    return decimate_minmax(values, n_points)
+
+
+def render_tracks_png(
+    series: list[tuple[str, np.ndarray]],
+    names: list[str],
+    columns: list[int],
+    resolution: int,
+    origin: int,
+    view: tuple[int, int] | None = None,
+    method: str = "minmax",
+    width_px: int = DEFAULT_WIDTH_PX,
+) -> bytes:
+    """Draw the selected ``columns`` of each ``(label, values)`` series as a PNG.
+
+    Series share one axis per track (e.g. reference and alternate alleles).
+    """
+    from matplotlib.figure import Figure
+
+    columns = list(columns)[:MAX_PLOT_TRACKS]
+    length = series[0][1].shape[0]
+    rows = view_slice(length, resolution, origin, view)
+    reduced = [(label, decimate(np.asarray(values[rows])[:, columns], width_px, method)) for label, values in series]
+
+    dpi = 100
+    fig = Figure(figsize=(width_px / dpi, 1.1 * len(columns) + 0.6), dpi=dpi)
+    axes = fig.subplots(len(columns), 1, sharex=True, squeeze=False)[:, 0]
+    for row, (ax, column) in enumerate(zip(axes, columns)):
+        for color, (label, d) in zip(SERIES_COLORS, reduced):
+            x = origin + (rows.start + d.x[:, row]) * resolution
+            if d.is_envelope:
+                ax.fill_between(x, d.lo[:, row], d.hi[:, row], color=color, alpha=0.6, linewidth=0, step="post", label=label or None)
+            else:
+                ax.plot(x, d.lo[:, row], color=color, linewidth=0.8, label=label or None)
+        name = names[column] if column < len(names) else str(column)
+        ax.set_ylabel(name if len(name) <= 24 else name[:23] + "…", rotation=0, ha="right", va="center", fontsize=7)
+        ax.tick_params(labelsize=7)
+        ax.spines[["top", "right"]].set_visible(False)
+    if len(series) > 1:
+        axes[0].legend(loc="upper right", fontsize=7, frameon=False, ncols=len(series))
+    axes[-1].ticklabel_format(axis="x", style="plain", useOffset=False)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def render_heatmap_png(
+    matrix: np.ndarray,
+    bases: str,
+    origin: int,
+    alleles: str = "ACGT",
+    label: str = "",
+    width_px: int = DEFAULT_WIDTH_PX,
+) -> bytes:
+    """Draw a ``(positions, alleles)`` effect matrix as a PNG heatmap.
+
+    Colors are centred on zero; the reference allele of each position is
+    marked with a dot. ``origin`` is the 0-based start of the first row.
+    """
+    from matplotlib.figure import Figure
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    limit = float(np.abs(matrix).max()) or 1.0
+    dpi = 100
+    fig = Figure(figsize=(width_px / dpi, 2.4), dpi=dpi)
+    ax = fig.subplots()
+    extent = (origin + 0.5, origin + matrix.shape[0] + 0.5, len(alleles) - 0.5, -0.5)
+    image = ax.imshow(matrix.T, aspect="auto", cmap="RdBu_r", vmin=-limit, vmax=limit, interpolation="nearest", extent=extent)
+    ref_rows = [alleles.find(base) for base in bases[:matrix.shape[0]]]
+    positions = [origin + 1 + i for i, row in enumerate(ref_rows) if row >= 0]
+    ax.scatter(positions, [row for row in ref_rows if row >= 0], s=4, color="#1e293b", marker="o", linewidths=0)
+    ax.set_yticks(range(len(alleles)), list(alleles))
+    ax.tick_params(labelsize=7)
+    ax.ticklabel_format(axis="x", style="plain", useOffset=False)
+    colorbar = fig.colorbar(image, ax=ax, pad=0.01, fraction=0.03)
+    colorbar.ax.tick_params(labelsize=7)
+    if label:
+        colorbar.set_label(label, fontsize=7)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png")
+    return buffer.getvalue()
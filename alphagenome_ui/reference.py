@@ -0,0 +1,263 @@
+"""
+Memory-mapped, faidx-indexed reference genome.
+
+The FASTA file is mapped read-only and located with a samtools-compatible
+``.fai`` index (built once when missing), so any slice of any chromosome is
+fetched by seeking straight to its byte offset without loading the genome
+into RAM. It is used to pre-check requests before they reach the model:
+REF alleles are verified against the genome, intervals are clamped to
+chromosome lengths and the N content of each window is reported. Checking
+large variant panels is vectorized per chromosome with NumPy.
+"""
+
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+
+from alphagenome_ui.result_cache import CACHE_ROOT
+
+DEFAULT_INDEX_DIR = CACHE_ROOT / "fai"
+
+_UPPERCASE_TABLE = bytes.maketrans(b"acgtn", b"ACGTN")
+_NEWLINES = b"\r\n"
+
+
+@dataclass(frozen=True)
+class FaidxEntry:
+    """One ``.fai`` line: sequence length, byte offset of its first base and line layout."""
+
+    name: str
+    length: int
+    offset: int
+    line_bases: int
+    line_width: int
+
+    def byte_offset(self, position):
+        """File offset of 0-based ``position`` (an int or an integer array)."""
+        return self.offset + position // self.line_bases * self.line_width + position % self.line_bases
+
+
+def scan_fai(fasta_path: str | Path) -> list[FaidxEntry]:
+    """Scan an uncompressed FASTA file for its ``.fai`` index entries."""
+    entries = []
+    name = None
+    length = offset = line_bases = line_width = 0
+    short_line_seen = False
+    position = 0
+    with open(fasta_path, "rb") as f:
+        for line in f:
+            if line.startswith(b">"):
+                if name is not None:
+                    entries.append(FaidxEntry(name, length, offset, line_bases, line_width))
+                name = line[1:].split(None, 1)[0].decode("utf-8", errors="replace")
+                length = line_bases = line_width = 0
+                offset = position + len(line)
+                short_line_seen = False
+            elif name is not None:
+                bases = len(line.rstrip(_NEWLINES))
+                if bases:
+                    # Every line but the last of a record must have the same layout
+                    if short_line_seen or (line_bases and (bases > line_bases or len(line) - bases != line_width - line_bases)):
+                        raise ValueError(f"{fasta_path}: '{name}' has lines of differing length and cannot be indexed")
+                    if not line_bases:
+                        line_bases, line_width = bases, len(line)
+                    elif bases < line_bases:
+                        short_line_seen = True
+                    length += bases
+            position += len(line)
+    if name is not None:
+        entries.append(FaidxEntry(name, length, offset, line_bases, line_width))
+    return entries
+
+
+def build_fai(fasta_path: str | Path, index_path: str | Path) -> None:
+    """Scan an uncompressed FASTA file and write its ``.fai`` index."""
+    entries = scan_fai(fasta_path)
+    tmp = Path(f"{index_path}.{os.getpid()}.tmp")
+    try:
+        tmp.write_text(
+            "".join(f"{e.name}\t{e.length}\t{e.offset}\t{e.line_bases}\t{e.line_width}\n" for e in entries), encoding="utf-8"
+        )
+        os.replace(tmp, index_path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _alias(name: str) -> str:
+    """``chr1`` for ``1`` and vice versa, so either naming style resolves."""
+    return name[3:] if name.lower().startswith("chr") else f"chr{name}"
+
+
+class ReferenceGenome:
+    """Read-only, memory-mapped FASTA with O(1) random access per slice.
+
+    The ``.fai`` index is read from ``<fasta>.fai``; when absent it is built
+    next to the FASTA file, or under ``index_dir`` if that is not writable,
+    or only in memory (``index_path`` is None) if neither is.
+    Gzip-compressed FASTA cannot be memory-mapped and is rejected.
+    """
+
+    def __init__(self, path: str | Path, index_dir: str | Path = DEFAULT_INDEX_DIR):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(2) == b"\x1f\x8b":
+                raise ValueError(f"{self.path}: compressed FASTA cannot be memory-mapped; decompress it first")
+        self.index_path = self._find_index(Path(index_dir))
+        self.entries: dict[str, FaidxEntry] = {}
+        if self.index_path is None:
+            self.entries = {entry.name: entry for entry in scan_fai(self.path)}
+        else:
+            for line in self.index_path.read_text(encoding="utf-8").splitlines():
+                fields = line.split("\t")
+                if len(fields) >= 5:
+                    entry = FaidxEntry(fields[0], *(int(v) for v in fields[1:5]))
+                    self.entries[entry.name] = entry
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._bytes = np.frombuffer(self._map, dtype=np.uint8)
+
+    @classmethod
+    def from_env(cls) -> "ReferenceGenome | None":
+        """The genome named by ``ALPHAGENOME_REFERENCE_FASTA``, or None when unset."""
+        path = os.environ.get("ALPHAGENOME_REFERENCE_FASTA")
+        return cls(path) if path else None
+
+    def _find_index(self, index_dir: Path) -> Path | None:
+        """Path of a current ``.fai`` index, building one if needed; None if none can be written."""
+        beside = Path(f"{self.path}.fai")
+        if beside.exists() and beside.stat().st_mtime >= self.path.stat().st_mtime:
+            return beside
+        try:
+            build_fai(self.path, beside)
+            return beside
+        except OSError:
+            pass
+        stat = self.path.stat()
+        cached = index_dir / f"{self.path.name}.{stat.st_size}.{int(stat.st_mtime)}.fai"
+        try:
+            index_dir.mkdir(parents=True, exist_ok=True)
+            if not cached.exists():
+                build_fai(self.path, cached)
+            return cached
+        except OSError:
+            return None
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def lengths(self) -> dict[str, int]:
+        return {name: entry.length for name, entry in self.entries.items()}
+
+    def entry(self, chromosome: str) -> FaidxEntry:
+        """Index entry for ``chromosome``, accepting names with or without ``chr``."""
+        entry = self.entries.get(chromosome) or self.entries.get(_alias(chromosome))
+        if entry is None:
+            raise KeyError(f"{chromosome} is not in the reference genome {self.name}")
+        return entry
+
+    def __contains__(self, chromosome: str) -> bool:
+        return chromosome in self.entries or _alias(chromosome) in self.entries
+
+    def length(self, chromosome: str) -> int:
+        return self.entry(chromosome).length
+
+    def fetch(self, chromosome: str, start: int, end: int) -> bytes:
+        """Upper-case bases of ``[start, end)`` (0-based), clipped to the chromosome."""
+        entry = self.entry(chromosome)
+        start, end = max(0, start), min(end, entry.length)
+        if start >= end:
+            return b""
+        data = self._map[entry.byte_offset(start):entry.byte_offset(end - 1) + 1]
+        return data.translate(_UPPERCASE_TABLE, delete=_NEWLINES)
+
+    def window_sequence(self, chromosome: str, start: int, end: int) -> str:
+        """Bases of ``[start, end)`` padded with ``N`` where the window runs past the chromosome."""
+        sequence = self.fetch(chromosome, start, end).decode("ascii")
+        left = max(0, min(end, 0) - start)
+        return ("N" * left + sequence).ljust(end - start, "N")
+
+    def clamp(self, chromosome: str, start: int, end: int) -> tuple[int, int]:
+        """``[start, end)`` clipped to the chromosome; raises if nothing is left."""
+        length = self.length(chromosome)
+        clamped = max(0, start), min(end, length)
+        if clamped[0] >= clamped[1]:
+            raise ValueError(f"{chromosome}:{start}-{end} lies outside {chromosome} (length {length:,})")
+        return clamped
+
+    def n_fraction(self, chromosome: str, start: int, end: int) -> float:
+        """Fraction of ``[start, end)`` that is N or lies past the chromosome end."""
+        if end <= start:
+            return 0.0
+        sequence = self.fetch(chromosome, start, end)
+        return 1.0 - (len(sequence) - sequence.count(b"N")) / (end - start)
+
+    def check_ref(self, chromosome: str, position: int, ref: str) -> str | None:
+        """Error message if ``ref`` does not match the genome at 1-based ``position``, else None."""
+        try:
+            entry = self.entry(chromosome)
+        except KeyError as e:
+            return str(e.args[0])
+        if position < 1 or position - 1 + len(ref) > entry.length:
+            return f"{chromosome}:{position} lies outside {chromosome} (length {entry.length:,})"
+        observed = self.fetch(chromosome, position - 1, position - 1 + len(ref)).decode("ascii")
+        if observed != ref.upper():
+            return f"Reference mismatch at {chromosome}:{position}: expected {ref}, genome has {observed}"
+        return None
+
+    def check_refs(self, variants: Iterable[tuple[str, int, str]]) -> list[str | None]:
+        """``check_ref`` for many ``(chromosome, position, ref)`` at once.
+
+        Bases are gathered straight from the mapped file with one NumPy
+        fancy-index per chromosome and REF base, so large panels are checked
+        without a Python-level fetch per variant.
+        """
+        variants = list(variants)
+        results: list[str | None] = [None] * len(variants)
+        by_chromosome: dict[str, list[int]] = {}
+        for i, (chromosome, _, _) in enumerate(variants):
+            by_chromosome.setdefault(chromosome, []).append(i)
+
+        for chromosome, indices in by_chromosome.items():
+            if chromosome not in self:
+                for i in indices:
+                    results[i] = f"{chromosome} is not in the reference genome {self.name}"
+                continue
+            entry = self.entry(chromosome)
+            indices = np.asarray(indices)
+            positions = np.fromiter((variants[i][1] - 1 for i in indices), dtype=np.int64, count=len(indices))
+            refs = [variants[i][2].upper() for i in indices]
+            ref_lengths = np.fromiter((len(r) for r in refs), dtype=np.int64, count=len(refs))
+            inside = (positions >= 0) & (positions + ref_lengths <= entry.length)
+            matches = inside.copy()
+            for k in range(int(ref_lengths.max(initial=0))):
+                rows = np.flatnonzero(matches & (ref_lengths > k))
+                if not rows.size:
+                    break
+                observed = self._bytes[entry.byte_offset(positions[rows] + k)] & 0xDF  # upper-case
+                expected = np.frombuffer("".join(refs[r][k] for r in rows).encode("ascii"), dtype=np.uint8)
+                matches[rows] &= observed == expected
+            for row in np.flatnonzero(~matches):
+                i = int(indices[row])
+                results[i] = self.check_ref(chromosome, variants[i][1], variants[i][2])
+        return results
+
+    def stats(self) -> dict:
+        """Summary for diagnostics."""
+        return {
+            "path": str(self.path),
+            "index": str(self.index_path),
+            "chromosomes": len(self.entries),
+            "total_bases": sum(entry.length for entry in self.entries.values()),
+            "file_bytes": len(self._map),
+        }
+
+    def close(self) -> None:
+        self._bytes = None
+        self._map.close()
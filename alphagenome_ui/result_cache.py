@@ -0,0 +1,295 @@
+"""
+Content-addressed cache for prediction results.
+
+Results are keyed by a SHA-256 digest of the canonicalized analysis inputs and
+stored in two tiers: a small in-memory LRU for the hot set, bounded by entry
+count and by the resident bytes of its arrays, and an on-disk store bounded
+by a byte budget. Every cached key keeps its own hit/miss counters so
+that repeated loci can be identified; a key's counters are dropped with its
+entry, and at most ``MAX_KEY_STATS`` keys are tracked. The disk tier's file
+sizes and LRU order are kept in memory, so a write does not rescan it.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from alphagenome_ui.packed_sequence import PackedSequence
+
+DEFAULT_MEMORY_ENTRIES = 64
+DEFAULT_MEMORY_BUDGET_BYTES = 512 * 1024 * 1024
+DEFAULT_DISK_BUDGET_BYTES = 512 * 1024 * 1024
+MAX_KEY_STATS = 4096
+CACHE_ROOT = Path(os.environ.get("ALPHAGENOME_CACHE_DIR", Path.home() / ".cache" / "alphagenome_ui"))
+DEFAULT_CACHE_DIR = CACHE_ROOT / "results"
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    """Whether ``array``'s data lives in a memory-mapped file.
+
+    A ``np.memmap`` that went through pickle (e.g. the disk tier) comes back
+    as an in-RAM copy with no ``_mmap``, so the subclass alone is not enough.
+    """
+    while isinstance(array, np.ndarray):
+        if isinstance(array, np.memmap) and getattr(array, "_mmap", None) is not None:
+            return True
+        array = array.base
+    return array is not None and type(array).__name__ == "mmap"
+
+
+def payload_nbytes(value: Any) -> tuple[int, int]:
+    """Return ``(resident, mapped)`` array bytes held by a nested result payload."""
+    resident = mapped = 0
+    stack = [value]
+    seen = set()
+    while stack:
+        item = stack.pop()
+        if isinstance(item, np.ndarray):
+            if id(item) in seen:
+                continue
+            seen.add(id(item))
+            if _is_mapped(item):
+                mapped += item.nbytes
+            else:
+                resident += item.nbytes
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+    return resident, mapped
+
+
+def _normalize(value: Any) -> Any:
+    """Normalize inputs so equivalent requests produce identical keys."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    return value
+
+
+def make_cache_key(kind: str, **params: Any) -> str:
+    """Return the canonical hash for an analysis of ``kind`` with ``params``.
+
+    A ``sequence`` parameter (a str or a ``PackedSequence``) is upper-cased
+    and stripped of whitespace, packed and replaced by the packed digest so
+    the canonical form stays small.
+    """
+    params = dict(params)
+    sequence = params.pop("sequence", None)
+    if sequence is not None:
+        if not isinstance(sequence, PackedSequence):
+            sequence = PackedSequence.pack("".join(sequence.split()).upper())
+        params["sequence_sha256"] = sequence.digest
+        params["sequence_length"] = len(sequence)
+    canonical = json.dumps(
+        {"kind": kind, "params": _normalize(params)},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory LRU + disk) result cache with per-key statistics."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = DEFAULT_CACHE_DIR,
+        max_memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        disk_budget_bytes: int = DEFAULT_DISK_BUDGET_BYTES,
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES,
+    ):
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._memory_sizes: dict[str, int] = {}
+        self._memory_bytes = 0
+        self._max_memory_entries = max(1, max_memory_entries)
+        self._memory_budget_bytes = memory_budget_bytes
+        self._disk_budget_bytes = disk_budget_bytes
+        self._dir = Path(cache_dir) if cache_dir is not None else None
+        # Disk-tier files -> size in bytes, least recently used first
+        self._disk_sizes: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        if self._dir is not None:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            files = []
+            for path in self._dir.glob("*/*.pkl"):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                files.append((st.st_mtime, path.stem, st.st_size))
+            for _, key, size in sorted(files):
+                self._disk_sizes[key] = size
+            self._disk_bytes = sum(self._disk_sizes.values())
+        self._key_stats: OrderedDict[str, dict[str, int]] = OrderedDict()
+        self._hits = self._misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self._dir / key[:2] / f"{key}.pkl"
+
+    def _record(self, key: str, field: str) -> None:
+        """Count a hit or miss for ``key``. Caller holds the lock."""
+        if field == "hits":
+            self._hits += 1
+        else:
+            self._misses += 1
+        stats = self._key_stats.setdefault(key, {"hits": 0, "misses": 0})
+        stats[field] += 1
+        self._key_stats.move_to_end(key)
+        while len(self._key_stats) > MAX_KEY_STATS:
+            self._key_stats.popitem(last=False)
+
+    def _forget(self, key: str) -> None:
+        """Drop ``key``'s counters once it is in neither tier. Caller holds the lock."""
+        if key not in self._memory and key not in self._disk_sizes:
+            self._key_stats.pop(key, None)
+
+    def get(self, key: str) -> Any:
+        """Return the cached value for ``key`` or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._record(key, "hits")
+                return self._memory[key]
+
+        value = self._load_from_disk(key)
+        with self._lock:
+            if value is None:
+                self._record(key, "misses")
+                return None
+            self._record(key, "hits")
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store ``value`` in both tiers."""
+        with self._lock:
+            self._remember(key, value)
+        self._write_to_disk(key, value)
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insert into the memory tier, evicting by entry count and resident bytes. Caller holds the lock."""
+        self._memory_bytes -= self._memory_sizes.pop(key, 0)
+        size = payload_nbytes(value)[0]
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        self._memory_sizes[key] = size
+        self._memory_bytes += size
+        while len(self._memory) > 1 and (
+            len(self._memory) > self._max_memory_entries or self._memory_bytes > self._memory_budget_bytes
+        ):
+            evicted, _ = self._memory.popitem(last=False)
+            self._memory_bytes -= self._memory_sizes.pop(evicted)
+            self._forget(evicted)
+
+    def _load_from_disk(self, key: str) -> Any:
+        if self._dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        # Touch so the disk tier evicts in least-recently-used order, also after a restart.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            if key in self._disk_sizes:
+                self._disk_sizes.move_to_end(key)
+            else:
+                # Written by another process sharing the directory
+                try:
+                    self._disk_sizes[key] = path.stat().st_size
+                    self._disk_bytes += self._disk_sizes[key]
+                except OSError:
+                    pass
+        return value
+
+    def _write_to_disk(self, key: str, value: Any) -> None:
+        if self._dir is None:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write atomically so concurrent readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+            size = path.stat().st_size
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._disk_bytes += size - self._disk_sizes.pop(key, 0)
+            self._disk_sizes[key] = size
+            self._enforce_disk_budget(keep=key)
+
+    def _enforce_disk_budget(self, keep: str) -> None:
+        """Delete least recently used files until the disk tier fits its budget. Caller holds the lock."""
+        for key in list(self._disk_sizes):
+            if self._disk_bytes <= self._disk_budget_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            self._disk_bytes -= self._disk_sizes.pop(key)
+            self._forget(key)
+
+    def key_stats(self, key: str) -> dict[str, int]:
+        """Return hit/miss counters recorded for ``key``."""
+        with self._lock:
+            return dict(self._key_stats.get(key, {"hits": 0, "misses": 0}))
+
+    def stats(self) -> dict:
+        """Return aggregate counters for the whole cache."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk_sizes),
+                "disk_bytes": self._disk_bytes,
+                "keys_tracked": len(self._key_stats),
+            }
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_sizes.clear()
+            self._memory_bytes = 0
+            self._disk_sizes.clear()
+            self._disk_bytes = 0
+            self._key_stats.clear()
+        if self._dir is not None:
+            for path in self._dir.glob("*/*.pkl"):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
@@ -0,0 +1,262 @@
+"""
+Process-wide store for finished analysis results, shared by all sessions.
+
+Entries are isolated by owner (an API key hash): a result is only returned
+to the owner that stored it. Memory is accounted by the real ``nbytes`` of
+the arrays each entry holds in RAM; memory-mapped arrays are tracked
+separately because their pages belong to the OS page cache. When resident
+bytes exceed the budget, entries are evicted by GreedyDual-Size (recently
+used, cheap-to-hold and expensive-to-recompute entries stay longest) and
+spilled to disk as a small pickle plus one ``.npy`` file per array. A
+spilled entry is reloaded with its arrays memory-mapped, so bringing a cold
+multi-megabase result back costs almost no RAM. The spill directory has its
+own byte budget; least recently used entries are deleted from disk first.
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from alphagenome_ui.result_cache import CACHE_ROOT, payload_nbytes
+
+DEFAULT_STORE_DIR = CACHE_ROOT / "store"
+DEFAULT_MEMORY_BUDGET_BYTES = int(os.environ.get("ALPHAGENOME_STORE_BUDGET_BYTES", 1024 * 1024 * 1024))
+DEFAULT_DISK_BUDGET_BYTES = int(os.environ.get("ALPHAGENOME_STORE_DISK_BUDGET_BYTES", 8 * 1024 * 1024 * 1024))
+# Floor for an entry's size so tiny or fully memory-mapped entries still age out
+_MIN_ENTRY_BYTES = 4096
+
+
+@dataclass(frozen=True)
+class _ArrayRef:
+    """Placeholder for an array spilled to ``<entry dir>/<name>``."""
+
+    name: str
+
+
+def _replace_arrays(value: Any, arrays: list) -> Any:
+    """Copy of ``value`` with every array swapped for an ``_ArrayRef``."""
+    if isinstance(value, np.ndarray):
+        arrays.append(value)
+        return _ArrayRef(f"a{len(arrays) - 1}.npy")
+    if isinstance(value, dict):
+        return {k: _replace_arrays(v, arrays) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_replace_arrays(v, arrays) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_replace_arrays(v, arrays) for v in value)
+    return value
+
+
+def _restore_arrays(value: Any, directory: Path) -> Any:
+    if isinstance(value, _ArrayRef):
+        return np.load(directory / value.name, mmap_mode="r")
+    if isinstance(value, dict):
+        return {k: _restore_arrays(v, directory) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_restore_arrays(v, directory) for v in value]
+    if isinstance(value, tuple):
+        return tuple(_restore_arrays(v, directory) for v in value)
+    return value
+
+
+@dataclass
+class _Entry:
+    value: Any
+    resident: int
+    mapped: int
+    cost: float
+    priority: float
+    on_disk: bool
+
+
+class ResultStore:
+    """Owner-isolated, memory-budgeted result store with disk spill."""
+
+    def __init__(
+        self,
+        directory: str | Path = DEFAULT_STORE_DIR,
+        memory_budget_bytes: int = DEFAULT_MEMORY_BUDGET_BYTES,
+        disk_budget_bytes: int = DEFAULT_DISK_BUDGET_BYTES,
+    ):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._budget = max(0, memory_budget_bytes)
+        self._disk_budget = max(0, disk_budget_bytes)
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        # Evicted entries still being written to disk, readable until the write lands
+        self._spilling: dict[tuple[str, str], _Entry] = {}
+        self._resident = 0
+        # GreedyDual-Size inflation value: the priority of the last evicted entry
+        self._clock = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "loads": 0, "spills": 0, "evictions": 0, "disk_evictions": 0}
+
+    def _entry_dir(self, owner: str, key: str) -> Path:
+        return self._dir / (owner or "_") / key
+
+    def _priority(self, cost: float, resident: int) -> float:
+        return self._clock + cost / (max(resident, _MIN_ENTRY_BYTES) / 1e6)
+
+    def put(self, owner: str, key: str, value: Any, cost: float = 1.0, durable: bool = False) -> None:
+        """Store ``value`` for ``owner`` under ``key``.
+
+        ``cost`` is what recomputing the entry would take (e.g. seconds); it
+        keeps expensive entries in memory longer. ``durable`` writes the entry
+        to disk immediately instead of only when it is evicted.
+        """
+        if durable:
+            self._write(owner, key, value)
+        resident, mapped = payload_nbytes(value)
+        with self._lock:
+            self._discard((owner, key))
+            self._entries[(owner, key)] = _Entry(value, resident, mapped, cost, self._priority(cost, resident), durable)
+            self._resident += resident
+            victims = self._evict_over_budget(keep=(owner, key))
+        self._spill(victims)
+
+    def get(self, owner: str, key: str) -> Any:
+        """Return the value stored for ``(owner, key)``, reloading a spilled entry, or None."""
+        with self._lock:
+            entry = self._entries.get((owner, key))
+            if entry is not None:
+                entry.priority = self._priority(entry.cost, entry.resident)
+                self._stats["hits"] += 1
+                return entry.value
+            entry = self._spilling.get((owner, key))
+            if entry is not None:
+                self._stats["hits"] += 1
+                return entry.value
+        value = self._read(owner, key)
+        with self._lock:
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._stats["loads"] += 1
+            if (owner, key) not in self._entries:
+                resident, mapped = payload_nbytes(value)
+                self._entries[(owner, key)] = _Entry(value, resident, mapped, 1.0, self._priority(1.0, resident), True)
+                self._resident += resident
+            victims = self._evict_over_budget(keep=(owner, key))
+        self._spill(victims)
+        return value
+
+    def delete(self, owner: str, key: str) -> None:
+        """Remove ``(owner, key)`` from memory and disk."""
+        with self._lock:
+            self._discard((owner, key))
+            self._spilling.pop((owner, key), None)
+        shutil.rmtree(self._entry_dir(owner, key), ignore_errors=True)
+
+    def _discard(self, entry_key: tuple[str, str]) -> None:
+        """Drop an entry from memory. Caller holds the lock."""
+        entry = self._entries.pop(entry_key, None)
+        if entry is not None:
+            self._resident -= entry.resident
+
+    def _evict_over_budget(self, keep: tuple[str, str]) -> list:
+        """Pop lowest-priority entries until resident bytes fit. Caller holds the lock."""
+        victims = []
+        while self._resident > self._budget and len(self._entries) > 1:
+            entry_key = min((k for k in self._entries if k != keep), key=lambda k: self._entries[k].priority)
+            entry = self._entries[entry_key]
+            self._clock = entry.priority
+            self._discard(entry_key)
+            self._stats["evictions"] += 1
+            if not entry.on_disk:
+                self._spilling[entry_key] = entry
+                victims.append((entry_key, entry))
+        return victims
+
+    def _spill(self, victims: list) -> None:
+        for (owner, key), entry in victims:
+            try:
+                self._write(owner, key, entry.value)
+            finally:
+                with self._lock:
+                    if self._spilling.get((owner, key)) is entry:
+                        del self._spilling[(owner, key)]
+                    self._stats["spills"] += 1
+
+    def _write(self, owner: str, key: str, value: Any) -> None:
+        """Write an entry atomically: arrays as ``.npy`` files, the rest pickled."""
+        target = self._entry_dir(owner, key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(dir=target.parent, prefix=f".{key}."))
+        try:
+            arrays = []
+            skeleton = _replace_arrays(value, arrays)
+            for i, array in enumerate(arrays):
+                np.save(tmp / f"a{i}.npy", array, allow_pickle=False)
+            with open(tmp / "value.pkl", "wb") as f:
+                pickle.dump({"owner": owner, "value": skeleton}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            shutil.rmtree(target, ignore_errors=True)
+            os.replace(tmp, target)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        self._enforce_disk_budget(keep=(owner, key))
+
+    def _enforce_disk_budget(self, keep: tuple[str, str]) -> None:
+        """Delete least recently used entry directories until the spill directory fits its budget."""
+        entries, total = [], 0
+        for directory in self._dir.glob("*/*"):
+            if directory.name.startswith("."):
+                continue
+            try:
+                size = sum(f.stat().st_size for f in directory.iterdir())
+                used = (directory / "value.pkl").stat().st_mtime
+            except OSError:
+                continue
+            entries.append((used, size, directory))
+            total += size
+        if total <= self._disk_budget:
+            return
+        entries.sort()
+        for _, size, directory in entries:
+            if total <= self._disk_budget:
+                break
+            entry_key = (directory.parent.name if directory.parent.name != "_" else "", directory.name)
+            if entry_key == keep:
+                continue
+            shutil.rmtree(directory, ignore_errors=True)
+            total -= size
+            with self._lock:
+                self._stats["disk_evictions"] += 1
+                entry = self._entries.get(entry_key)
+                if entry is not None:
+                    # Still in memory: write it out again if it is evicted later
+                    entry.on_disk = False
+
+    def _read(self, owner: str, key: str) -> Any:
+        directory = self._entry_dir(owner, key)
+        try:
+            with open(directory / "value.pkl", "rb") as f:
+                stored = pickle.load(f)
+            if stored.get("owner") != owner:
+                return None
+            # Touch so the disk budget deletes in least-recently-used order
+            os.utime(directory / "value.pkl")
+            return _restore_arrays(stored["value"], directory)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+
+    def stats(self) -> dict:
+        """Return counters plus resident/mapped bytes against the budget."""
+        with self._lock:
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "owners": len({owner for owner, _ in self._entries}),
+                "resident_bytes": self._resident,
+                "mapped_bytes": sum(e.mapped for e in self._entries.values()),
+                "budget_bytes": self._budget,
+                "disk_budget_bytes": self._disk_budget,
+            }
@@ -0,0 +1,284 @@
+"""
+Resumable sliding-window scans over chromosome ranges or BED regions.
+
+Windows of a supported model length are laid on a global grid with a fixed
+stride, so overlapping regions produce identical windows that are predicted
+once. Every completed window's summary statistics are appended to an
+on-disk checkpoint (one JSON line each), so a scan restarted with the same
+parameters skips the windows it has already done. Statistics are folded
+into running genome-wide aggregates as windows complete, and the compact
+result track holds one row per window: the window's central ``stride``
+bases with the per-(output type, tissue) mean and max.
+"""
+
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
+from alphagenome_ui.batch import DEFAULT_CONCURRENCY, _normalize_chromosome, run_bounded
+from alphagenome_ui.result_cache import CACHE_ROOT
+from alphagenome_ui.tiling import ALIGNMENT, SUPPORTED_LENGTHS
+
+DEFAULT_SCAN_DIR = CACHE_ROOT / "scans"
+DEFAULT_SCAN_WINDOW = 131072
+DEFAULT_SCAN_STRIDE = 131072
+WINDOW_STATS = ("mean", "max")
+
+
+@dataclass(frozen=True, order=True)
+class ScanWindow:
+    """A model window on the scan grid (0-based, half-open)."""
+
+    chromosome: str
+    start: int
+    end: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.chromosome}:{self.start}-{self.end}"
+
+    def core(self, stride: int, length: int | None = None) -> tuple[int, int]:
+        """The central ``stride`` bases this window represents in the scan track.
+
+        The window at the chromosome start also represents the bases before its
+        core, and the window ending on the chromosome ``length`` the bases after
+        it. A window shifted off the grid to end there (see ``plan_scan_windows``)
+        starts its core where the last grid core ends.
+        """
+        width = self.end - self.start
+        if stride >= width:
+            return self.start, self.end
+        offset = (width - stride) // 2
+        if self.start % stride:
+            start = (self.start // stride + 1) * stride + offset
+        else:
+            start = self.start + offset if self.start else 0
+        end = self.end if length is not None and self.end >= length else self.start + offset + stride
+        return start, max(start, end)
+
+
+def iter_bed_regions(lines: Iterable[str], errors: list[tuple[int, str]] | None = None) -> Iterator[tuple[str, int, int]]:
+    """Yield ``(chromosome, start, end)`` from BED lines.
+
+    ``track``/``browser``/``#`` lines are skipped; extra columns are ignored.
+    Malformed lines are reported in ``errors`` as ``(line_number, message)``.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip() or line.startswith(("#", "track", "browser")):
+            continue
+        fields = line.split()
+        try:
+            chromosome, start, end = _normalize_chromosome(fields[0]), int(fields[1]), int(fields[2])
+        except (IndexError, ValueError) as e:
+            if errors is not None:
+                errors.append((line_number, f"unparseable region: {e}"))
+            continue
+        if start < 0 or end <= start:
+            if errors is not None:
+                errors.append((line_number, f"invalid region: {start}-{end}"))
+            continue
+        yield chromosome, start, end
+
+
+def check_scan_params(window: int, stride: int) -> int:
+    """Validate the window length and return the stride aligned to ``ALIGNMENT``."""
+    if window not in SUPPORTED_LENGTHS:
+        raise ValueError(f"Scan window {window} is not supported; use one of {SUPPORTED_LENGTHS}")
+    return max(ALIGNMENT, int(stride) // ALIGNMENT * ALIGNMENT)
+
+
+def plan_scan_windows(
+    regions: Iterable[tuple[str, int, int]], window: int, stride: int, lengths: dict[str, int] | None = None,
+) -> Iterator[ScanWindow]:
+    """Yield the unique grid windows whose cores cover ``regions``.
+
+    Windows start at multiples of ``stride``; duplicates from overlapping or
+    repeated regions are dropped. With the chromosome ``lengths``, a window
+    that would run past the chromosome end is shifted back to end on it, and
+    chromosomes shorter than ``window`` yield no windows.
+    """
+    stride = check_scan_params(window, stride)
+    offset = max(0, (window - stride) // 2)
+    lengths = lengths or {}
+    seen = set()
+    for chromosome, start, end in regions:
+        length = lengths.get(chromosome)
+        if length is not None and length < window:
+            continue
+        first = max(0, (start - offset) // stride * stride)
+        for window_start in range(first, max(first + 1, end - offset), stride):
+            if length is not None:
+                window_start = min(window_start, length - window)
+            scan_window = ScanWindow(chromosome, window_start, window_start + window)
+            if scan_window not in seen:
+                seen.add(scan_window)
+                yield scan_window
+
+
+def window_stats(blocks: dict[str, np.ndarray]) -> dict[str, dict[str, float]]:
+    """Mean and max of each ``(positions, tracks)`` block of one window."""
+    return {
+        key: {
+            "mean": float(values.mean(dtype=np.float64)) if values.size else 0.0,
+            "max": float(values.max()) if values.size else 0.0,
+        }
+        for key, values in blocks.items()
+    }
+
+
+class ScanCheckpoint:
+    """Append-only log of completed windows in ``<directory>/windows.jsonl``.
+
+    Each line is flushed and fsynced as it is written. A line torn by a crash
+    is dropped (and truncated away) when the checkpoint is reopened.
+    """
+
+    def __init__(self, directory: str | Path, params: dict | None = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.path = self.directory / "windows.jsonl"
+        manifest = self.directory / "manifest.json"
+        if params is not None and not manifest.exists():
+            manifest.write_text(json.dumps(params, sort_keys=True, default=str), encoding="utf-8")
+        self.records = self._load()
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def _load(self) -> dict[ScanWindow, dict]:
+        records = {}
+        if not self.path.exists():
+            return records
+        valid = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    window = ScanWindow(entry["chromosome"], int(entry["start"]), int(entry["end"]))
+                except (ValueError, KeyError, TypeError):
+                    break
+                if not line.endswith(b"\n"):
+                    break
+                records[window] = entry["stats"]
+                valid += len(line)
+        if valid < self.path.stat().st_size:
+            os.truncate(self.path, valid)
+        return records
+
+    def __contains__(self, window: ScanWindow) -> bool:
+        return window in self.records
+
+    def record(self, window: ScanWindow, stats: dict) -> None:
+        """Durably mark ``window`` as done with its ``stats``."""
+        line = json.dumps({"chromosome": window.chromosome, "start": window.start, "end": window.end, "stats": stats})
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.records[window] = stats
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ScanAggregator:
+    """Running genome-wide aggregates of per-window statistics."""
+
+    def __init__(self):
+        self.windows = 0
+        self._blocks: dict[str, dict] = {}
+
+    def add(self, window: ScanWindow, stats: dict[str, dict[str, float]]) -> None:
+        self.windows += 1
+        for key, values in stats.items():
+            block = self._blocks.setdefault(key, {"windows": 0, "sum_mean": 0.0, "max": -np.inf, "max_window": ""})
+            block["windows"] += 1
+            block["sum_mean"] += values["mean"]
+            if values["max"] > block["max"]:
+                block["max"], block["max_window"] = values["max"], window.key
+
+    def summary(self) -> list[dict]:
+        """One row per block: windows seen, mean of window means, overall max and where."""
+        return [
+            {
+                "block": key,
+                "windows": b["windows"],
+                "mean": b["sum_mean"] / b["windows"],
+                "max": float(b["max"]),
+                "max_window": b["max_window"],
+            }
+            for key, b in sorted(self._blocks.items())
+        ]
+
+
+def write_scan_track(path: str | Path, records: dict[ScanWindow, dict], stride: int, lengths: dict[str, int] | None = None) -> int:
+    """Write the compact scan track as a sorted TSV (bedGraph-like, one column per block and stat).
+
+    With the chromosome ``lengths``, the last window's row runs to the chromosome end.
+    Returns the number of rows written.
+    """
+    blocks = sorted({key for stats in records.values() for key in stats})
+    columns = [f"{key}:{stat}" for key in blocks for stat in WINDOW_STATS]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\t".join(["#chromosome", "start", "end", *columns]) + "\n")
+        for window in sorted(records):
+            stats = records[window]
+            start, end = window.core(stride, (lengths or {}).get(window.chromosome))
+            values = [
+                f"{stats[key][stat]:.6g}" if key in stats else "" for key in blocks for stat in WINDOW_STATS
+            ]
+            f.write("\t".join([window.chromosome, str(start), str(end), *values]) + "\n")
+    return len(records)
+
+
+def run_scan(
+    windows: Iterable[ScanWindow],
+    predict: Callable[[ScanWindow], dict[str, dict[str, float]]],
+    checkpoint: ScanCheckpoint,
+    max_workers: int = DEFAULT_CONCURRENCY,
+    on_window: Callable[[ScanWindow, dict], None] | None = None,
+) -> dict:
+    """Predict every window not yet in ``checkpoint`` through a bounded pool.
+
+    ``predict`` returns a window's statistics (see ``window_stats``). Failed
+    windows are not checkpointed, so they are retried when the scan resumes.
+    ``on_window(window, result)`` is called after each attempted window.
+    """
+    aggregator = ScanAggregator()
+    for window, stats in checkpoint.records.items():
+        aggregator.add(window, stats)
+    resumed = aggregator.windows
+    failed, errors = 0, []
+
+    def attempt(window: ScanWindow) -> dict:
+        return {"success": True, "stats": predict(window)}
+
+    pending = (w for w in windows if w not in checkpoint)
+    for window, result in run_bounded(pending, attempt, max_workers=max_workers):
+        if result.get("success"):
+            checkpoint.record(window, result["stats"])
+            aggregator.add(window, result["stats"])
+        else:
+            failed += 1
+            if len(errors) < 10:
+                errors.append(f"{window.key}: {result.get('error', '')}")
+        if on_window is not None:
+            on_window(window, result)
+
+    return {
+        "completed": aggregator.windows,
+        "resumed": resumed,
+        "failed": failed,
+        "errors": errors,
+        "summary": aggregator.summary(),
+    }
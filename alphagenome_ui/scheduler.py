@@ -0,0 +1,353 @@
+"""
+Central scheduler for model calls.
+
+Every remote call goes through one process-wide scheduler that:
+
+- rate-limits each API key with a token bucket (keyed by the key's hash),
+- retries transient failures (``UNAVAILABLE``, ``RESOURCE_EXHAUSTED``, ...)
+  with exponential backoff and full jitter,
+- runs interactive work ahead of batch work,
+- coalesces identical in-flight requests of the same API key onto one
+  shared future, so two sessions asking for the same prediction at the same
+  time pay for it once. Requests of different keys are never merged, so
+  errors, quota and rate-limit charges stay with the key that made them.
+
+A request takes a token only when one is free. Throttled requests are
+parked per key in priority order, and when the key's next token is due the
+most urgent one goes back on the queue, so a backlog of batch work never
+spends the tokens a later interactive call needs. Parked and backed-off
+requests wait on timers rather than in a worker, so one saturated key never
+blocks the others.
+"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from alphagenome_ui.client_pool import hash_api_key
+
+INTERACTIVE = 0
+BATCH = 10
+
+DEFAULT_MAX_CONCURRENCY = 16
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+RETRYABLE_CODES = ("UNAVAILABLE", "RESOURCE_EXHAUSTED", "DEADLINE_EXCEEDED", "ABORTED")
+
+_QUEUED, _WAITING, _PARKED, _RUNNING = "queued", "waiting", "parked", "running"
+
+
+class RequestFailed(RuntimeError):
+    """A retryable model call that kept failing until its retries ran out."""
+
+    def __init__(self, error: Exception, attempts: int):
+        super().__init__(f"Model request failed after {attempts} attempts: {error}")
+        self.attempts = attempts
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether ``error`` is a transient failure worth retrying."""
+    code = getattr(error, "code", None)
+    if callable(code):
+        try:
+            if getattr(code(), "name", None) in RETRYABLE_CODES:
+                return True
+        except Exception:
+            pass
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    message = str(error)
+    return any(name in message for name in RETRYABLE_CODES)
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding up to ``burst``."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        """Take a token if one is free and return 0; otherwise take nothing and
+        return the seconds until one will be."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return 0.0
+            return (1.0 - self._tokens) / self.rate
+
+    def wait_time(self) -> float:
+        """Seconds until a token is free, without taking one."""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill()
+            return max(0.0, (1.0 - self._tokens) / self.rate)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter."""
+
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+
+    def delay(self, attempt: int, rng: random.Random) -> float:
+        """Seconds to wait before retry number ``attempt`` (1-based)."""
+        return rng.uniform(0.0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+@dataclass
+class _Task:
+    api_key: str
+    fn: Callable[[Any], Any]
+    key: str | None
+    priority: int
+    future: Future = field(default_factory=Future)
+    state: str = _QUEUED
+    attempts: int = 0
+    # Released from its key's parked queue, so it may take the next token ahead of the rest
+    unparked: bool = False
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+class RequestScheduler:
+    """Rate-limited, prioritized, coalescing executor for model calls.
+
+    ``client_for(api_key)`` returns the client passed to each request's
+    function; ``on_retry(api_key)`` is called after a retryable failure
+    (e.g. to health-check the client) and ``observe(stage, seconds)``
+    receives queue-wait timings.
+    """
+
+    def __init__(
+        self,
+        client_for: Callable[[str], Any],
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        retry: RetryPolicy = RetryPolicy(),
+        on_retry: Callable[[str], None] | None = None,
+        observe: Callable[[str, float], None] | None = None,
+        seed: int | None = None,
+    ):
+        self._client_for = client_for
+        self._max_concurrency = max(1, max_concurrency)
+        self._rate = rate
+        self._burst = burst
+        self._retry = retry
+        self._on_retry = on_retry
+        self._observe = observe
+        self._rng = random.Random(seed)
+        self._heap: list = []
+        self._sequence = itertools.count()
+        self._inflight: dict[str, _Task] = {}
+        self._buckets: dict[str, TokenBucket] = {}
+        # Throttled tasks per hashed API key, and keys with an unpark timer pending
+        self._parked: dict[str, list] = {}
+        self._unparking: set[str] = set()
+        self._cond = threading.Condition()
+        self._workers: list[threading.Thread] = []
+        self._running = 0
+        self._stats = {"submitted": 0, "coalesced": 0, "throttled": 0, "retries": 0, "failures": 0, "completed": 0}
+
+    @classmethod
+    def from_env(cls, client_for: Callable[[str], Any], **kwargs) -> "RequestScheduler":
+        """Build a scheduler configured by ``ALPHAGENOME_RATE_LIMIT`` (requests/s per key),
+        ``ALPHAGENOME_RATE_BURST``, ``ALPHAGENOME_MAX_INFLIGHT`` and ``ALPHAGENOME_MAX_ATTEMPTS``."""
+        return cls(
+            client_for,
+            max_concurrency=int(os.environ.get("ALPHAGENOME_MAX_INFLIGHT", DEFAULT_MAX_CONCURRENCY)),
+            rate=float(os.environ.get("ALPHAGENOME_RATE_LIMIT", DEFAULT_RATE)),
+            burst=int(os.environ.get("ALPHAGENOME_RATE_BURST", DEFAULT_BURST)),
+            retry=RetryPolicy(max_attempts=max(1, int(os.environ.get("ALPHAGENOME_MAX_ATTEMPTS", RetryPolicy.max_attempts)))),
+            **kwargs,
+        )
+
+    def submit(self, api_key: str, fn: Callable[[Any], Any], key: str | None = None, priority: int = INTERACTIVE) -> Future:
+        """Schedule ``fn(client)`` and return its future.
+
+        Requests with the same ``key`` and API key share one call while it is
+        in flight; joining with a more urgent priority promotes the queued call.
+        """
+        if key is not None:
+            key = f"{hash_api_key(api_key)}:{key}"
+        with self._cond:
+            self._stats["submitted"] += 1
+            task = self._inflight.get(key) if key is not None else None
+            if task is not None:
+                self._stats["coalesced"] += 1
+                if priority < task.priority:
+                    task.priority = priority
+                    if task.state == _QUEUED:
+                        self._push(task)
+                    elif task.state == _PARKED:
+                        self._park(hash_api_key(api_key), task)
+                return task.future
+            task = _Task(api_key, fn, key, priority)
+            if key is not None:
+                self._inflight[key] = task
+            self._push(task)
+            self._ensure_workers()
+        return task.future
+
+    def call(self, api_key: str, fn: Callable[[Any], Any], key: str | None = None, priority: int = INTERACTIVE) -> Any:
+        """Run ``fn(client)`` through the scheduler and wait for its result."""
+        return self.submit(api_key, fn, key, priority).result()
+
+    def _push(self, task: _Task) -> None:
+        """Queue ``task``. Caller holds the condition."""
+        task.state = _QUEUED
+        heapq.heappush(self._heap, (task.priority, next(self._sequence), task))
+        self._cond.notify()
+
+    def _park(self, bucket_key: str, task: _Task) -> None:
+        """Hold a throttled ``task`` until its key has a token. Caller holds the condition."""
+        task.state = _PARKED
+        heapq.heappush(self._parked.setdefault(bucket_key, []), (task.priority, next(self._sequence), task))
+
+    def _unpark_after(self, bucket_key: str, delay: float) -> None:
+        """Queue the key's most urgent parked task after ``delay``. Caller holds the condition."""
+        if bucket_key in self._unparking:
+            return
+        self._unparking.add(bucket_key)
+
+        def unpark():
+            with self._cond:
+                self._unparking.discard(bucket_key)
+                parked = self._parked.get(bucket_key, [])
+                while parked:
+                    priority, _, task = heapq.heappop(parked)
+                    # Skip entries superseded by a promotion
+                    if task.state == _PARKED and priority == task.priority:
+                        task.unparked = True
+                        self._push(task)
+                        break
+                if not parked:
+                    self._parked.pop(bucket_key, None)
+
+        timer = threading.Timer(delay, unpark)
+        timer.daemon = True
+        timer.start()
+
+    def _admit(self, task: _Task) -> bool:
+        """Take a token for ``task``, or park it if none is free. Caller holds the condition.
+
+        While a key has parked tasks, its new tasks are parked behind them in
+        priority order instead of competing for the next token.
+        """
+        bucket_key = hash_api_key(task.api_key)
+        bucket = self._bucket(task.api_key)
+        if self._parked.get(bucket_key) and not task.unparked:
+            self._park(bucket_key, task)
+            return False
+        task.unparked = False
+        wait = bucket.take()
+        if wait > 0:
+            self._stats["throttled"] += 1
+            self._park(bucket_key, task)
+            self._unpark_after(bucket_key, wait)
+            return False
+        if self._parked.get(bucket_key):
+            self._unpark_after(bucket_key, bucket.wait_time())
+        return True
+
+    def _requeue_after(self, task: _Task, delay: float) -> None:
+        task.state = _WAITING
+
+        def push():
+            with self._cond:
+                self._push(task)
+
+        timer = threading.Timer(delay, push)
+        timer.daemon = True
+        timer.start()
+
+    def _ensure_workers(self) -> None:
+        """Start worker threads on first use. Caller holds the condition."""
+        while len(self._workers) < self._max_concurrency:
+            worker = threading.Thread(target=self._work, name=f"alphagenome-scheduler-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def _bucket(self, api_key: str) -> TokenBucket:
+        key = hash_api_key(api_key)
+        with self._cond:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(self._rate, self._burst)
+            return bucket
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    while not self._heap:
+                        self._cond.wait()
+                    priority, _, task = heapq.heappop(self._heap)
+                    # Skip entries superseded by a promotion or already taken
+                    if task.state == _QUEUED and priority == task.priority and self._admit(task):
+                        task.state = _RUNNING
+                        self._running += 1
+                        break
+            try:
+                self._execute(task)
+            finally:
+                with self._cond:
+                    self._running -= 1
+
+    def _execute(self, task: _Task) -> None:
+        if self._observe is not None and task.attempts == 0:
+            self._observe("queue_wait", time.monotonic() - task.submitted_at)
+
+        try:
+            result = task.fn(self._client_for(task.api_key))
+        except Exception as e:
+            task.attempts += 1
+            if is_retryable(e) and task.attempts < self._retry.max_attempts:
+                with self._cond:
+                    self._stats["retries"] += 1
+                if self._on_retry is not None:
+                    self._on_retry(task.api_key)
+                self._requeue_after(task, self._retry.delay(task.attempts, self._rng))
+                return
+            with self._cond:
+                self._stats["failures"] += 1
+            self._finish(task, error=RequestFailed(e, task.attempts) if is_retryable(e) else e)
+            return
+        self._finish(task, result=result)
+
+    def _finish(self, task: _Task, result: Any = None, error: Exception | None = None) -> None:
+        with self._cond:
+            if task.key is not None and self._inflight.get(task.key) is task:
+                del self._inflight[task.key]
+            self._stats["completed"] += 1
+        if error is not None:
+            task.future.set_exception(error)
+        else:
+            task.future.set_result(result)
+
+    def stats(self) -> dict:
+        """Return scheduler counters plus current queue depth and in-flight calls."""
+        with self._cond:
+            queued = len({id(task) for _, _, task in self._heap if task.state == _QUEUED})
+            queued += len({id(task) for parked in self._parked.values() for _, _, task in parked if task.state == _PARKED})
+            return {**self._stats, "queued": queued, "running": self._running, "inflight_keys": len(self._inflight)}
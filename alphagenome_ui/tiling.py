@@ -0,0 +1,195 @@
+"""
+Tiling of arbitrary-length genomic regions onto supported model windows.
+
+The model only accepts a fixed set of context lengths. A region that fits in
+one of them is predicted with a single window centred on it; longer regions
+are covered by largest-size windows laid out with a configurable overlap.
+Each window's outer ``trim`` bases are discarded (predictions are least
+reliable near the context edges) and the remaining overlaps are blended with
+complementary linear ramps before the tracks are stitched into one array.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from alphagenome_ui.batch import DEFAULT_CONCURRENCY, run_bounded
+
+# Mirrors alphagenome.models.dna_client.SUPPORTED_SEQUENCE_LENGTHS.
+SUPPORTED_LENGTHS = (16384, 131072, 524288, 1048576)
+DEFAULT_OVERLAP = 65536
+# Window starts and trims are aligned to the coarsest track resolution (ChIP).
+ALIGNMENT = 128
+
+
+@dataclass(frozen=True)
+class Tile:
+    """A model window and the part of it that contributes to the output."""
+
+    index: int
+    start: int
+    end: int
+    keep_start: int
+    keep_end: int
+    blend_left: int = 0
+    blend_right: int = 0
+
+    @property
+    def length(self) -> int:
+        return self.end - self.start
+
+
+def _align_down(value: int, alignment: int = ALIGNMENT) -> int:
+    return value // alignment * alignment
+
+
+def _inside(window_start: int, window: int, chromosome_length: int | None) -> int:
+    """``window_start`` moved so the window ends by ``chromosome_length`` (when known) and starts at or after 0."""
+    if chromosome_length is not None:
+        window_start = min(window_start, chromosome_length - window)
+    return max(0, window_start)
+
+
+def plan_tiles(
+    start: int,
+    end: int,
+    overlap: int = DEFAULT_OVERLAP,
+    lengths: tuple[int, ...] = SUPPORTED_LENGTHS,
+    chromosome_length: int | None = None,
+) -> list[Tile]:
+    """Split ``[start, end)`` into windows of supported lengths.
+
+    ``overlap`` is the number of bases shared by consecutive windows; a
+    quarter of it is trimmed from each window edge and the rest is blended.
+    With ``chromosome_length``, a window running past the chromosome end is
+    moved back to end on it; the bases it contributes stay the same.
+    """
+    if end <= start:
+        raise ValueError("Start position must be less than end position")
+    length = end - start
+    lengths = tuple(sorted(lengths))
+
+    fitting = [w for w in lengths if w >= length]
+    if fitting:
+        # A single window is sent unaligned so that regions of exactly a
+        # supported length are requested verbatim.
+        window = fitting[0]
+        window_start = _inside(start - (window - length) // 2, window, chromosome_length)
+        return [Tile(0, window_start, window_start + window, start, end)]
+
+    window = lengths[-1]
+    overlap = _align_down(min(max(overlap, 0), window // 2))
+    trim = _align_down(overlap // 4)
+    blend = overlap - 2 * trim
+    stride = window - overlap
+
+    first_start = max(0, _align_down(start - trim))
+    first_keep_end = first_start + window - trim
+    count = 1 + max(0, math.ceil((end - first_keep_end) / stride))
+
+    tiles = []
+    for i in range(count):
+        window_start = first_start + i * stride
+        keep_start = start if i == 0 else window_start + trim
+        keep_end = end if i == count - 1 else window_start + window - trim
+        # Moving a window changes where its rows come from, not which bases it keeps
+        window_start = _inside(window_start, window, chromosome_length)
+        tiles.append(Tile(
+            index=i,
+            start=window_start,
+            end=window_start + window,
+            keep_start=max(keep_start, start),
+            keep_end=min(keep_end, end),
+            blend_left=blend if i > 0 else 0,
+            blend_right=blend if i < count - 1 else 0,
+        ))
+    return tiles
+
+
+def _ramp_weights(size: int, blend_left: int, blend_right: int) -> np.ndarray:
+    weights = np.ones(size, dtype=np.float32)
+    if blend_left:
+        n = min(blend_left, size)
+        weights[:n] = (np.arange(n, dtype=np.float32) + 0.5) / blend_left
+    if blend_right:
+        n = min(blend_right, size)
+        weights[size - n:] = np.minimum(
+            weights[size - n:], (np.arange(n, 0, -1, dtype=np.float32) - 0.5) / blend_right
+        )
+    return weights
+
+
+def stitch_tiles(
+    tiles: list[Tile],
+    arrays: list[np.ndarray],
+    start: int,
+    end: int,
+    resolution: int = 1,
+) -> np.ndarray:
+    """Blend per-window ``(positions, tracks)`` arrays into one region array.
+
+    ``arrays[i]`` covers ``tiles[i]`` at ``resolution`` bases per row. The
+    result has ``ceil((end - start) / resolution)`` rows; output row ``j``
+    takes the window row holding base ``start + j * resolution``, so windows
+    whose starts are off the output grid are shifted by whole rows.
+    """
+    first = arrays[0]
+    rows = -(-(end - start) // resolution)
+    out = np.zeros((rows,) + first.shape[1:], dtype=np.float32)
+    if len(tiles) == 1:
+        tile = tiles[0]
+        offset = (start - tile.start) // resolution
+        out[:] = first[offset:offset + rows]
+        return out
+
+    weight_sum = np.zeros(rows, dtype=np.float32)
+    for tile, values in zip(tiles, arrays):
+        lo = (tile.keep_start - start) // resolution
+        hi = -(-(tile.keep_end - start) // resolution)
+        weights = _ramp_weights(hi - lo, tile.blend_left // resolution, tile.blend_right // resolution)
+        # Window row of output row j is j + offset; clip to the rows the window has
+        offset = (start - tile.start) // resolution
+        clip_lo, clip_hi = max(lo, -offset), min(hi, values.shape[0] - offset, rows)
+        if clip_hi <= clip_lo:
+            continue
+        weights = weights[clip_lo - lo:clip_hi - lo]
+        shape = (clip_hi - clip_lo,) + (1,) * (values.ndim - 1)
+        out[clip_lo:clip_hi] += values[clip_lo + offset:clip_hi + offset] * weights.reshape(shape)
+        weight_sum[clip_lo:clip_hi] += weights
+    np.divide(out, np.maximum(weight_sum, 1e-12).reshape((rows,) + (1,) * (out.ndim - 1)), out=out)
+    return out
+
+
+def predict_tiled(
+    predict: Callable[[Tile], dict[str, tuple[np.ndarray, int]]],
+    start: int,
+    end: int,
+    overlap: int = DEFAULT_OVERLAP,
+    max_workers: int = DEFAULT_CONCURRENCY,
+    chromosome_length: int | None = None,
+) -> tuple[dict[str, np.ndarray], list[Tile]]:
+    """Predict ``[start, end)`` window by window in parallel and stitch the result.
+
+    ``predict(tile)`` returns ``{name: (values, resolution)}`` for the window,
+    where ``values`` is a ``(positions, tracks)`` array; each name is stitched
+    separately. Any failed window raises ``RuntimeError``. Windows are kept
+    inside ``chromosome_length`` when it is given (see ``plan_tiles``).
+    """
+    tiles = plan_tiles(start, end, overlap, chromosome_length=chromosome_length)
+    windows: list = [None] * len(tiles)
+
+    def run(tile):
+        return {"success": True, "blocks": predict(tile)}
+
+    for tile, result in run_bounded(tiles, run, max_workers=max_workers):
+        if not result["success"]:
+            raise RuntimeError(f"Window {tile.start}-{tile.end} failed: {result['error']}")
+        windows[tile.index] = result["blocks"]
+
+    stitched = {}
+    for name, (_, resolution) in windows[0].items():
+        arrays = [np.asarray(blocks[name][0]) for blocks in windows]
+        stitched[name] = stitch_tiles(tiles, arrays, start, end, resolution)
+    return stitched, tiles
@@ -0,0 +1,259 @@
+"""
+Persistent, chunked store of predicted tracks with interval-indexed lookups.
+
+Stitched interval predictions are kept on disk as ``.npy`` chunks, one
+directory per (backend, organism, chromosome, output type, tissue), and read
+back memory-mapped. Each key has a sorted interval index (chunk starts plus
+the longest chunk length, so overlap queries are two bisections), persisted
+as an append-only ``index.jsonl``. A new interval query is answered by
+slicing the overlapping chunks; only the gaps no chunk covers need a model
+call, and those predictions are added as new chunks. Zooming in on a
+predicted locus therefore costs nothing, and zooming out only pays for the
+flanks. The chunks are kept under a disk budget; the least recently read or
+written chunks are deleted first and simply become gaps again.
+"""
+
+import bisect
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from alphagenome_ui.result_cache import CACHE_ROOT
+
+DEFAULT_TRACK_STORE_DIR = CACHE_ROOT / "tracks"
+DEFAULT_ORGANISM = "human"
+DEFAULT_TRACK_STORE_BUDGET_BYTES = int(os.environ.get("ALPHAGENOME_TRACK_STORE_BUDGET_BYTES", 16 * 1024 * 1024 * 1024))
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """Stored rows covering ``[start, end)``; row ``i`` starts at ``start + i * resolution``."""
+
+    start: int
+    end: int
+    resolution: int
+    file: str
+
+
+def _safe(part: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", part)
+
+
+def merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Union of half-open ranges, sorted and merged."""
+    merged: list[list[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def subtract_ranges(start: int, end: int, covered: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Parts of ``[start, end)`` not in the merged, sorted ``covered`` ranges."""
+    gaps, cursor = [], start
+    for lo, hi in covered:
+        if hi <= cursor:
+            continue
+        if lo >= end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo))
+        cursor = max(cursor, hi)
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+class _KeyIndex:
+    """Chunks of one key sorted by start, with the longest chunk length for overlap queries."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.chunks: list[Chunk] = []
+        self.starts: list[int] = []
+        self.max_length = 0
+        self.meta: dict | None = None
+        meta = directory / "meta.json"
+        if meta.exists():
+            self.meta = json.loads(meta.read_text(encoding="utf-8"))
+        index = directory / "index.jsonl"
+        if index.exists():
+            with open(index, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        entry = json.loads(line)
+                        chunk = Chunk(int(entry["start"]), int(entry["end"]), int(entry["resolution"]), entry["file"])
+                    except (ValueError, KeyError, TypeError):
+                        break
+                    if (directory / chunk.file).exists():
+                        self._insert(chunk)
+
+    def _insert(self, chunk: Chunk) -> None:
+        i = bisect.bisect_right(self.starts, chunk.start)
+        self.starts.insert(i, chunk.start)
+        self.chunks.insert(i, chunk)
+        self.max_length = max(self.max_length, chunk.end - chunk.start)
+
+    def remove(self, file: str) -> None:
+        """Forget the chunk stored in ``file``; ``max_length`` stays an upper bound."""
+        for i, chunk in enumerate(self.chunks):
+            if chunk.file == file:
+                del self.chunks[i], self.starts[i]
+                return
+
+    def overlapping(self, start: int, end: int) -> list[Chunk]:
+        """Chunks intersecting ``[start, end)``, in start order."""
+        lo = bisect.bisect_right(self.starts, start - self.max_length)
+        hi = bisect.bisect_left(self.starts, end)
+        return [c for c in self.chunks[lo:hi] if c.end > start]
+
+    def gaps(self, start: int, end: int) -> list[tuple[int, int]]:
+        return subtract_ranges(start, end, merge_ranges([(c.start, c.end) for c in self.overlapping(start, end)]))
+
+
+class TrackStore:
+    """On-disk chunked track store keyed by (backend, organism, chromosome, output type, tissue)."""
+
+    def __init__(self, directory: str | Path = DEFAULT_TRACK_STORE_DIR, disk_budget_bytes: int = DEFAULT_TRACK_STORE_BUDGET_BYTES):
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._disk_budget = max(0, disk_budget_bytes)
+        self._indexes: dict[tuple, _KeyIndex] = {}
+        self._lock = threading.Lock()
+        self._stats = {"queries": 0, "hit_bases": 0, "miss_bases": 0, "chunks_written": 0, "disk_evictions": 0}
+        # Chunk files -> size in bytes, least recently used first
+        self._chunk_sizes: OrderedDict[Path, int] = OrderedDict()
+        chunks = []
+        for path in self._dir.rglob("*.npy"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            chunks.append((stat.st_mtime, path, stat.st_size))
+        for _, path, size in sorted(chunks):
+            self._chunk_sizes[path] = size
+        self._disk_bytes = sum(self._chunk_sizes.values())
+
+    def _index(self, key: tuple) -> _KeyIndex:
+        """Index for ``(backend, organism, chromosome, output_type, tissue)``. Caller holds the lock."""
+        index = self._indexes.get(key)
+        if index is None:
+            directory = self._dir.joinpath(*(_safe(part) for part in key))
+            index = self._indexes[key] = _KeyIndex(directory)
+        return index
+
+    def gaps(self, keys: list[tuple], start: int, end: int) -> list[tuple[int, int]]:
+        """Ranges of ``[start, end)`` missing for any of ``keys``, merged."""
+        with self._lock:
+            missing = [gap for key in keys for gap in self._index(key).gaps(start, end)]
+            gaps = merge_ranges(missing)
+            self._stats["queries"] += 1
+            miss = sum(hi - lo for lo, hi in gaps)
+            self._stats["miss_bases"] += miss
+            self._stats["hit_bases"] += (end - start) - miss
+        return gaps
+
+    def put(self, key: tuple, start: int, values: np.ndarray, resolution: int, names: list[str]) -> int:
+        """Store the parts of ``values`` (rows from ``start``) that ``key`` does not cover yet.
+
+        Returns the number of chunks written.
+        """
+        end = start + values.shape[0] * resolution
+        written = 0
+        with self._lock:
+            index = self._index(key)
+            index.directory.mkdir(parents=True, exist_ok=True)
+            if index.meta is None:
+                index.meta = {"resolution": int(resolution), "names": list(names)}
+                (index.directory / "meta.json").write_text(json.dumps(index.meta), encoding="utf-8")
+            with open(index.directory / "index.jsonl", "a", encoding="utf-8") as log:
+                for gap_start, gap_end in index.gaps(start, end):
+                    lo = (gap_start - start) // resolution
+                    hi = -(-(gap_end - start) // resolution)
+                    chunk = Chunk(start + lo * resolution, start + hi * resolution, int(resolution), f"{start + lo * resolution}-{start + hi * resolution}.npy")
+                    path = index.directory / chunk.file
+                    tmp = index.directory / f".{chunk.file}.{os.getpid()}.tmp"
+                    with open(tmp, "wb") as f:
+                        np.save(f, np.ascontiguousarray(values[lo:hi], dtype=np.float32), allow_pickle=False)
+                    os.replace(tmp, path)
+                    self._disk_bytes += path.stat().st_size - self._chunk_sizes.pop(path, 0)
+                    self._chunk_sizes[path] = path.stat().st_size
+                    log.write(json.dumps({"start": chunk.start, "end": chunk.end, "resolution": chunk.resolution, "file": chunk.file}) + "\n")
+                    index._insert(chunk)
+                    written += 1
+            self._stats["chunks_written"] += written
+            self._enforce_disk_budget(index)
+        return written
+
+    def _enforce_disk_budget(self, keep: _KeyIndex) -> None:
+        """Delete least recently used chunks until the store fits its budget. Caller holds the lock.
+
+        Chunks of ``keep`` (the key just written) are spared so the caller can read them back.
+        """
+        indexes = {index.directory: index for index in self._indexes.values()}
+        for path in list(self._chunk_sizes):
+            if self._disk_bytes <= self._disk_budget:
+                break
+            if path.parent == keep.directory:
+                continue
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            self._disk_bytes -= self._chunk_sizes.pop(path)
+            self._stats["disk_evictions"] += 1
+            index = indexes.get(path.parent)
+            if index is not None:
+                index.remove(path.name)
+
+    def read(self, key: tuple, start: int, end: int) -> tuple[np.ndarray, int, list[str]]:
+        """Assemble ``[start, end)`` for ``key`` from stored chunks as ``(values, resolution, names)``.
+
+        Output row ``j`` takes the stored row containing base ``start + j * resolution``.
+        Raises ``KeyError`` if any part is not covered.
+        """
+        with self._lock:
+            index = self._index(key)
+            if index.meta is None or index.gaps(start, end):
+                raise KeyError(f"{key} is not fully stored for {start}-{end}")
+            chunks = index.overlapping(start, end)
+            resolution, names = index.meta["resolution"], index.meta["names"]
+            for chunk in chunks:
+                path = index.directory / chunk.file
+                if path in self._chunk_sizes:
+                    self._chunk_sizes.move_to_end(path)
+                    os.utime(path)
+            # Open the chunks under the lock so eviction cannot delete them first
+            arrays = [(chunk, np.load(index.directory / chunk.file, mmap_mode="r")) for chunk in chunks]
+        rows = -(-(end - start) // resolution)
+        out = np.empty((rows, len(names)), dtype=np.float32)
+        for chunk, values in arrays:
+            j_lo = max(0, -(-(chunk.start - start) // resolution))
+            j_hi = min(rows, -(-(chunk.end - start) // resolution))
+            if j_hi <= j_lo:
+                continue
+            src = j_lo + (start - chunk.start) // resolution
+            out[j_lo:j_hi] = values[src:src + (j_hi - j_lo)]
+        return out, resolution, names
+
+    def stats(self) -> dict:
+        """Query counters, bases served from disk vs. predicted, and on-disk size."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["disk_bytes"] = self._disk_bytes
+        stats["disk_budget_bytes"] = self._disk_budget
+        total = stats["hit_bases"] + stats["miss_bases"]
+        stats["hit_rate"] = round(stats["hit_bases"] / total, 3) if total else None
+        return stats
@@ -0,0 +1,144 @@
+"""
+Shared context windows and reference predictions for nearby variants.
+
+Variant context windows are snapped to a fixed grid instead of being centred
+on each variant, so variants in the same locus resolve to the *same* window
+and its reference prediction can be computed once and reused. Given the
+window's reference sequence (read from the local reference genome when one is
+configured), each variant then only needs a prediction for its alternate
+sequence.
+
+The price of snapping is that a variant is generally not centred: with the
+defaults each side keeps between 393,216 and 655,360 bases of context (less
+near the chromosome ends, where windows are moved back inside the chromosome).
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+# 1 MiB is the largest context the model accepts (see tiling.SUPPORTED_LENGTHS).
+VARIANT_CONTEXT_LENGTH = 1048576
+# Variants inside the same CONTEXT_STEP bin share a window; every variant keeps
+# at least (VARIANT_CONTEXT_LENGTH - CONTEXT_STEP) / 2 bases of context per side.
+CONTEXT_STEP = 262144
+DEFAULT_SHARED_ENTRIES = 16
+
+
+@dataclass(frozen=True)
+class ContextWindow:
+    """A 0-based, half-open window on a chromosome."""
+
+    chromosome: str
+    start: int
+    end: int
+
+
+def context_window(
+    chromosome: str, position: int, length: int = VARIANT_CONTEXT_LENGTH, step: int = CONTEXT_STEP,
+    chromosome_length: int | None = None,
+) -> ContextWindow:
+    """Return the grid-snapped context window for a 1-based ``position``.
+
+    The variant lies in the middle ``step`` bases of the window, not at its
+    centre; see ``context_flanks`` for the context kept on each side. With
+    ``chromosome_length``, a window running past the chromosome end is moved
+    back to end on it, so all variants near the end share that window.
+    """
+    bin_start = (position - 1) // step * step
+    start = bin_start - (length - step) // 2
+    if chromosome_length is not None:
+        start = min(start, chromosome_length - length)
+    start = max(0, start)
+    return ContextWindow(chromosome, start, start + length)
+
+
+def context_flanks(window: ContextWindow, position: int) -> tuple[int, int]:
+    """Bases of context left and right of the 1-based ``position`` within ``window``."""
+    return position - 1 - window.start, window.end - position
+
+
+def group_by_window(variants: Iterable[Any], key: Callable[[Any], tuple[str, int]]) -> "OrderedDict[ContextWindow, list]":
+    """Group ``variants`` by shared context window, preserving first-seen order.
+
+    ``key(variant)`` returns its ``(chromosome, position)``.
+    """
+    groups: OrderedDict[ContextWindow, list] = OrderedDict()
+    for variant in variants:
+        groups.setdefault(context_window(*key(variant)), []).append(variant)
+    return groups
+
+
+def apply_variant(sequence: str, window: ContextWindow, position: int, ref: str, alt: str) -> str:
+    """Return ``sequence`` (covering ``window``) with ``ref`` replaced by ``alt``.
+
+    The result keeps the window length: insertions are truncated on the right
+    and deletions are padded with ``N``.
+    """
+    offset = position - 1 - window.start
+    if offset < 0 or offset + len(ref) > len(sequence):
+        raise ValueError(f"{window.chromosome}:{position} lies outside the context window")
+    observed = sequence[offset:offset + len(ref)].upper()
+    if observed != ref.upper():
+        raise ValueError(
+            f"Reference mismatch at {window.chromosome}:{position}: expected {ref}, genome has {observed}"
+        )
+    mutated = sequence[:offset] + alt + sequence[offset + len(ref):]
+    length = len(sequence)
+    return mutated[:length] if len(mutated) >= length else mutated + "N" * (length - len(mutated))
+
+
+class SharedPredictionCache:
+    """In-memory LRU of reference predictions with single-flight computation.
+
+    Concurrent requests for the same key wait for the first computation
+    instead of issuing duplicate model calls.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_SHARED_ENTRIES):
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._max_entries = max(1, max_entries)
+        self._key_locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._stats = {"computed": 0, "shared": 0}
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._stats["shared"] += 1
+                return self._entries[key]
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> tuple[Any, bool]:
+        """Return ``(value, shared)``; ``shared`` is False if this call computed it."""
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            value = self.get(key)
+            if value is not None:
+                return value, True
+            try:
+                value = compute()
+                self.put(key, value)
+                with self._lock:
+                    self._stats["computed"] += 1
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+        return value, False
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._stats, "entries": len(self._entries)}
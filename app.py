@@ -21,16 +21,52 @@ All outputs are subject to AlphaGenome Output Terms of Use.
 
 import streamlit as st
 import json
-import base64
-from datetime import datetime
+import os
+import tempfile
+import time
 
-# AlphaGenome SDK imports (conditionally imported)
-try:
-    from alphagenome.data import genome
-    from alphagenome.models import dna_client
-    ALPHAGENOME_AVAILABLE = True
-except ImportError:
-    ALPHAGENOME_AVAILABLE = False
+import numpy as np
+
+from alphagenome_ui.backends import DEFAULT_BACKEND, get_backend
+from alphagenome_ui.batch import (
+    DEFAULT_CONCURRENCY,
+    MAX_CONCURRENCY,
+    BatchResultWriter,
+    iter_variant_records,
+    open_text_stream,
+    run_bounded,
+)
+from alphagenome_ui.client_pool import ClientPool, hash_api_key
+from alphagenome_ui.analysis import Analyzer
+from alphagenome_ui.comparison import comparison_table
+from alphagenome_ui.export import EXPORT_FORMATS, available_formats, export_result
+from alphagenome_ui.assets import STYLE_BLOCK
+from alphagenome_ui.fasta import FastaRecord, iter_fasta_records, open_binary_stream
+from alphagenome_ui.i18n import OUTPUT_TYPES, TISSUES, get_translation
+from alphagenome_ui.jobs import ACTIVE_STATES, DONE, JobManager, report_progress
+from alphagenome_ui.metrics import MetricsRegistry
+from alphagenome_ui.mutagenesis import (
+    ALLELES,
+    DEFAULT_MUTAGENESIS_CONTEXT,
+    DEFAULT_MUTAGENESIS_WIDTH,
+    MAX_MUTAGENESIS_WIDTH,
+    reduce_tracks,
+)
+from alphagenome_ui.packed_sequence import PackedSequence
+from alphagenome_ui.plotting import DECIMATION_METHODS, MAX_PLOT_TRACKS, render_heatmap_png, render_tracks_png
+from alphagenome_ui.scan import DEFAULT_SCAN_STRIDE, DEFAULT_SCAN_WINDOW, iter_bed_regions
+from alphagenome_ui.scheduler import BATCH, RequestScheduler
+from alphagenome_ui.scoring import DEFAULT_TOP_K, SCORE_METRICS, rank_tracks
+from alphagenome_ui.sequence import ingest_sequence
+from alphagenome_ui.tiling import ALIGNMENT, DEFAULT_OVERLAP, SUPPORTED_LENGTHS, plan_tiles
+from alphagenome_ui.variants import SharedPredictionCache
+from alphagenome_ui.result_cache import ResultCache
+from alphagenome_ui.result_store import ResultStore
+
+# Model backend: the AlphaGenome SDK unless ALPHAGENOME_BACKEND selects another
+# (e.g. ``mock`` for the offline stand-in)
+BACKEND = get_backend()
+ALPHAGENOME_AVAILABLE = BACKEND.available
 
 # =============================================================================
 # PAGE CONFIGURATION
@@ -43,357 +79,285 @@ st.set_page_config(
 )
 
 # =============================================================================
-# TRANSLATIONS
+# CONSTANTS
 # =============================================================================
-TRANSLATIONS = {
-    "tr": {
-        "title": "🧬 AlphaGenome DNA Analiz Aracı",
-        "subtitle": "Google DeepMind AlphaGenome modeli ile genomik analizler",
-        "api_key": "API Anahtarı",
-        "api_key_placeholder": "AlphaGenome API anahtarınızı girin",
-        "api_key_help": "API anahtarınızı [AlphaGenome Portal](https://deepmind.google.com/science/alphagenome) adresinden alabilirsiniz.",
-        "language": "Dil",
-        "sequence_analysis": "Sekans Analizi",
-        "variant_analysis": "Varyant Tahmini",
-        "interval_analysis": "Bölge Analizi",
-        "sequence": "DNA Sekansı",
-        "sequence_placeholder": "DNA sekansınızı girin (A, T, G, C, N)...",
-        "sequence_length": "Sekans Uzunluğu",
-        "min_length_warning": "⚠️ Minimum 16,384 baz çifti gerekli",
-        "organism": "Organizma",
-        "human": "İnsan",
-        "mouse": "Fare",
-        "tissue": "Doku/Hücre Tipi",
-        "output_type": "Çıktı Türü",
-        "chromosome": "Kromozom",
-        "position": "Pozisyon",
-        "reference": "Referans Baz",
-        "alternate": "Alternatif Baz",
-        "start": "Başlangıç",
-        "end": "Bitiş",
-        "analyze": "Analiz Et",
-        "load_example": "Örnek Yükle",
-        "clear": "Temizle",
-        "results": "Sonuçlar",
-        "download_json": "JSON İndir",
-        "analyzing": "Analiz yapılıyor...",
-        "error": "Hata",
-        "success": "Başarılı",
-        "no_api_key": "Lütfen önce API anahtarınızı girin",
-        "developer": "Geliştirici",
-        "contribute": "Katkıda Bulunun",
-        "contribute_text": "Bilimin gelişimini hızlandırmak için bu projeye katkıda bulunabilirsiniz. Kollektif bilime inanıyoruz!",
-        "non_commercial": "⚠️ Ticari amaçlar için kullanılamaz. Yalnızca akademik ve araştırma amaçlıdır.",
-        "sdk_not_installed": "⚠️ AlphaGenome SDK yüklü değil. Lütfen `pip install git+https://github.com/google-deepmind/alphagenome.git` komutu ile yükleyin.",
-    },
-    "en": {
-        "title": "🧬 AlphaGenome DNA Analysis Tool",
-        "subtitle": "Genomic analysis with Google DeepMind AlphaGenome model",
-        "api_key": "API Key",
-        "api_key_placeholder": "Enter your AlphaGenome API key",
-        "api_key_help": "Get your API key from [AlphaGenome Portal](https://deepmind.google.com/science/alphagenome).",
-        "language": "Language",
-        "sequence_analysis": "Sequence Analysis",
-        "variant_analysis": "Variant Prediction",
-        "interval_analysis": "Region Analysis",
-        "sequence": "DNA Sequence",
-        "sequence_placeholder": "Enter your DNA sequence (A, T, G, C, N)...",
-        "sequence_length": "Sequence Length",
-        "min_length_warning": "⚠️ Minimum 16,384 base pairs required",
-        "organism": "Organism",
-        "human": "Human",
-        "mouse": "Mouse",
-        "tissue": "Tissue/Cell Type",
-        "output_type": "Output Type",
-        "chromosome": "Chromosome",
-        "position": "Position",
-        "reference": "Reference Base",
-        "alternate": "Alternate Base",
-        "start": "Start",
-        "end": "End",
-        "analyze": "Analyze",
-        "load_example": "Load Example",
-        "clear": "Clear",
-        "results": "Results",
-        "download_json": "Download JSON",
-        "analyzing": "Analyzing...",
-        "error": "Error",
-        "success": "Success",
-        "no_api_key": "Please enter your API key first",
-        "developer": "Developer",
-        "contribute": "Contribute",
-        "contribute_text": "Contribute to this project to accelerate scientific progress. We believe in collective science!",
-        "non_commercial": "⚠️ Not for commercial use. For academic and research purposes only.",
-        "sdk_not_installed": "⚠️ AlphaGenome SDK not installed. Please run `pip install git+https://github.com/google-deepmind/alphagenome.git`",
-    }
-}
-
-TISSUES = {
-    "UBERON:0002048": {"tr": "Akciğer", "en": "Lung"},
-    "UBERON:0000955": {"tr": "Beyin", "en": "Brain"},
-    "UBERON:0002107": {"tr": "Karaciğer", "en": "Liver"},
-    "UBERON:0002106": {"tr": "Dalak", "en": "Spleen"},
-    "UBERON:0002113": {"tr": "Böbrek", "en": "Kidney"},
-    "UBERON:0000948": {"tr": "Kalp", "en": "Heart"},
-    "UBERON:0001157": {"tr": "Kolon", "en": "Colon"},
-}
-
-OUTPUT_TYPES = {
-    "RNA_SEQ": {"tr": "RNA-seq (Gen Ekspresyonu)", "en": "RNA-seq (Gene Expression)"},
-    "DNASE": {"tr": "DNase-seq (DNA Erişilebilirliği)", "en": "DNase-seq (DNA Accessibility)"},
-    "ATAC": {"tr": "ATAC-seq (Kromatin Erişilebilirliği)", "en": "ATAC-seq (Chromatin Accessibility)"},
-    "CAGE": {"tr": "CAGE-seq (Transkripsiyon Başlangıcı)", "en": "CAGE-seq (Transcription Start)"},
-    "CHIP_HISTONE": {"tr": "ChIP-seq Histon Modifikasyonları", "en": "ChIP-seq Histone Modifications"},
-}
-
 CHROMOSOMES = [f"chr{i}" for i in range(1, 23)] + ["chrX", "chrY"]
 BASES = ["A", "T", "G", "C"]
 
+# Variants per vectorized REF check of an uploaded batch
+REF_CHECK_CHUNK = 10000
+
+# Pasted sequences longer than this are kept only in packed form: the text
+# area is emptied once they are ingested
+SEQUENCE_TEXT_KEEP = 4096
+
 # Example sequence for testing
 EXAMPLE_SEQUENCE = "A" * 8192 + "TGCA" * 2048
 
+COMPOSITION_CHART_SPEC = {
+    "mark": {"type": "line"},
+    "encoding": {
+        "x": {"field": "position", "type": "quantitative", "title": "bp"},
+        "y": {"field": "gc", "type": "quantitative", "title": "GC", "axis": {"format": "%"}},
+    },
+    "height": 150,
+}
+
 # =============================================================================
 # CUSTOM CSS
 # =============================================================================
 def load_css():
-    st.markdown("""
-    <style>
-    /* Dark theme */
-    .stApp {
-        background: linear-gradient(135deg, #0f0f23 0%, #1a1a3e 50%, #0f172a 100%);
-    }
-    
-    /* Header */
-    .main-header {
-        background: linear-gradient(135deg, rgba(99, 102, 241, 0.1), rgba(16, 185, 129, 0.1));
-        border: 1px solid rgba(99, 102, 241, 0.3);
-        border-radius: 16px;
-        padding: 2rem;
-        margin-bottom: 2rem;
-        text-align: center;
-    }
-    
-    .main-header h1 {
-        background: linear-gradient(135deg, #818cf8, #34d399);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 2.5rem;
-        margin-bottom: 0.5rem;
-    }
-    
-    /* Cards */
-    .glass-card {
-        background: rgba(30, 41, 59, 0.8);
-        backdrop-filter: blur(16px);
-        border: 1px solid rgba(99, 102, 241, 0.2);
-        border-radius: 16px;
-        padding: 1.5rem;
-        margin-bottom: 1rem;
-    }
-    
-    /* Footer */
-    .footer {
-        background: rgba(15, 23, 42, 0.9);
-        border-top: 1px solid rgba(99, 102, 241, 0.2);
-        padding: 2rem;
-        margin-top: 3rem;
-        text-align: center;
-        border-radius: 16px;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #6366f1, #10b981);
-        color: white;
-        border: none;
-        border-radius: 12px;
-        padding: 0.75rem 2rem;
-        font-weight: 600;
-        transition: all 0.3s ease;
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 8px 25px rgba(99, 102, 241, 0.4);
-    }
-    
-    /* Inputs */
-    .stTextInput > div > div > input,
-    .stTextArea > div > div > textarea,
-    .stSelectbox > div > div > select {
-        background: rgba(30, 41, 59, 0.8);
-        border: 1px solid rgba(99, 102, 241, 0.3);
-        border-radius: 8px;
-        color: white;
-    }
-    
-    /* Success/Error messages */
-    .success-box {
-        background: rgba(16, 185, 129, 0.2);
-        border: 1px solid rgba(16, 185, 129, 0.5);
-        border-radius: 12px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-    
-    .error-box {
-        background: rgba(239, 68, 68, 0.2);
-        border: 1px solid rgba(239, 68, 68, 0.5);
-        border-radius: 12px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
-    
-    /* DNA animation */
-    @keyframes pulse {
-        0%, 100% { opacity: 0.5; }
-        50% { opacity: 1; }
-    }
-    
-    .dna-icon {
-        animation: pulse 2s ease-in-out infinite;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    """Inject the app stylesheet, read and minified once per process."""
+    st.markdown(STYLE_BLOCK, unsafe_allow_html=True)
 
 # =============================================================================
 # HELPER FUNCTIONS
 # =============================================================================
-def get_translation(key: str, lang: str = "tr") -> str:
-    """Get translation for a key."""
-    return TRANSLATIONS.get(lang, TRANSLATIONS["tr"]).get(key, key)
-
 def t(key: str) -> str:
     """Shorthand for getting translation with current language."""
     return get_translation(key, st.session_state.get("language", "tr"))
 
 def validate_sequence(sequence: str) -> bool:
     """Validate DNA sequence contains only valid characters."""
-    valid_chars = set("ATGCN")
-    return all(c.upper() in valid_chars for c in sequence.replace(" ", "").replace("\n", ""))
-
-def get_output_type_enum(output_type: str):
-    """Get the AlphaGenome OutputType enum value."""
-    if ALPHAGENOME_AVAILABLE:
-        type_map = {
-            "RNA_SEQ": dna_client.OutputType.RNA_SEQ,
-            "DNASE": dna_client.OutputType.DNASE,
-            "ATAC": dna_client.OutputType.ATAC,
-            "CAGE": dna_client.OutputType.CAGE,
-            "CHIP_HISTONE": dna_client.OutputType.CHIP_HISTONE,
-        }
-        return type_map.get(output_type, dna_client.OutputType.RNA_SEQ)
-    return None
-
-def create_download_link(data: dict, filename: str) -> str:
-    """Create a download link for JSON data."""
-    json_str = json.dumps(data, indent=2, default=str)
-    b64 = base64.b64encode(json_str.encode()).decode()
-    return f'<a href="data:application/json;base64,{b64}" download="{filename}" class="download-btn">📥 {t("download_json")}</a>'
+    return ingest_sequence(sequence).is_valid
 
-# =============================================================================
-# ANALYSIS FUNCTIONS
-# =============================================================================
-def analyze_sequence(api_key: str, sequence: str, organism: str, tissue: str, output_type: str):
-    """Perform DNA sequence analysis."""
-    try:
-        model = dna_client.create(api_key)
-        
-        outputs = model.predict_sequence(
-            sequence=sequence,
-            organism=organism,
-            ontology_terms=[tissue],
-            requested_outputs=[get_output_type_enum(output_type)],
-        )
-        
-        result = {
-            "type": "sequence",
-            "sequence_length": len(sequence),
-            "organism": organism,
-            "tissue": tissue,
-            "output_type": output_type,
-            "data_shape": str(getattr(outputs, output_type.lower(), outputs).values.shape) if hasattr(outputs, output_type.lower()) else "N/A",
-            "timestamp": datetime.now().isoformat(),
-        }
-        
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
-
-def analyze_variant(api_key: str, chromosome: str, position: int, ref: str, alt: str, tissue: str, output_type: str):
-    """Perform variant effect prediction."""
-    try:
-        model = dna_client.create(api_key)
-        
-        # Create interval around variant (need context)
-        interval = genome.Interval(
-            chromosome=chromosome,
-            start=max(0, position - 500000),
-            end=position + 500000
-        )
-        
-        variant = genome.Variant(
-            chromosome=chromosome,
-            position=position,
-            reference_bases=ref,
-            alternate_bases=alt,
-        )
-        
-        outputs = model.predict_variant(
-            interval=interval,
-            variant=variant,
-            ontology_terms=[tissue],
-            requested_outputs=[get_output_type_enum(output_type)],
-        )
-        
-        result = {
-            "type": "variant",
-            "chromosome": chromosome,
-            "position": position,
-            "reference": ref,
-            "alternate": alt,
-            "tissue": tissue,
-            "output_type": output_type,
-            "ref_shape": str(outputs.reference.rna_seq.values.shape) if hasattr(outputs.reference, 'rna_seq') else "N/A",
-            "alt_shape": str(outputs.alternate.rna_seq.values.shape) if hasattr(outputs.alternate, 'rna_seq') else "N/A",
-            "timestamp": datetime.now().isoformat(),
-        }
-        
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
-
-def analyze_interval(api_key: str, chromosome: str, start: int, end: int, tissue: str, output_type: str):
-    """Perform genomic interval analysis."""
-    try:
-        model = dna_client.create(api_key)
-        
-        interval = genome.Interval(
-            chromosome=chromosome,
-            start=start,
-            end=end
+def load_fasta_records(uploaded) -> list:
+    """Parse an uploaded FASTA file once and keep its records, 2-bit packed, for later reruns."""
+    if uploaded is None:
+        st.session_state.pop("fasta_records", None)
+        return []
+    cached = st.session_state.get("fasta_records")
+    if cached is not None and cached[0] == uploaded.file_id:
+        return cached[1]
+    records = [
+        FastaRecord(record.name, PackedSequence.pack(record.sequence))
+        for record in iter_fasta_records(open_binary_stream(uploaded, uploaded.name))
+    ]
+    st.session_state["fasta_records"] = (uploaded.file_id, records)
+    return records
+
+def render_downloads(result: dict, filename: str):
+    """Render the JSON summary download and one binary track download per format."""
+    formats = available_formats()
+    columns = st.columns(len(formats) + 1)
+    with columns[0]:
+        st.download_button(
+            f"📥 {t('download_json')}",
+            data=json.dumps(result["data"], indent=2, default=str),
+            file_name=f"{filename}.json",
+            mime="application/json",
+            on_click="ignore",
+            key=f"{filename}_json"
         )
-        
-        outputs = model.predict_interval(
-            interval=interval,
-            ontology_terms=[tissue],
-            requested_outputs=[get_output_type_enum(output_type)],
+    for column, fmt in zip(columns[1:], formats):
+        spec = EXPORT_FORMATS[fmt]
+        with column:
+            # Deferred: the file is written once per result and read only on click
+            st.download_button(
+                f"📦 {spec['label']}",
+                data=lambda fmt=fmt: export_result(result, fmt, result["key"]).read_bytes(),
+                file_name=f"{filename}.{spec['extension']}",
+                mime=spec["mime"],
+                on_click="ignore",
+                key=f"{filename}_{fmt}"
+            )
+
+def render_result(result: dict, filename: str):
+    """Render a single analysis result with its downloads."""
+    if result["success"]:
+        with get_metrics().timed("render_result", kind=result["data"]["type"]):
+            st.success(f"✅ {t('success')}")
+            if result.get("cached"):
+                st.caption(t("cached_result"))
+            if result["data"].get("reference_shared"):
+                st.caption(t("reference_shared"))
+            if result["data"].get("context_flanks"):
+                left, right = result["data"]["context_flanks"]
+                st.caption(f"{t('context_flanks')}: {left:,} / {right:,} bp")
+            predictions = result["data"].get("predictions", [])
+            if len(predictions) > 1:
+                metric = "max_abs_delta" if result["data"]["type"] == "variant" else "mean"
+                st.markdown(f"#### {t('comparison')} ({metric})")
+                st.dataframe(comparison_table(predictions, metric), use_container_width=True)
+            if result.get("scores"):
+                render_top_tracks(result)
+            render_track_plot_panel(result)
+            st.json(result["data"], expanded=len(predictions) <= 1)
+            render_downloads(result, filename)
+    else:
+        st.error(f"❌ {t('error')}: {result['error']}")
+
+@st.fragment
+def render_top_tracks(result: dict):
+    """Rank the most affected tracks of a variant result across all tissues and outputs."""
+    prefix = f"top_{result['key'][:16]}"
+    st.markdown(f"#### 🎯 {t('top_tracks')}")
+    col_metric, col_k = st.columns([3, 1])
+    metric = col_metric.selectbox(t("score_metric"), options=SCORE_METRICS, key=f"{prefix}_metric")
+    k = col_k.number_input(t("top_k"), min_value=1, max_value=500, value=DEFAULT_TOP_K, key=f"{prefix}_k")
+    names = {key: result["track_names"].get(f"{key}/reference", []) for key in result["scores"]}
+    ranked = rank_tracks(result["scores"], names, metric, int(k))
+    st.dataframe(ranked, use_container_width=True, hide_index=True)
+
+def track_plot_groups(result: dict) -> dict:
+    """Group result tracks for plotting: ``{label: [(series label, track key), ...]}``.
+    
+    Variant alleles of the same (output type, tissue) share one plot.
+    """
+    groups = {}
+    for key in result["tracks"]:
+        base, _, allele = key.rpartition("/")
+        if result["data"]["type"] == "variant" and allele in ("reference", "alternate"):
+            groups.setdefault(base, []).append((allele, key))
+        else:
+            groups[key] = [("", key)]
+    return groups
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_track_plot(result_key: str, group: str, columns: tuple, view: tuple, method: str, _result: dict) -> bytes:
+    """Decimate and draw one track group; cached by result, group, tracks and view range."""
+    series_keys = track_plot_groups(_result)[group]
+    first = series_keys[0][1]
+    with get_metrics().timed("plot", kind=_result["data"]["type"], method=method):
+        return render_tracks_png(
+            [(label, _result["tracks"][key]) for label, key in series_keys],
+            list(_result.get("track_names", {}).get(first, [])),
+            list(columns),
+            int(_result.get("resolutions", {}).get(first, 1)),
+            int(_result["data"].get("start", _result["data"].get("context_start", 0))),
+            view,
+            method,
         )
-        
-        result = {
-            "type": "interval",
-            "chromosome": chromosome,
-            "start": start,
-            "end": end,
-            "tissue": tissue,
-            "output_type": output_type,
-            "data_shape": str(outputs.rna_seq.values.shape) if hasattr(outputs, 'rna_seq') else "N/A",
-            "timestamp": datetime.now().isoformat(),
-        }
-        
-        return {"success": True, "data": result}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+
+@st.fragment
+def render_track_plot_panel(result: dict):
+    """Plot decimated tracks of a result; zooming and panning rerun only this panel."""
+    groups = track_plot_groups(result)
+    if not groups:
+        return
+    prefix = f"plot_{result['key'][:16]}"
+    st.markdown(f"#### 📉 {t('track_view')}")
+    col_group, col_method = st.columns([3, 1])
+    group = col_group.selectbox(t("track_group"), options=list(groups), key=f"{prefix}_group")
+    method = col_method.radio(
+        t("decimation"),
+        options=DECIMATION_METHODS,
+        format_func=lambda x: "min/max" if x == "minmax" else "LTTB",
+        horizontal=True,
+        key=f"{prefix}_method"
+    )
+    
+    first = groups[group][0][1]
+    values = result["tracks"][first]
+    names = list(result.get("track_names", {}).get(first, [])) or [str(i) for i in range(values.shape[1])]
+    columns = st.multiselect(
+        t("tracks"),
+        options=list(range(len(names))),
+        default=list(range(min(4, len(names)))),
+        format_func=lambda i: names[i],
+        max_selections=MAX_PLOT_TRACKS,
+        key=f"{prefix}_{group}_tracks"
+    )
+    
+    resolution = int(result.get("resolutions", {}).get(first, 1))
+    origin = int(result["data"].get("start", result["data"].get("context_start", 0)))
+    end = origin + values.shape[0] * resolution
+    view = st.slider(
+        t("view_range"),
+        min_value=origin,
+        max_value=end,
+        value=(origin, end),
+        step=resolution,
+        key=f"{prefix}_{group}_view"
+    )
+    if columns:
+        st.image(render_track_plot(result["key"], group, tuple(columns), tuple(view), method, result), use_container_width=True)
+
+@st.cache_resource
+def get_client_pool() -> ClientPool:
+    """Process-wide AlphaGenome client pool shared across reruns and sessions."""
+    return ClientPool(BACKEND.create_client)
+
+def get_scheduler() -> RequestScheduler:
+    """Process-wide scheduler for every model call: per-key rate limits, retries, priorities, coalescing."""
+    return get_analyzer().scheduler
+
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """Process-wide prediction result cache (memory LRU + disk)."""
+    return ResultCache()
+
+@st.cache_resource
+def get_reference_predictions() -> SharedPredictionCache:
+    """Reference predictions per variant context window, shared by nearby variants."""
+    return SharedPredictionCache()
+
+@st.cache_resource
+def get_result_store() -> ResultStore:
+    """Finished results shared by all sessions, isolated per API key and bounded by a RAM budget."""
+    return ResultStore()
+
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """Process-wide background job runner; jobs outlive reruns and page reloads."""
+    return JobManager(store=get_result_store())
+
+@st.cache_resource
+def get_metrics() -> MetricsRegistry:
+    """Process-wide stage timings, exported as JSON logs and Prometheus metrics."""
+    return MetricsRegistry()
+
+@st.cache_resource
+def get_analyzer() -> Analyzer:
+    """Process-wide analysis core wired to the app's shared pool, caches and metrics."""
+    return Analyzer(
+        backend=BACKEND,
+        client_pool=get_client_pool(),
+        result_cache=get_result_cache(),
+        reference_predictions=get_reference_predictions(),
+        metrics=get_metrics(),
+    )
+
+# =============================================================================
+# BACKGROUND JOBS
+# =============================================================================
+JOB_POLL_INTERVAL = 2.0
+
+def submit_job(slot: str, api_key: str, fn, *args, **kwargs):
+    """Run ``fn(api_key, *args)`` in the background and attach its job to ``slot``."""
+    job_id = get_job_manager().submit(fn, api_key, *args, kind=slot, owner=hash_api_key(api_key), **kwargs)
+    # Query params survive page reloads, session state survives reruns
+    st.session_state[f"job_{slot}"] = job_id
+    st.query_params[f"job_{slot}"] = job_id
+
+def render_job(slot: str, api_key: str, render_fn):
+    """Show the progress or the result of the job attached to ``slot``."""
+    job_id = st.session_state.get(f"job_{slot}") or st.query_params.get(f"job_{slot}")
+    if not job_id or not api_key:
+        return
+    owner = hash_api_key(api_key)
+    job = get_job_manager().status(job_id, owner)
+    if job is None:
+        return
+    st.session_state[f"job_{slot}"] = job_id
+    if job["status"] in ACTIVE_STATES:
+        poll_job(job_id, owner)
+    elif job["status"] == DONE:
+        result = get_job_manager().result(job_id, owner)
+        if result is not None:
+            render_fn(result)
+    elif job.get("error"):
+        st.error(f"❌ {t('job_failed')}: {job['error']}")
+    else:
+        st.warning(t("job_interrupted"))
+
+@st.fragment(run_every=JOB_POLL_INTERVAL)
+def poll_job(job_id: str, owner: str):
+    """Poll a running job without re-executing the rest of the page."""
+    job = get_job_manager().status(job_id, owner)
+    if job is None or job["status"] not in ACTIVE_STATES:
+        st.rerun()
+    st.progress(job["progress"], text=f"{t('analyzing')} {job['message']}")
 
 # =============================================================================
 # UI COMPONENTS
@@ -423,6 +387,14 @@ def render_sidebar():
             label_visibility="collapsed"
         )
         st.markdown(t("api_key_help"))
+        if BACKEND.name != DEFAULT_BACKEND:
+            st.info(t("backend_active").format(name=BACKEND.name))
+        
+        st.markdown("---")
+        
+        # Diagnostics
+        if st.toggle(f"📈 {t('diagnostics')}", key="show_diagnostics"):
+            render_diagnostics()
         
         st.markdown("---")
         
@@ -444,6 +416,34 @@ def render_sidebar():
         
         return api_key
 
+def render_diagnostics():
+    """Render per-stage timings and the metrics exports."""
+    metrics = get_metrics()
+    rows = metrics.summary()
+    if rows:
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+    else:
+        st.caption(t("no_timings"))
+    st.download_button(
+        f"📥 {t('download_metrics')}",
+        data=metrics.prometheus_text,
+        file_name="alphagenome_ui.prom",
+        mime="text/plain",
+        on_click="ignore",
+        key="download_metrics",
+    )
+    st.caption(f"{t('metrics_files')}: `{metrics.prometheus_path}`, `{metrics.log_path}`")
+    st.markdown(f"**{t('scheduler')}**")
+    st.dataframe([get_scheduler().stats()], hide_index=True, use_container_width=True)
+    st.markdown(f"**{t('result_store')}**")
+    st.dataframe([get_result_store().stats()], hide_index=True, use_container_width=True)
+    st.markdown(f"**{t('track_store')}**")
+    st.dataframe([get_analyzer().track_store.stats()], hide_index=True, use_container_width=True)
+    reference = get_analyzer().reference
+    if reference is not None:
+        st.markdown(f"**{t('reference_genome')}**")
+        st.dataframe([reference.stats()], hide_index=True, use_container_width=True)
+
 def render_header():
     """Render the main header."""
     st.markdown(f"""
@@ -453,34 +453,78 @@ def render_header():
     </div>
     """, unsafe_allow_html=True)
 
+def ingest_sequence_input():
+    """Normalize, validate and hash the sequence text area; runs only when it changes."""
+    with get_metrics().timed("ingest", kind="sequence"):
+        st.session_state["sequence_report"] = ingest_sequence(st.session_state.get("sequence_input_area", ""))
+
+def on_sequence_input_change():
+    """Ingest the edited text area, then drop long raw text so only its packed copy stays in session state."""
+    ingest_sequence_input()
+    if len(st.session_state.get("sequence_input_area", "")) > SEQUENCE_TEXT_KEEP:
+        st.session_state["sequence_input_area"] = ""
+
+def set_sequence_input(text: str):
+    """Replace the sequence text area's content (example/clear buttons)."""
+    st.session_state["sequence_input_area"] = text
+    on_sequence_input_change()
+
 def render_sequence_tab(api_key: str):
     """Render the sequence analysis tab."""
     col1, col2 = st.columns([2, 1])
     
-    # Initialize sequence in session state if needed
-    if "seq_text" not in st.session_state:
-        st.session_state["seq_text"] = ""
-    
     with col1:
-        sequence = st.text_area(
+        # Keyed without ``value`` so the text is not re-sent to the browser on every rerun
+        st.text_area(
             t("sequence"),
-            value=st.session_state.get("seq_text", ""),
             placeholder=t("sequence_placeholder"),
             height=200,
-            key="sequence_input_area"
+            key="sequence_input_area",
+            on_change=on_sequence_input_change
         )
         
-        # Update session state
-        st.session_state["seq_text"] = sequence
+        # Normalized, hashed input; re-ingested only when the text changes
+        if "sequence_report" not in st.session_state:
+            ingest_sequence_input()
+        report = st.session_state["sequence_report"]
         
         # Show sequence length
-        if sequence:
-            clean_seq = sequence.replace(" ", "").replace("\n", "")
-            length = len(clean_seq)
+        if report.length:
+            if not st.session_state.get("sequence_input_area"):
+                st.caption(t("sequence_packed"))
+            length = report.length
             if length < 16384:
                 st.warning(f"{t('sequence_length')}: {length:,} bp - {t('min_length_warning')}")
             else:
                 st.success(f"{t('sequence_length')}: {length:,} bp ✓")
+            if not report.is_valid:
+                st.error(f"{t('invalid_sequence')}: {report.invalid_summary()}")
+            with st.expander(f"📈 {t('composition')}"):
+                col_gc, col_n = st.columns(2)
+                col_gc.metric("GC", f"{report.gc_fraction:.1%}")
+                col_n.metric("N", f"{report.n_fraction:.1%}")
+                st.caption(f"{t('window_gc')} ({report.window_size:,} bp)")
+                # Static Vega-Lite spec: st.line_chart rebuilds an Altair chart on every rerun
+                st.vega_lite_chart(
+                    {"position": np.arange(report.window_gc.size) * report.window_size, "gc": report.window_gc},
+                    COMPOSITION_CHART_SPEC,
+                    use_container_width=True
+                )
+                st.caption(f"SHA-256: `{report.digest[:16]}…`")
+        
+        uploaded = st.file_uploader(
+            t("upload_fasta"),
+            type=["fa", "fasta", "fna", "fas", "gz", "txt"],
+            key="fasta_upload"
+        )
+        records = load_fasta_records(uploaded)
+        if records:
+            st.caption(f"{len(records):,} {t('fasta_records')}")
+            st.dataframe(
+                [{t("record"): r.name or "-", t("sequence_length"): len(r)} for r in records],
+                hide_index=True,
+                use_container_width=True
+            )
     
     with col2:
         organism = st.selectbox(
@@ -490,48 +534,78 @@ def render_sequence_tab(api_key: str):
         )
         
         tissue_options = list(TISSUES.keys())
-        tissue = st.selectbox(
+        tissues = st.multiselect(
             t("tissue"),
             options=tissue_options,
-            format_func=lambda x: TISSUES[x][st.session_state.get("language", "tr")]
+            default=tissue_options[:1],
+            format_func=lambda x: TISSUES[x][st.session_state.get("language", "tr")],
+            key="sequence_tissues"
         )
         
         output_options = list(OUTPUT_TYPES.keys())
-        output_type = st.selectbox(
+        output_types = st.multiselect(
             t("output_type"),
             options=output_options,
-            format_func=lambda x: OUTPUT_TYPES[x][st.session_state.get("language", "tr")]
+            default=output_options[:1],
+            format_func=lambda x: OUTPUT_TYPES[x][st.session_state.get("language", "tr")],
+            key="sequence_outputs"
         )
         
         col_btn1, col_btn2 = st.columns(2)
         with col_btn1:
-            if st.button(t("load_example"), key="seq_example"):
-                st.session_state["seq_text"] = EXAMPLE_SEQUENCE
-                st.rerun()
+            st.button(t("load_example"), key="seq_example", on_click=set_sequence_input, args=(EXAMPLE_SEQUENCE,))
         with col_btn2:
-            if st.button(t("clear"), key="seq_clear"):
-                st.session_state["seq_text"] = ""
-                st.rerun()
+            st.button(t("clear"), key="seq_clear", on_click=set_sequence_input, args=("",))
     
     if st.button(t("analyze"), key="analyze_sequence", type="primary", use_container_width=True):
         if not api_key:
             st.error(t("no_api_key"))
-        elif not sequence or len(sequence.replace(" ", "").replace("\n", "")) < 16384:
+        elif not tissues or not output_types:
+            st.error(t("select_tissue_output"))
+        elif not ALPHAGENOME_AVAILABLE:
+            st.error(t("sdk_not_installed"))
+        elif records:
+            jobs = []
+            for index, record in enumerate(records):
+                label = f"{t('record')} {index + 1}: {record.name or '-'} ({len(record):,} bp)"
+                record_report = ingest_sequence(record.sequence)
+                if record_report.length < 16384:
+                    st.error(f"{label} - {t('min_length_warning')}")
+                elif not record_report.is_valid:
+                    st.error(f"{label} - {t('invalid_sequence')}: {record_report.invalid_summary()}")
+                else:
+                    jobs.append((index, label, record))
+            if jobs:
+                submit_job("sequence", api_key, analyze_fasta_records, jobs, organism, tissues, output_types)
+        elif report.length < 16384:
             st.error(t("min_length_warning"))
-        elif not validate_sequence(sequence):
-            st.error("Invalid DNA sequence")
+        elif not report.is_valid:
+            st.error(f"{t('invalid_sequence')}: {report.invalid_summary()}")
         else:
-            if ALPHAGENOME_AVAILABLE:
-                with st.spinner(t("analyzing")):
-                    result = analyze_sequence(api_key, sequence.replace(" ", "").replace("\n", ""), organism, tissue, output_type)
-                    if result["success"]:
-                        st.success(f"✅ {t('success')}")
-                        st.json(result["data"])
-                        st.markdown(create_download_link(result["data"], "sequence_analysis.json"), unsafe_allow_html=True)
-                    else:
-                        st.error(f"❌ {t('error')}: {result['error']}")
-            else:
-                st.error(t("sdk_not_installed"))
+            submit_job("sequence", api_key, get_analyzer().analyze_sequence, report.packed, organism, tissues, output_types)
+    
+    render_job("sequence", api_key, render_sequence_results)
+
+def analyze_fasta_records(api_key: str, jobs: list, organism: str, tissues: list, output_types: list):
+    """Run one sequence prediction per FASTA record; returns ``[(label, result), ...]``."""
+    def run(job):
+        index, label, record = job
+        return get_analyzer().analyze_sequence(api_key, record.sequence, organism, tissues, output_types, priority=BATCH)
+    
+    results = {}
+    for done, (job, result) in enumerate(run_bounded(jobs, run), start=1):
+        results[job[0]] = (job[1], result)
+        report_progress(done / len(jobs), f"{done}/{len(jobs)}")
+    return [results[index] for index in sorted(results)]
+
+def render_sequence_results(results):
+    """Render a sequence job: a single result or one expander per FASTA record."""
+    if isinstance(results, dict):
+        render_result(results, "sequence_analysis")
+        return
+    for index, (label, result) in enumerate(results):
+        with st.expander(label, expanded=len(results) == 1):
+            render_result(result, f"sequence_analysis_{index + 1}")
 
 def render_variant_tab(api_key: str):
     """Render the variant analysis tab."""
@@ -544,22 +618,29 @@ def render_variant_tab(api_key: str):
     with col2:
         ref = st.selectbox(t("reference"), options=BASES)
         alt = st.selectbox(t("alternate"), options=BASES, index=1)
+        reference = get_analyzer().reference
+        if reference is not None and chromosome in reference and position <= reference.length(chromosome):
+            st.caption(f"{t('reference_genome')} ({reference.name}): {reference.fetch(chromosome, position - 1, position).decode()}")
+        elif reference is None:
+            st.caption(t("reference_sharing_hint"))
     
     with col3:
         tissue_options = list(TISSUES.keys())
-        tissue = st.selectbox(
+        tissues = st.multiselect(
             t("tissue"),
             options=tissue_options,
+            default=tissue_options[:1],
             format_func=lambda x: TISSUES[x][st.session_state.get("language", "tr")],
-            key="variant_tissue"
+            key="variant_tissues"
         )
         
         output_options = list(OUTPUT_TYPES.keys())
-        output_type = st.selectbox(
+        output_types = st.multiselect(
             t("output_type"),
             options=output_options,
+            default=output_options[:1],
             format_func=lambda x: OUTPUT_TYPES[x][st.session_state.get("language", "tr")],
-            key="variant_output"
+            key="variant_outputs"
         )
     
     if st.button(t("load_example"), key="variant_example"):
@@ -570,18 +651,193 @@ def render_variant_tab(api_key: str):
             st.error(t("no_api_key"))
         elif ref == alt:
             st.error("Reference and alternate bases must be different")
+        elif not tissues or not output_types:
+            st.error(t("select_tissue_output"))
+        elif not ALPHAGENOME_AVAILABLE:
+            st.error(t("sdk_not_installed"))
+        elif reference is not None and (mismatch := reference.check_ref(chromosome, position, ref)):
+            st.error(mismatch)
         else:
-            if ALPHAGENOME_AVAILABLE:
-                with st.spinner(t("analyzing")):
-                    result = analyze_variant(api_key, chromosome, position, ref, alt, tissue, output_type)
-                    if result["success"]:
-                        st.success(f"✅ {t('success')}")
-                        st.json(result["data"])
-                        st.markdown(create_download_link(result["data"], "variant_analysis.json"), unsafe_allow_html=True)
-                    else:
-                        st.error(f"❌ {t('error')}: {result['error']}")
-            else:
-                st.error(t("sdk_not_installed"))
+            submit_job("variant", api_key, get_analyzer().analyze_variant, chromosome, position, ref, alt, tissues, output_types)
+    
+    render_job("variant", api_key, lambda result: render_result(result, "variant_analysis"))
+    
+    with st.expander(f"📄 {t('batch_variants')}"):
+        render_variant_batch(api_key, tissues, output_types)
+    
+    with st.expander(f"🧪 {t('mutagenesis')}"):
+        render_mutagenesis(api_key, chromosome, position, tissues, output_types)
+
+def render_variant_batch(api_key: str, tissues: list, output_types: list):
+    """Render batch scoring of an uploaded VCF/TSV variant panel."""
+    uploaded = st.file_uploader(
+        t("upload_variants"),
+        type=["vcf", "tsv", "txt", "gz"],
+        key="variant_batch_file"
+    )
+    concurrency = st.slider(
+        t("concurrency"),
+        min_value=1,
+        max_value=MAX_CONCURRENCY,
+        value=DEFAULT_CONCURRENCY,
+        key="variant_batch_concurrency"
+    )
+    
+    if st.button(t("analyze_batch"), key="analyze_variant_batch", disabled=uploaded is None, use_container_width=True):
+        if not api_key:
+            st.error(t("no_api_key"))
+        elif not tissues or not output_types:
+            st.error(t("select_tissue_output"))
+        elif not ALPHAGENOME_AVAILABLE:
+            st.error(t("sdk_not_installed"))
+        else:
+            submit_job("variant_batch", api_key, run_variant_batch, uploaded, tissues, output_types, concurrency)
+    
+    render_job("variant_batch", api_key, render_variant_batch_result)
+
+def run_variant_batch(api_key: str, uploaded, tissues: list, output_types: list, concurrency: int) -> dict:
+    """Score every variant of an uploaded file, appending rows to a TSV as they complete."""
+    fd, path = tempfile.mkstemp(prefix="variant_batch_", suffix=".tsv")
+    os.close(fd)
+    errors = []
+    uploaded.seek(0)
+    # Held so the wrapper is not collected (closing the upload) once the records are read ahead
+    stream = open_text_stream(uploaded, uploaded.name)
+    records = iter_variant_records(stream, errors)
+    reference = get_analyzer().reference
+    
+    def score(checked):
+        record, ref_error = checked
+        if ref_error is not None:
+            return {"success": False, "error": ref_error}
+        return get_analyzer().analyze_variant(api_key, record.chromosome, record.position, record.ref, record.alt, tissues, output_types, priority=BATCH)
+    
+    with BatchResultWriter(path) as writer:
+        for (record, _), result in run_bounded(iter_ref_checked(records, reference), score, max_workers=concurrency):
+            writer.write(record, result)
+            # Uploads are consumed as a stream, so progress is measured in bytes read.
+            report_progress(uploaded.tell() / max(uploaded.size, 1), f"{writer.rows_written:,}")
+    
+    return {
+        "path": path,
+        "variants": writer.rows_written,
+        "failed": writer.failures,
+        "skipped_lines": len(errors),
+    }
+
+def iter_ref_checked(records, reference):
+    """Pair each record with its REF check error (None if it matches or no genome is set), a chunk at a time."""
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= REF_CHECK_CHUNK:
+            yield from _ref_checked(chunk, reference)
+            chunk = []
+    yield from _ref_checked(chunk, reference)
+
+def _ref_checked(chunk: list, reference):
+    if reference is None:
+        errors = [None] * len(chunk)
+    else:
+        errors = reference.check_refs((r.chromosome, r.position, r.ref) for r in chunk)
+    return zip(chunk, errors)
+
+def render_variant_batch_result(summary: dict):
+    """Render the summary and TSV download of a finished batch job."""
+    if not os.path.exists(summary["path"]):
+        return
+    st.success(f"✅ {t('batch_done')}: {summary['variants']:,} ({t('error')}: {summary['failed']:,}, {t('batch_skipped')}: {summary['skipped_lines']:,})")
+    with open(summary["path"], "rb") as f:
+        st.download_button(
+            f"📥 {t('download_results')}",
+            data=f,
+            file_name="variant_batch_results.tsv",
+            mime="text/tab-separated-values",
+            on_click="ignore",
+            key="variant_batch_download"
+        )
+
+def render_mutagenesis(api_key: str, chromosome: str, position: int, tissues: list, output_types: list):
+    """Render saturation mutagenesis of a small window around the selected position."""
+    reference = get_analyzer().reference
+    if reference is None:
+        st.info(t("mutagenesis_needs_reference"))
+    col1, col2, col3 = st.columns(3)
+    width = col1.number_input(
+        t("mutagenesis_width"),
+        min_value=1,
+        max_value=MAX_MUTAGENESIS_WIDTH,
+        value=DEFAULT_MUTAGENESIS_WIDTH,
+        key="mutagenesis_width"
+    )
+    context_length = col2.selectbox(
+        t("context_length"),
+        options=SUPPORTED_LENGTHS,
+        index=SUPPORTED_LENGTHS.index(DEFAULT_MUTAGENESIS_CONTEXT),
+        format_func=lambda x: f"{x:,} bp",
+        key="mutagenesis_context"
+    )
+    concurrency = col3.slider(
+        t("concurrency"),
+        min_value=1,
+        max_value=MAX_CONCURRENCY,
+        value=DEFAULT_CONCURRENCY,
+        key="mutagenesis_concurrency"
+    )
+    start = max(0, position - 1 - width // 2)
+    st.caption(f"{chromosome}:{start + 1:,}-{start + width:,} · {t('mutations')}: {3 * width:,}")
+    
+    if st.button(t("analyze_mutagenesis"), key="analyze_mutagenesis", disabled=reference is None, use_container_width=True):
+        if not api_key:
+            st.error(t("no_api_key"))
+        elif not tissues or not output_types:
+            st.error(t("select_tissue_output"))
+        elif not ALPHAGENOME_AVAILABLE:
+            st.error(t("sdk_not_installed"))
+        else:
+            submit_job(
+                "mutagenesis", api_key, get_analyzer().saturation_mutagenesis,
+                chromosome, start, start + width, tissues, output_types, context_length, concurrency,
+            )
+    
+    render_job("mutagenesis", api_key, render_mutagenesis_result)
+
+def render_mutagenesis_result(result: dict):
+    """Render the effect heatmap and downloads of a finished mutagenesis job."""
+    if not result["success"]:
+        st.error(f"❌ {t('error')}: {result['error']}")
+        return
+    data = result["data"]
+    st.success(f"✅ {t('success')}: {data['mutations'] - data['failed']:,} / {data['mutations']:,} ({t('error')}: {data['failed']:,})")
+    if result.get("cached"):
+        st.caption(t("cached_result"))
+    render_mutagenesis_heatmap(result)
+    st.json(data, expanded=False)
+    render_downloads(result, "mutagenesis")
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_mutagenesis_plot(result_key: str, block: str, metric: str, track: int, _result: dict) -> bytes:
+    """Reduce one effect matrix to positions × alleles and draw it; cached by result and selection."""
+    data = _result["data"]
+    with get_metrics().timed("plot", kind="mutagenesis"):
+        matrix = reduce_tracks(_result["mutagenesis"][block][metric], None if track < 0 else [track])
+        return render_heatmap_png(matrix, data["reference_bases"], data["window_start"], ALLELES, metric)
+
+@st.fragment
+def render_mutagenesis_heatmap(result: dict):
+    """Heatmap of mutant effects; changing the block, metric or track reruns only this panel."""
+    prefix = f"ism_{result['key'][:16]}"
+    col_block, col_metric, col_track = st.columns([2, 2, 3])
+    block = col_block.selectbox(t("track_group"), options=list(result["mutagenesis"]), key=f"{prefix}_block")
+    metric = col_metric.selectbox(t("score_metric"), options=SCORE_METRICS, key=f"{prefix}_metric")
+    names = list(result["track_names"].get(block, []))
+    track = col_track.selectbox(
+        t("tracks"),
+        options=[-1, *range(len(names))],
+        format_func=lambda i: t("strongest_track") if i < 0 else names[i],
+        key=f"{prefix}_track"
+    )
+    st.image(render_mutagenesis_plot(result["key"], block, metric, track, result), use_container_width=True)
 
 def render_interval_tab(api_key: str):
     """Render the interval analysis tab."""
@@ -591,24 +847,43 @@ def render_interval_tab(api_key: str):
         chromosome = st.selectbox(t("chromosome"), options=CHROMOSOMES, key="interval_chr")
         start = st.number_input(t("start"), min_value=0, value=35677410)
         end = st.number_input(t("end"), min_value=1, value=36725986)
+        reference = get_analyzer().reference
+        if reference is not None and chromosome in reference:
+            st.caption(f"{t('chromosome_length')} ({reference.name}): {reference.length(chromosome):,} bp")
     
     with col2:
         tissue_options = list(TISSUES.keys())
-        tissue = st.selectbox(
+        tissues = st.multiselect(
             t("tissue"),
             options=tissue_options,
+            default=tissue_options[:1],
             format_func=lambda x: TISSUES[x][st.session_state.get("language", "tr")],
-            key="interval_tissue"
+            key="interval_tissues"
         )
         
         output_options = list(OUTPUT_TYPES.keys())
-        output_type = st.selectbox(
+        output_types = st.multiselect(
             t("output_type"),
             options=output_options,
+            default=output_options[:1],
             format_func=lambda x: OUTPUT_TYPES[x][st.session_state.get("language", "tr")],
-            key="interval_output"
+            key="interval_outputs"
         )
         
+        overlap = st.number_input(
+            t("tile_overlap"),
+            min_value=0,
+            max_value=524288,
+            value=DEFAULT_OVERLAP,
+            step=ALIGNMENT * 64,
+            help=t("tile_overlap_help"),
+            key="interval_overlap"
+        )
+        
+        if start < end:
+            tiles = plan_tiles(start, end, overlap)
+            st.caption(f"{t('windows')}: {len(tiles)} × {tiles[0].length:,} bp")
+        
         if st.button(t("load_example"), key="interval_example"):
             st.info("Example: chr22:35677410-36725986 (UBERON:0001157 - Colon)")
     
@@ -617,18 +892,101 @@ def render_interval_tab(api_key: str):
             st.error(t("no_api_key"))
         elif start >= end:
             st.error("Start position must be less than end position")
+        elif not tissues or not output_types:
+            st.error(t("select_tissue_output"))
+        elif not ALPHAGENOME_AVAILABLE:
+            st.error(t("sdk_not_installed"))
+        else:
+            submit_job("interval", api_key, get_analyzer().analyze_interval, chromosome, start, end, tissues, output_types, overlap)
+    
+    render_job("interval", api_key, lambda result: render_result(result, "interval_analysis"))
+    
+    with st.expander(f"🧭 {t('scan_mode')}"):
+        render_interval_scan(api_key, chromosome, start, end, tissues, output_types)
+
+def render_interval_scan(api_key: str, chromosome: str, start: int, end: int, tissues: list, output_types: list):
+    """Render the resumable sliding-window scan over the selected range or a BED upload."""
+    source = st.radio(
+        t("scan_source"),
+        options=("range", "bed"),
+        format_func=lambda x: t("scan_range") if x == "range" else t("scan_bed"),
+        horizontal=True,
+        key="scan_source"
+    )
+    uploaded = None
+    if source == "bed":
+        uploaded = st.file_uploader(t("upload_bed"), type=["bed", "txt", "gz"], key="scan_bed_file")
+    else:
+        st.caption(f"{chromosome}:{start:,}-{end:,}")
+    
+    col_window, col_stride, col_concurrency = st.columns(3)
+    window = col_window.selectbox(
+        t("scan_window"),
+        options=SUPPORTED_LENGTHS,
+        index=SUPPORTED_LENGTHS.index(DEFAULT_SCAN_WINDOW),
+        format_func=lambda x: f"{x:,} bp",
+        key="scan_window"
+    )
+    stride = col_stride.number_input(
+        t("scan_stride"),
+        min_value=ALIGNMENT,
+        value=DEFAULT_SCAN_STRIDE,
+        step=ALIGNMENT * 64,
+        key="scan_stride"
+    )
+    concurrency = col_concurrency.slider(
+        t("concurrency"),
+        min_value=1,
+        max_value=MAX_CONCURRENCY,
+        value=DEFAULT_CONCURRENCY,
+        key="scan_concurrency"
+    )
+    
+    disabled = source == "bed" and uploaded is None
+    if st.button(t("analyze_scan"), key="analyze_scan", disabled=disabled, help=t("scan_resume_help"), use_container_width=True):
+        if not api_key:
+            st.error(t("no_api_key"))
+        elif source == "range" and start >= end:
+            st.error("Start position must be less than end position")
+        elif not tissues or not output_types:
+            st.error(t("select_tissue_output"))
+        elif not ALPHAGENOME_AVAILABLE:
+            st.error(t("sdk_not_installed"))
         else:
-            if ALPHAGENOME_AVAILABLE:
-                with st.spinner(t("analyzing")):
-                    result = analyze_interval(api_key, chromosome, start, end, tissue, output_type)
-                    if result["success"]:
-                        st.success(f"✅ {t('success')}")
-                        st.json(result["data"])
-                        st.markdown(create_download_link(result["data"], "interval_analysis.json"), unsafe_allow_html=True)
-                    else:
-                        st.error(f"❌ {t('error')}: {result['error']}") 
+            if source == "bed":
+                uploaded.seek(0)
+                regions = list(iter_bed_regions(open_text_stream(uploaded, uploaded.name)))
             else:
-                st.error(t("sdk_not_installed"))
+                regions = [(chromosome, int(start), int(end))]
+            submit_job("scan", api_key, get_analyzer().scan, regions, window, stride, tissues, output_types, concurrency)
+    
+    render_job("scan", api_key, render_interval_scan_result)
+
+def render_interval_scan_result(summary: dict):
+    """Render the aggregate table and track download of a finished scan."""
+    if not os.path.exists(summary["path"]):
+        return
+    st.success(f"✅ {t('scan_done')}: {summary['completed']:,} / {summary['windows']:,} ({t('error')}: {summary['failed']:,})")
+    if summary["resumed"]:
+        st.caption(f"{t('scan_resumed')}: {summary['resumed']:,}")
+    for error in summary["errors"]:
+        st.caption(f"⚠️ {error}")
+    st.dataframe(summary["summary"], use_container_width=True, hide_index=True)
+    with open(summary["path"], "rb") as f:
+        st.download_button(
+            f"📥 {t('download_scan')}",
+            data=f,
+            file_name="scan_track.tsv",
+            mime="text/tab-separated-values",
+            on_click="ignore",
+            key="scan_download"
+        )
+
+@st.fragment
+def render_tab_fragment(kind: str, render_fn, api_key: str):
+    """Render a tab as an isolated fragment so its widgets rerun only this tab."""
+    with get_metrics().timed("render_tab", kind=kind):
+        render_fn(api_key)
 
 def render_footer():
     """Render the footer."""
@@ -646,6 +1004,8 @@ def render_footer():
 # =============================================================================
 def main():
     """Main application entry point."""
+    started = time.perf_counter()
+    
     # Load custom CSS
     load_css()
     
@@ -673,16 +1033,18 @@ def main():
     ])
     
     with tab1:
-        render_sequence_tab(api_key)
+        render_tab_fragment("sequence", render_sequence_tab, api_key)
     
     with tab2:
-        render_variant_tab(api_key)
+        render_tab_fragment("variant", render_variant_tab, api_key)
     
     with tab3:
-        render_interval_tab(api_key)
+        render_tab_fragment("interval", render_interval_tab, api_key)
     
     # Render footer
     render_footer()
+    
+    get_metrics().observe("rerun", time.perf_counter() - started, kind="app")
 
 if __name__ == "__main__":
     main()
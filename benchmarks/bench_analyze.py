@@ -0,0 +1,166 @@
+"""
+End-to-end benchmark of the analysis functions against the offline backend.
+
+Runs ``analyze_sequence``, ``analyze_variant`` and ``analyze_interval`` on a
+headless ``Analyzer`` with the mock backend, through the same scheduler, client
+pool and result cache the app uses, and reports throughput, latency percentiles, peak memory,
+cache hit rates and the per-stage timings. Requests are drawn from a pool of ``--unique`` distinct
+inputs so repeats exercise the cache.
+
+    python benchmarks/bench_analyze.py --requests 200 --concurrency 8 --output report.json
+"""
+
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+KINDS = ("sequence", "variant", "interval")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--requests", type=int, default=100, help="requests per kind")
+    parser.add_argument("--unique", type=int, default=25, help="distinct inputs per kind")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock backend latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="mock latency jitter as a fraction")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock failure probability per call")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="scheduler requests/s per API key (0 disables)")
+    parser.add_argument("--sequence-length", type=int, default=16384)
+    parser.add_argument("--interval-width", type=int, default=131072, help="interval width in bp; wider regions are tiled")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", help="result cache directory (default: a fresh temporary directory)")
+    parser.add_argument("--output", help="write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def load_analyzer(args):
+    """Build an ``Analyzer`` wired to the mock backend and an isolated cache."""
+    os.environ["ALPHAGENOME_BACKEND"] = "mock"
+    os.environ["ALPHAGENOME_MOCK_LATENCY"] = str(args.latency)
+    os.environ["ALPHAGENOME_MOCK_JITTER"] = str(args.jitter)
+    os.environ["ALPHAGENOME_MOCK_ERROR_RATE"] = str(args.error_rate)
+    os.environ["ALPHAGENOME_MOCK_SEED"] = str(args.seed)
+    os.environ["ALPHAGENOME_RATE_LIMIT"] = str(args.rate_limit)
+    os.environ["ALPHAGENOME_CACHE_DIR"] = args.cache_dir or tempfile.mkdtemp(prefix="alphagenome_bench_")
+    sys.path.insert(0, str(ROOT))
+    from alphagenome_ui.analysis import Analyzer
+
+    return Analyzer()
+
+
+def make_workload(kind: str, args, rng: random.Random) -> list:
+    """Return ``args.requests`` call argument tuples drawn from ``args.unique`` inputs."""
+    from alphagenome_ui.i18n import TISSUES
+
+    tissues = list(TISSUES)[:2]
+    output_types = ["RNA_SEQ", "DNASE"]
+    pool = []
+    for _ in range(max(1, args.unique)):
+        if kind == "sequence":
+            sequence = "".join(rng.choices("ACGT", k=args.sequence_length))
+            pool.append((sequence, "human", tissues, output_types))
+        elif kind == "variant":
+            position = rng.randrange(1_000_000, 200_000_000)
+            ref, alt = rng.sample("ACGT", 2)
+            pool.append(("chr1", position, ref, alt, tissues, output_types))
+        else:
+            start = rng.randrange(1_000_000, 200_000_000)
+            pool.append(("chr1", start, start + args.interval_width, tissues, output_types))
+    return [rng.choice(pool) for _ in range(args.requests)]
+
+
+def run_kind(analyzer, kind: str, args, rng: random.Random) -> dict:
+    """Run one workload and summarize it."""
+    from alphagenome_ui.batch import run_bounded
+
+    fn = getattr(analyzer, f"analyze_{kind}")
+    workload = make_workload(kind, args, rng)
+    # One call on an input outside the workload pays one-off import and setup costs
+    warmup = make_workload(kind, argparse.Namespace(**{**vars(args), "unique": 1, "requests": 1}), random.Random(-1))
+    fn("benchmark-key", *warmup[0])
+    cache = analyzer.result_cache
+    before = cache.stats()
+
+    def timed(call_args):
+        started = time.perf_counter()
+        result = fn("benchmark-key", *call_args)
+        return time.perf_counter() - started, result
+
+    latencies, cached, failures = [], 0, 0
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _, outcome in run_bounded(workload, timed, max_workers=args.concurrency):
+        if not isinstance(outcome, tuple):
+            failures += 1
+            continue
+        latency, result = outcome
+        latencies.append(latency)
+        cached += bool(result.get("cached"))
+        failures += not result.get("success")
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    after = cache.stats()
+    lookups = (after["hits"] - before["hits"]) + (after["misses"] - before["misses"])
+    latency_ms = np.asarray(latencies) * 1000.0
+    return {
+        "kind": kind,
+        "requests": len(workload),
+        "failures": failures,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(workload) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            f"p{q}": round(float(np.percentile(latency_ms, q)), 2) if latency_ms.size else None
+            for q in (50, 90, 95, 99)
+        } | {"max": round(float(latency_ms.max()), 2) if latency_ms.size else None},
+        "peak_traced_mb": round(peak / 2**20, 1),
+        "result_cache_hit_rate": round((after["hits"] - before["hits"]) / lookups, 3) if lookups else None,
+        "cached_responses": cached,
+    }
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    analyzer = load_analyzer(args)
+    rng = random.Random(args.seed)
+
+    runs = [run_kind(analyzer, kind, args, rng) for kind in args.kinds]
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "runs": runs,
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "client_pool": analyzer.client_pool.stats(),
+        "scheduler": analyzer.scheduler.stats(),
+        "reference_predictions": analyzer.reference_predictions.stats(),
+        "stages": analyzer.metrics.summary(),
+    }
+
+    print(f"{'kind':<10}{'req':>6}{'fail':>6}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'peak MB':>9}{'hit rate':>10}")
+    for run in runs:
+        lat = run["latency_ms"]
+        print(
+            f"{run['kind']:<10}{run['requests']:>6}{run['failures']:>6}{run['throughput_rps']:>9}"
+            f"{lat['p50']:>9}{lat['p95']:>9}{lat['p99']:>9}{run['peak_traced_mb']:>9}{run['result_cache_hit_rate']:>10}"
+        )
+    print(f"max RSS: {report['max_rss_mb']} MB")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Concurrent-session load test of the Streamlit app against the offline backend.
+
+At each concurrency level, that many headless ``AppTest`` sessions run at once
+in one process, sharing its cached resources (analyzer, scheduler, result
+cache, job manager) the way browser sessions share a server. Each session
+enters its own API key and, per iteration, fills in and analyzes the
+sequence, variant and interval tabs with fresh inputs, then reruns every
+``--poll`` seconds until the job's result is shown. One untimed session
+runs first so imports and shared resources are not charged to the first
+level. ``AppTest`` keeps
+process-global script state, so script runs take turns on a lock; the
+background analysis jobs they start overlap freely. Reported per level:
+
+- ``rerun_ms``: p50/p95/p99 wall time of single script reruns (input changes,
+  clicks and polls), including the wait for other sessions' runs. This is
+  how long a session's rerun takes under load. ``AppTest`` reruns the whole
+  script, while the browser polls a running job with a fragment, so it is an
+  upper bound.
+- ``analysis_ms``: p50/p95/p99 time from clicking Analyze to the rendered
+  result, per tab and overall.
+- ``rss_per_session_mb``: growth of the process RSS over the level, divided
+  by the number of sessions.
+- ``throughput``: analyses and reruns completed per second.
+
+The JSON report goes to ``build/load_report.json`` unless ``--output`` says otherwise.
+
+    python benchmarks/bench_load.py --sessions 1 4 16 --iterations 2
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+TABS = ("sequence", "variant", "interval")
+DEFAULT_REPORT = ROOT / "build" / "load_report.json"
+
+_SCRIPT_LOCK = threading.Lock()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 16], help="concurrency levels")
+    parser.add_argument("--iterations", type=int, default=2, help="passes through the tabs per session")
+    parser.add_argument("--tabs", nargs="+", choices=TABS, default=list(TABS))
+    parser.add_argument("--latency", type=float, default=0.05, help="mock backend latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.2, help="mock latency jitter as a fraction")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="mock failure probability per call")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="scheduler requests/s per API key (0 disables)")
+    parser.add_argument("--sequence-length", type=int, default=16384)
+    parser.add_argument("--interval-width", type=int, default=131072, help="interval width in bp; wider regions are tiled")
+    parser.add_argument("--poll", type=float, default=0.25, help="seconds between reruns while a job runs")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for one analysis")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", help="cache directory (default: a fresh temporary directory)")
+    parser.add_argument("--output", default=str(DEFAULT_REPORT), help="write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def configure(args) -> None:
+    """Point the app at the mock backend and an isolated cache before it is imported."""
+    os.environ["ALPHAGENOME_BACKEND"] = "mock"
+    os.environ["ALPHAGENOME_MOCK_LATENCY"] = str(args.latency)
+    os.environ["ALPHAGENOME_MOCK_JITTER"] = str(args.jitter)
+    os.environ["ALPHAGENOME_MOCK_ERROR_RATE"] = str(args.error_rate)
+    os.environ["ALPHAGENOME_MOCK_SEED"] = str(args.seed)
+    os.environ["ALPHAGENOME_RATE_LIMIT"] = str(args.rate_limit)
+    os.environ["ALPHAGENOME_CACHE_DIR"] = args.cache_dir or tempfile.mkdtemp(prefix="alphagenome_load_")
+    sys.path.insert(0, str(ROOT))
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentiles(values) -> dict:
+    values = np.asarray(values, dtype=np.float64)
+    return {f"p{q}": round(float(np.percentile(values, q)), 2) if values.size else None for q in (50, 95, 99)} | {
+        "max": round(float(values.max()), 2) if values.size else None,
+        "count": int(values.size),
+    }
+
+
+class Session:
+    """One headless app session and the timings it has collected."""
+
+    def __init__(self, index: int, args, labels: dict):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.args = args
+        self.labels = labels
+        self.rng = random.Random(args.seed * 1_000_003 + index)
+        self.app = AppTest.from_file(str(ROOT / "app.py"), default_timeout=args.timeout)
+        self.reruns: list[float] = []
+        self.analyses: dict[str, list[float]] = {tab: [] for tab in args.tabs}
+        self.failures: list[str] = []
+
+    def run(self) -> None:
+        """Rerun the script once and record its wall time."""
+        started = time.perf_counter()
+        with _SCRIPT_LOCK:
+            self.app.run()
+        self.reruns.append((time.perf_counter() - started) * 1000.0)
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].value)
+
+    def number_input(self, label: str, index: int = 0):
+        return [w for w in self.app.number_input if w.label == self.labels[label]][index]
+
+    def fill(self, tab: str) -> None:
+        """Enter a fresh input for ``tab`` so the analysis is not a cache hit."""
+        rng, args = self.rng, self.args
+        if tab == "sequence":
+            self.app.text_area(key="sequence_input_area").set_value("".join(rng.choices("ACGT", k=args.sequence_length)))
+        elif tab == "variant":
+            self.number_input("position").set_value(rng.randrange(1_000_000, 200_000_000))
+        else:
+            start = rng.randrange(1_000_000, 200_000_000)
+            # The end is set first so start < end holds on every rerun in between
+            self.number_input("end").set_value(start + args.interval_width)
+            self.run()
+            self.number_input("start").set_value(start)
+        self.run()
+
+    def errors(self) -> list[str]:
+        return [e.value for e in self.app.error if str(e.value).startswith("❌")]
+
+    def analyze(self, tab: str) -> None:
+        """Click Analyze on ``tab`` and poll until the job's result is rendered."""
+        errors_before = len(self.errors())
+        started = time.perf_counter()
+        self.app.button(key=f"analyze_{tab}").click()
+        self.run()
+        while self.app.get("progress"):
+            if time.perf_counter() - started > self.args.timeout:
+                self.failures.append(f"{tab}: timed out after {self.args.timeout:g} s")
+                return
+            time.sleep(self.args.poll)
+            self.run()
+        elapsed = (time.perf_counter() - started) * 1000.0
+        new_errors = self.errors()[errors_before:]
+        if new_errors:
+            self.failures.append(f"{tab}: {new_errors[0]}")
+        else:
+            self.analyses[tab].append(elapsed)
+
+    def drive(self) -> None:
+        """Open the app, then run every tab ``iterations`` times."""
+        try:
+            self.run()
+            self.app.text_input(key="api_key").set_value(f"load-test-{self.index}")
+            self.run()
+            for _ in range(self.args.iterations):
+                for tab in self.args.tabs:
+                    self.fill(tab)
+                    self.analyze(tab)
+        except Exception as e:
+            self.failures.append(f"session {self.index}: {e}")
+
+
+def run_level(sessions: int, args, labels: dict) -> dict:
+    """Drive ``sessions`` concurrent sessions to completion and summarize them."""
+    gc.collect()
+    rss_before = rss_mb()
+    group = [Session(i, args, labels) for i in range(sessions)]
+    threads = [threading.Thread(target=s.drive, name=f"session-{s.index}") for s in group]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    rss_after = rss_mb()
+
+    reruns = [ms for s in group for ms in s.reruns]
+    by_tab = {tab: [ms for s in group for ms in s.analyses[tab]] for tab in args.tabs}
+    analyses = [ms for values in by_tab.values() for ms in values]
+    failures = [f for s in group for f in s.failures]
+    return {
+        "sessions": sessions,
+        "elapsed_s": round(elapsed, 3),
+        "analyses": len(analyses),
+        "failures": len(failures),
+        "errors": failures[:10],
+        "rerun_ms": percentiles(reruns),
+        "analysis_ms": percentiles(analyses) | {"by_tab": {tab: percentiles(values) for tab, values in by_tab.items()}},
+        "throughput": {
+            "analyses_per_s": round(len(analyses) / elapsed, 2) if elapsed else None,
+            "reruns_per_s": round(len(reruns) / elapsed, 2) if elapsed else None,
+        },
+        "rss_before_mb": round(rss_before, 1),
+        "rss_after_mb": round(rss_after, 1),
+        "rss_per_session_mb": round((rss_after - rss_before) / sessions, 2),
+    }
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    configure(args)
+    from alphagenome_ui.i18n import TRANSLATIONS
+
+    # Sessions keep the app's default language; number inputs are found by their label
+    labels = TRANSLATIONS["tr"]
+    warmup = Session(-1, args, labels)
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+    warmup.drive()
+    levels = [run_level(n, args, labels) for n in args.sessions]
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "levels": levels,
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+    print(f"{'sessions':>9}{'done':>6}{'fail':>6}{'an/s':>9}{'rerun p50/p95/p99 ms':>28}{'analysis p50/p95/p99 ms':>30}{'MB/session':>12}")
+    for level in levels:
+        rerun = " / ".join(str(level["rerun_ms"][p]) for p in ("p50", "p95", "p99"))
+        analysis = " / ".join(str(level["analysis_ms"][p]) for p in ("p50", "p95", "p99"))
+        print(
+            f"{level['sessions']:>9}{level['analyses']:>6}{level['failures']:>6}{level['throughput']['analyses_per_s']:>9}"
+            f"{rerun:>28}{analysis:>30}{level['rss_per_session_mb']:>12}"
+        )
+    print(f"max RSS: {report['max_rss_mb']} MB")
+
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2))
+        print(f"report: {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Per-interaction latency as the sequence input grows.
+
+For each input size the sequence tab is filled once, then widgets in each tab
+are toggled repeatedly. Two numbers are reported per interaction:
+
+- ``tab_ms``: time spent rendering the tab that owns the widget, taken from
+  the app's own ``render_tab`` timings. In the browser each tab is a
+  fragment, so this is what an interaction actually re-executes.
+- ``full_rerun_ms``: wall time of a whole-script rerun. ``AppTest`` always
+  reruns the full script, so this is an upper bound that still includes
+  every tab.
+
+Both should stay flat across sizes: the sequence is normalized and hashed
+once, when the text changes, and is not re-sent to the browser.
+
+    python benchmarks/bench_rerun.py --sizes 16384 131072 1048576 --repeats 10
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# (interaction name, owning tab, multiselect key) toggled between one and two options
+INTERACTIONS = (
+    ("sequence_tissues", "sequence", "sequence_tissues"),
+    ("variant_tissues", "variant", "variant_tissues"),
+    ("interval_tissues", "interval", "interval_tissues"),
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[16384, 131072, 524288, 1048576])
+    parser.add_argument("--repeats", type=int, default=10, help="toggles per interaction and size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def read_events(path: Path, offset: int) -> tuple[list, int]:
+    """Return timing events appended to ``path`` after ``offset`` and the new offset."""
+    if not path.exists():
+        return [], offset
+    with open(path, "rb") as f:
+        f.seek(offset)
+        data = f.read()
+    return [json.loads(line) for line in data.splitlines() if line.strip()], offset + len(data)
+
+
+def p50(values) -> float | None:
+    return round(float(np.percentile(values, 50)), 2) if values else None
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    cache_root = Path(tempfile.mkdtemp(prefix="alphagenome_rerun_"))
+    os.environ["ALPHAGENOME_CACHE_DIR"] = str(cache_root)
+    log_path = cache_root / "metrics" / "timings.jsonl"
+
+    from streamlit.testing.v1 import AppTest
+
+    for name in list(logging.root.manager.loggerDict):
+        if name.startswith("streamlit"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    rng = random.Random(args.seed)
+    rows = []
+    for size in args.sizes:
+        at = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120).run()
+        _, offset = read_events(log_path, 0)
+
+        sequence = "".join(rng.choices("ACGT", k=size))
+        started = time.perf_counter()
+        at.text_area(key="sequence_input_area").input(sequence).run()
+        input_ms = (time.perf_counter() - started) * 1000.0
+        events, offset = read_events(log_path, offset)
+        ingest_ms = sum(e["duration_ms"] for e in events if e["stage"] == "ingest")
+
+        row = {"size": size, "input_change_ms": round(input_ms, 2), "ingest_ms": round(ingest_ms, 2), "interactions": {}}
+        for name, tab, key in INTERACTIONS:
+            widget = at.multiselect(key=key)
+            options = list(widget.options)
+            full, tab_times, reingests = [], [], 0
+            for i in range(args.repeats):
+                value = options[:1] if i % 2 else options[:2]
+                started = time.perf_counter()
+                at.multiselect(key=key).set_value(value).run()
+                full.append((time.perf_counter() - started) * 1000.0)
+                events, offset = read_events(log_path, offset)
+                tab_times += [e["duration_ms"] for e in events if e["stage"] == "render_tab" and e["kind"] == tab]
+                reingests += sum(e["stage"] == "ingest" for e in events)
+            row["interactions"][name] = {
+                "tab_ms": p50(tab_times),
+                "full_rerun_ms": p50(full),
+                "reingests": reingests,
+            }
+        if at.exception:
+            row["exceptions"] = [str(e.value) for e in at.exception]
+        rows.append(row)
+
+    print(f"{'size':>9}{'ingest ms':>11}" + "".join(f"{name + ' tab/full ms':>32}" for name, _, _ in INTERACTIONS))
+    for row in rows:
+        cells = "".join(
+            f"{str(r['tab_ms']) + ' / ' + str(r['full_rerun_ms']):>32}" for r in row["interactions"].values()
+        )
+        print(f"{row['size']:>9}{row['ingest_ms']:>11}{cells}")
+
+    report = {"config": {k: v for k, v in vars(args).items() if k != "output"}, "runs": rows}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
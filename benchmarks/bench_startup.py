@@ -0,0 +1,107 @@
+"""
+Cold-start benchmark for the Streamlit app.
+
+Each sample starts a fresh interpreter that renders ``app.py`` headlessly with
+Streamlit's ``AppTest`` and then reruns it several times without input
+changes. Reports time-to-first-render (interpreter start included), the
+script's first run alone, per-rerun overhead and which heavy modules were
+imported by the time of the first render.
+
+    python benchmarks/bench_startup.py --samples 5 --reruns 20 --output startup.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("alphagenome", "grpc", "pyarrow", "matplotlib", "pandas", "scipy")
+
+CHILD = r"""
+import json, logging, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+imported = time.perf_counter()
+for name in list(logging.root.manager.loggerDict):
+    if name.startswith("streamlit"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+app_path, reruns, heavy = sys.argv[1], int(sys.argv[2]), sys.argv[3].split(",")
+at = AppTest.from_file(app_path, default_timeout=120)
+at.run()
+first = time.perf_counter()
+loaded = [m for m in heavy if m in sys.modules]
+durations = []
+for _ in range(reruns):
+    t = time.perf_counter()
+    at.run()
+    durations.append(time.perf_counter() - t)
+print(json.dumps({
+    "streamlit_import_s": imported - started,
+    "first_run_s": first - imported,
+    "reruns_s": durations,
+    "heavy_modules_at_first_render": loaded,
+    "exceptions": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1], formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--reruns", type=int, default=20, help="reruns per interpreter after the first render")
+    parser.add_argument("--app", default=str(ROOT / "app.py"))
+    parser.add_argument("--output", help="write the JSON report to this path")
+    return parser.parse_args(argv)
+
+
+def sample(args) -> dict:
+    """Start one interpreter and return its measurements."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-c", CHILD, args.app, str(args.reruns), ",".join(HEAVY_MODULES)],
+        capture_output=True, text=True, check=True, cwd=ROOT,
+    )
+    total = time.perf_counter() - started
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    # Subtract the reruns to get process start -> first render
+    result["time_to_first_render_s"] = total - sum(result["reruns_s"])
+    return result
+
+
+def percentiles(values) -> dict:
+    values = np.asarray(values) * 1000.0
+    return {f"p{q}": round(float(np.percentile(values, q)), 2) for q in (50, 95, 99)}
+
+
+def main(argv=None) -> dict:
+    args = parse_args(argv)
+    samples = [sample(args) for _ in range(args.samples)]
+    reruns = [d for s in samples for d in s["reruns_s"]]
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "time_to_first_render_ms": percentiles([s["time_to_first_render_s"] for s in samples]),
+        "streamlit_import_ms": percentiles([s["streamlit_import_s"] for s in samples]),
+        "first_run_ms": percentiles([s["first_run_s"] for s in samples]),
+        "rerun_ms": percentiles(reruns) if reruns else None,
+        "heavy_modules_at_first_render": sorted({m for s in samples for m in s["heavy_modules_at_first_render"]}),
+        "exceptions": sorted({e for s in samples for e in s["exceptions"]}),
+    }
+
+    print(f"time to first render: {report['time_to_first_render_ms']} ms")
+    print(f"  streamlit import:   {report['streamlit_import_ms']} ms")
+    print(f"  first script run:   {report['first_run_ms']} ms")
+    print(f"rerun overhead:       {report['rerun_ms']} ms")
+    print(f"heavy modules loaded: {', '.join(report['heavy_modules_at_first_render']) or 'none'}")
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from alphagenome_ui.tiling import plan_tiles, predict_tiled
+from alphagenome_ui.variants import VARIANT_CONTEXT_LENGTH, context_flanks, context_window
+
+CHROMOSOME_LENGTH = 3_000_000
+
+
+@pytest.mark.parametrize("start, end", [(2_900_000, 3_000_000), (2_999_000, 3_000_000), (1_000_000, 3_000_000), (0, CHROMOSOME_LENGTH)])
+def test_tiles_stay_inside_the_chromosome(start, end):
+    tiles = plan_tiles(start, end, chromosome_length=CHROMOSOME_LENGTH)
+    assert all(0 <= tile.start and tile.end <= CHROMOSOME_LENGTH for tile in tiles)
+    assert all(tile.start <= tile.keep_start < tile.keep_end <= tile.end for tile in tiles)
+    assert tiles[0].keep_start == start and tiles[-1].keep_end == end
+
+
+@pytest.mark.parametrize("resolution", [1, 128])
+def test_moved_tile_stitches_the_right_bases(resolution):
+    start, end = 1_000_000, CHROMOSOME_LENGTH
+
+    def predict(tile):
+        # Each row holds the position of its first base
+        rows = np.arange(tile.start, tile.end, resolution, dtype=np.float64)[:, None]
+        return {"track": (rows, resolution)}
+
+    stitched, tiles = predict_tiled(predict, start, end, chromosome_length=CHROMOSOME_LENGTH)
+    assert tiles[-1].end == CHROMOSOME_LENGTH
+    expected = np.arange(start, end, resolution, dtype=np.float64)
+    # Rows of a moved window may start up to ``resolution - 1`` bases before the output grid
+    assert np.all(np.abs(stitched["track"][:, 0] - expected) < resolution)
+
+
+def test_variant_context_stays_inside_the_chromosome():
+    for position in (CHROMOSOME_LENGTH, CHROMOSOME_LENGTH - 100_000, CHROMOSOME_LENGTH - 600_000):
+        window = context_window("chr1", position, chromosome_length=CHROMOSOME_LENGTH)
+        assert window.end <= CHROMOSOME_LENGTH and window.end - window.start == VARIANT_CONTEXT_LENGTH
+        left, right = context_flanks(window, position)
+        assert left >= 0 and right >= 0
+    assert context_window("chr1", CHROMOSOME_LENGTH - 10, chromosome_length=CHROMOSOME_LENGTH) == context_window(
+        "chr1", CHROMOSOME_LENGTH - 200_000, chromosome_length=CHROMOSOME_LENGTH
+    )
+    # Without a known length the grid window is unchanged
+    assert context_window("chr1", CHROMOSOME_LENGTH).end > CHROMOSOME_LENGTH
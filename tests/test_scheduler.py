@@ -0,0 +1,44 @@
+import threading
+import time
+
+from alphagenome_ui.scheduler import BATCH, INTERACTIVE, RequestScheduler, TokenBucket
+
+
+def test_token_bucket_never_goes_negative():
+    bucket = TokenBucket(rate=10.0, burst=1)
+    assert bucket.take() == 0.0
+    waits = [bucket.take() for _ in range(5)]
+    assert all(0.0 < wait <= 0.1 for wait in waits)
+    time.sleep(0.11)
+    assert bucket.take() == 0.0
+
+
+def test_interactive_runs_before_throttled_batch():
+    order = []
+    lock = threading.Lock()
+
+    def task(name):
+        def run(client):
+            with lock:
+                order.append(name)
+            return name
+        return run
+
+    scheduler = RequestScheduler(lambda api_key: None, max_concurrency=4, rate=10.0, burst=1)
+    batch = [scheduler.submit("key", task(f"batch-{i}"), priority=BATCH) for i in range(5)]
+    # Let the workers take the only token and park the rest of the batch
+    time.sleep(0.05)
+    interactive = scheduler.submit("key", task("interactive"), priority=INTERACTIVE)
+    interactive.result(timeout=5)
+    for future in batch:
+        future.result(timeout=5)
+    assert order[:2] == ["batch-0", "interactive"]
+    assert scheduler.stats()["queued"] == 0
+
+
+def test_keys_are_throttled_independently():
+    scheduler = RequestScheduler(lambda api_key: api_key, max_concurrency=2, rate=1.0, burst=1)
+    assert scheduler.call("a", lambda client: client) == "a"
+    started = time.monotonic()
+    assert scheduler.call("b", lambda client: client, priority=BATCH) == "b"
+    assert time.monotonic() - started < 0.5